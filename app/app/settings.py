@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import importlib.util
 import os
 from pathlib import Path
 
@@ -50,6 +51,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware',
+    'core.queries.QueryInspectorMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -85,7 +88,8 @@ WSGI_APPLICATION = 'app.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': os.environ.get('DB_ENGINE',
+                                 'django.db.backends.postgresql'),
         'HOST': os.environ.get('DB_HOST', ''),
         'NAME': os.environ.get('DB_NAME', ''),
         'USER': os.environ.get('DB_USER', ''),
@@ -94,6 +98,119 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Throttling state and the platform lookup versions live here, so
+# production should point this at a shared backend, e.g.
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# and CACHE_LOCATION=redis://redis:6379/0
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
+# Seconds serialized reviews stay cached, see watchlist.cache
+
+REVIEW_CACHE_TIMEOUT = int(os.environ.get('REVIEW_CACHE_TIMEOUT', 86400))
+
+
+# Reviews table partitioned by month on PostgreSQL, see core.partitioning.
+# Converting an existing table locks it for the whole copy.
+
+REVIEW_PARTITIONING = bool(int(os.environ.get('REVIEW_PARTITIONING', 0)))
+
+
+# Request instrumentation, see core.middleware.PerformanceMiddleware
+
+PERFORMANCE_METRICS_ENABLED = bool(
+    int(os.environ.get('PERFORMANCE_METRICS', 0))
+)
+
+
+# Repeated and slow query detection, see core.queries
+
+QUERY_INSPECTOR = {
+    'ENABLED': bool(int(os.environ.get('QUERY_INSPECTOR', 0))),
+    'MAX_REPEATS': 3,
+    'SLOW_QUERY_MS': 100,
+    'RAISE': False,
+}
+
+
+# Review rating aggregates counted in the cache, see watchlist.counters
+
+RATING_COUNTERS = {
+    'ENABLED': bool(int(os.environ.get('RATING_COUNTERS', 0))),
+    'FLUSH_EVERY': 100,
+}
+
+
+# Background tasks, see core.tasks. Disabled, tasks run right away in
+# the process enqueueing them; enabled, the run_tasks workers run them.
+
+TASK_QUEUE = {
+    'ENABLED': bool(int(os.environ.get('TASK_QUEUE', 0))),
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_DELAY': 10,
+}
+
+
+# Review feed, see user.feed. Reviews of users with more followers than
+# CELEBRITY_FOLLOWERS are merged in when feeds are read instead of being
+# copied into every timeline.
+
+FEED = {
+    'TIMELINE_LENGTH': 500,
+    'CELEBRITY_FOLLOWERS': 10000,
+    'BACKFILL': 20,
+}
+
+
+# Password hashing. New passwords, and those of users logging in with a
+# hash of another hasher, are hashed with PASSWORD_HASHER: Argon2 when
+# argon2-cffi is installed, scrypt otherwise. The others verify old hashes.
+
+PASSWORD_HASHER = os.environ.get(
+    'PASSWORD_HASHER',
+    'django.contrib.auth.hashers.Argon2PasswordHasher'
+    if importlib.util.find_spec('argon2')
+    else 'django.contrib.auth.hashers.ScryptPasswordHasher'
+)
+
+PASSWORD_HASHERS = [PASSWORD_HASHER] + [hasher for hasher in (
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+) if hasher != PASSWORD_HASHER]
+
+
+# Concurrent password checks per process, see user.login. Up to QUEUE
+# more logins wait at most TIMEOUT seconds, the rest get a 429.
+
+LOGIN_POOL = {
+    'WORKERS': int(os.environ.get('LOGIN_WORKERS', os.cpu_count() or 1)),
+    'QUEUE': int(os.environ.get('LOGIN_QUEUE', 32)),
+    'TIMEOUT': 5,
+}
+
+
+# Threads hashing the passwords of the bulk user provisioning endpoint,
+# see user.provisioning
+
+PROVISIONING_WORKERS = int(
+    os.environ.get('PROVISIONING_WORKERS', os.cpu_count() or 1)
+)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -134,6 +251,13 @@ MEDIA_URL = '/static/media/'
 MEDIA_ROOT = '/vol/web/media'
 STATIC_ROOT = '/vol/web/static'
 
+
+# Factor arrays of the recommendations, see watchlist.factorization
+
+RECOMMENDATIONS_DIR = os.environ.get('RECOMMENDATIONS_DIR',
+                                     '/vol/web/recommendations')
+
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -147,21 +271,27 @@ REST_FRAMEWORK = {
     #     'rest_framework.permissions.IsAuthenticated',
     # ]
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
-        'rest_framework.throttling.ScopedRateThrottle',
+        'core.throttling.AnonGCRAThrottle',
+        'core.throttling.UserGCRAThrottle',
+        'core.throttling.ScopedGCRAThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/day',
         'user': '1000/day',
         'burst': '60/min',
+        'autocomplete': '300/min',
     },
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 100,
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
-    )
+        'core.renderers.FastJSONRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -170,8 +300,16 @@ SPECTACULAR_SETTINGS = {
 
 from datetime import timedelta
 
+# Lifetime of the auth tokens, see core.authentication. Older tokens are
+# deleted by the sweep_tokens command, which should run periodically.
+
+AUTH_TOKEN_TTL = timedelta(
+    hours=int(os.environ.get('AUTH_TOKEN_TTL_HOURS', 24))
+)
+
 SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.TokenObtainPairSerializer",
 }
\ No newline at end of file
@@ -23,12 +23,15 @@ from django.urls import path, include
 from django.conf.urls.static import static
 from django.conf import settings
 
+from core.metrics import MetricsView
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='api-schema'),
          name='api-doc'),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
     path('api/', include('watchlist.urls')),
     path('user/', include('user.urls')),
 ]
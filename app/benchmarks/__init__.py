@@ -0,0 +1,3 @@
+"""
+Reproducible benchmarks for the API, run with ``manage.py benchmark``.
+"""
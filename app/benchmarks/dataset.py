@@ -0,0 +1,94 @@
+"""
+Deterministic benchmark data set.
+"""
+import random
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from rest_framework.authtoken.models import Token
+
+from core.models import StreamingPlatform, WatchList, Review
+
+
+PASSWORD = 'benchmark-pass123'
+BATCH_SIZE = 1000
+SPARE_PAIRS = 10000
+
+Dataset = namedtuple('Dataset', [
+    'users',       # list of (email, token key)
+    'title_ids',
+    'unreviewed',  # (user index, title id) pairs free for new reviews
+])
+
+
+def seed(users=50, platforms=5, titles=500, reviews=5000, seed=0):
+    """
+    Create a data set of the given size and return a `Dataset`.
+
+    Every user shares the password `PASSWORD` and gets an auth token. The
+    same `seed` always produces the same rows.
+    """
+    rand = random.Random(seed)
+    reviews = min(reviews, users * titles)
+
+    password = make_password(PASSWORD)
+    user_objs = get_user_model().objects.bulk_create([
+        get_user_model()(email='bench{}@example.com'.format(i),
+                         name='Bench', password=password)
+        for i in range(users)
+    ], batch_size=BATCH_SIZE)
+    tokens = Token.objects.bulk_create([
+        Token(key=Token.generate_key(), user=user) for user in user_objs
+    ], batch_size=BATCH_SIZE)
+
+    platform_objs = StreamingPlatform.objects.bulk_create([
+        StreamingPlatform(user=user_objs[0],
+                          name='Platform {}'.format(i),
+                          about='Benchmark platform',
+                          website='http://platform{}.example.com'.format(i))
+        for i in range(platforms)
+    ])
+
+    pairs = rand.sample(range(users * titles), reviews)
+    ratings = [rand.randint(1, 5) for _ in pairs]
+    totals = [[0, 0] for _ in range(titles)]
+    for pair, rating in zip(pairs, ratings):
+        totals[pair % titles][0] += 1
+        totals[pair % titles][1] += rating
+
+    title_objs = WatchList.objects.bulk_create([
+        WatchList(user=user_objs[0],
+                  platform=platform_objs[i % platforms],
+                  title='Benchmark title {}'.format(i),
+                  description='Benchmark description {}'.format(i),
+                  total_reviews=count,
+                  average_rating=total / count if count else None)
+        for i, (count, total) in enumerate(totals)
+    ], batch_size=BATCH_SIZE)
+    WatchList.objects.refresh_summaries()
+
+    Review.objects.bulk_create([
+        Review(user=user_objs[pair // titles],
+               watchlist=title_objs[pair % titles],
+               rating=rating,
+               description='Benchmark review')
+        for pair, rating in zip(pairs, ratings)
+    ], batch_size=BATCH_SIZE)
+
+    taken = set(pairs)
+    unreviewed = []
+    spare = min(SPARE_PAIRS, users * titles - reviews)
+    while len(unreviewed) < spare:
+        pair = rand.randrange(users * titles)
+        if pair not in taken:
+            taken.add(pair)
+            unreviewed.append(pair)
+
+    return Dataset(
+        users=[(user.email, token.key)
+               for user, token in zip(user_objs, tokens)],
+        title_ids=[title.id for title in title_objs],
+        unreviewed=[(pair // titles, title_objs[pair % titles].id)
+                    for pair in unreviewed],
+    )
@@ -0,0 +1,155 @@
+"""
+Concurrent in-process load driver for the API endpoints.
+"""
+import math
+import random
+import threading
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from benchmarks.dataset import PASSWORD
+
+
+Sample = namedtuple('Sample', 'scenario latency queries status')
+
+
+class QueryCounter:
+    """`connection.execute_wrapper` hook counting queries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Scenarios:
+    """The requests the driver sends, picked at random by weight."""
+    weights = {
+        'watch-list': 40,
+        'watch-detail': 30,
+        'streaming-list': 10,
+        'review-create': 10,
+        'token': 10,
+    }
+
+    def __init__(self, dataset, names=None):
+        self.dataset = dataset
+        self.names = list(names or self.weights)
+        self._unreviewed = list(dataset.unreviewed)
+        self._lock = threading.Lock()
+
+    def pick(self, rand):
+        weights = [self.weights[name] for name in self.names]
+        name = rand.choices(self.names, weights)[0]
+        return name, getattr(self, name.replace('-', '_'))
+
+    def watch_list(self, client, rand):
+        pages = max(1, len(self.dataset.title_ids) // 10)
+        return client.get(reverse('watch:watchlist-list'),
+                          {'page': rand.randint(1, min(pages, 50))})
+
+    def watch_detail(self, client, rand):
+        pk = rand.choice(self.dataset.title_ids)
+        return client.get(reverse('watch:watchlist-detail', args=[pk]))
+
+    def streaming_list(self, client, rand):
+        return client.get(reverse('watch:streaming-list'))
+
+    def review_create(self, client, rand):
+        with self._lock:
+            pair = self._unreviewed.pop() if self._unreviewed else None
+        if pair is None:
+            return self.watch_detail(client, rand)
+
+        user_index, pk = pair
+        _, key = self.dataset.users[user_index]
+        return client.post(
+            reverse('watch:reviews-list', kwargs={'pk': pk}),
+            {'rating': rand.randint(1, 5), 'description': 'Benchmark'},
+            HTTP_AUTHORIZATION='Token {}'.format(key),
+        )
+
+    def token(self, client, rand):
+        email, _ = rand.choice(self.dataset.users)
+        return client.post(reverse('user:token'),
+                           {'email': email, 'password': PASSWORD})
+
+
+def _worker(scenarios, requests, seed):
+    rand = random.Random(seed)
+    client = APIClient(raise_request_exception=False)
+    samples = []
+    try:
+        for _ in range(requests):
+            name, send = scenarios.pick(rand)
+            counter = QueryCounter()
+            start = perf_counter()
+            with connection.execute_wrapper(counter):
+                response = send(client, rand)
+            samples.append(Sample(name, perf_counter() - start,
+                                  counter.count, response.status_code))
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            connection.close()
+    return samples
+
+
+def run(scenarios, requests=1000, concurrency=4, seed=0):
+    """
+    Send `requests` requests from `concurrency` threads.
+
+    Returns the list of `Sample`s and the wall time of the run. With a
+    concurrency of 1 the requests run in the calling thread.
+    """
+    shares = [requests // concurrency + (i < requests % concurrency)
+              for i in range(concurrency)]
+
+    start = perf_counter()
+    if concurrency == 1:
+        samples = _worker(scenarios, requests, seed)
+    else:
+        with ThreadPoolExecutor(concurrency) as executor:
+            results = executor.map(_worker, [scenarios] * concurrency,
+                                   shares, range(seed, seed + concurrency))
+            samples = [sample for result in results for sample in result]
+    return samples, perf_counter() - start
+
+
+def percentile(values, fraction):
+    """Return the nearest-rank percentile of `values`."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarize(samples, elapsed):
+    """Return one row of statistics per scenario plus a total row."""
+    groups = defaultdict(list)
+    for sample in samples:
+        groups[sample.scenario].append(sample)
+        groups['total'].append(sample)
+
+    rows = []
+    for name in sorted(groups, key=lambda name: name == 'total'):
+        group = groups[name]
+        latencies = [sample.latency * 1000 for sample in group]
+        rows.append({
+            'scenario': name,
+            'requests': len(group),
+            'errors': sum(sample.status >= 400 for sample in group),
+            'rps': len(group) / elapsed if elapsed else 0.0,
+            'p50': percentile(latencies, 0.50),
+            'p95': percentile(latencies, 0.95),
+            'p99': percentile(latencies, 0.99),
+            'queries': sum(sample.queries for sample in group) / len(group),
+        })
+    return rows
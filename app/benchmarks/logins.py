@@ -0,0 +1,54 @@
+"""
+Login throughput of the password hashers.
+"""
+import os
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test.utils import override_settings
+
+from benchmarks import driver
+from benchmarks.dataset import PASSWORD
+
+
+def available_hashers():
+    """Return the `PASSWORD_HASHERS` whose libraries are installed."""
+    hashers = []
+    for hasher in settings.PASSWORD_HASHERS:
+        with override_settings(PASSWORD_HASHERS=[hasher]):
+            try:
+                make_password(PASSWORD)
+            except ValueError:
+                continue
+        hashers.append(hasher)
+    return hashers
+
+
+def run(dataset, hashers, logins=200, concurrency=4, seed=0):
+    """
+    Log the users of `dataset` in `logins` times from `concurrency` threads
+    with each of `hashers` and report the logins per second. Per core
+    divides by the password checks that can run at once.
+    """
+    cores = min(concurrency, settings.LOGIN_POOL['WORKERS'],
+                os.cpu_count() or 1)
+    rows = []
+    for hasher in hashers:
+        with override_settings(PASSWORD_HASHERS=[hasher]):
+            get_user_model().objects.update(password=make_password(PASSWORD))
+            samples, elapsed = driver.run(
+                driver.Scenarios(dataset, ['token']), requests=logins,
+                concurrency=concurrency, seed=seed,
+            )
+        total = driver.summarize(samples, elapsed)[-1]
+        rows.append({
+            'hasher': hasher.rsplit('.', 1)[-1],
+            'logins': total['requests'],
+            'errors': total['errors'],
+            'per_second': total['rps'],
+            'per_core': total['rps'] / cores,
+            'p50': total['p50'],
+            'p99': total['p99'],
+        })
+    return rows
@@ -0,0 +1,46 @@
+"""
+Micro-benchmark of the JSON renderers on `/api/watch/` payloads.
+"""
+from time import perf_counter
+
+from rest_framework.renderers import JSONRenderer
+
+from core.models import WatchList
+from core.renderers import FastJSONRenderer
+from watchlist.serializers import WatchListSerializer
+
+
+def watchlist_page(page_size=20):
+    """Return a `/api/watch/` page of the most reviewed titles."""
+    titles = WatchList.objects.select_related('platform').prefetch_related(
+        'reviews'
+    ).order_by('-total_reviews')[:page_size]
+    return {
+        'count': WatchList.objects.count(),
+        'next': None,
+        'previous': None,
+        'results': WatchListSerializer(titles, many=True).data,
+    }
+
+
+def run(page, rounds=2000):
+    """Render `page` `rounds` times with every renderer and time it."""
+    candidates = [
+        ('JSONRenderer', JSONRenderer(), page),
+        ('FastJSONRenderer', FastJSONRenderer(), page),
+    ]
+
+    rows = []
+    for name, renderer, data in candidates:
+        size = len(renderer.render(data))
+        start = perf_counter()
+        for _ in range(rounds):
+            renderer.render(data)
+        elapsed = perf_counter() - start
+        rows.append({
+            'renderer': name,
+            'bytes': size,
+            'us': elapsed / rounds * 1e6,
+            'per_second': rounds / elapsed,
+        })
+    return rows
@@ -0,0 +1,84 @@
+"""
+Tests for the benchmark data set and driver
+"""
+from unittest.mock import patch
+
+from django.test import TestCase
+from rest_framework.views import APIView
+
+from benchmarks import dataset, driver, logins
+from core.models import Review, WatchList
+
+
+class DatasetTests(TestCase):
+    """Tests for seeding the benchmark data set."""
+
+    def test_seed_consistent_aggregates(self):
+        """Test seeded titles carry the aggregates of their reviews."""
+        data = dataset.seed(users=5, platforms=2, titles=10, reviews=30)
+
+        self.assertEqual(len(data.title_ids), 10)
+        self.assertEqual(Review.objects.count(), 30)
+        for title in WatchList.objects.all():
+            ratings = list(title.reviews.values_list('rating', flat=True))
+            self.assertEqual(title.total_reviews, len(ratings))
+            if ratings:
+                self.assertAlmostEqual(title.average_rating,
+                                       sum(ratings) / len(ratings))
+
+    def test_unreviewed_pairs_are_free(self):
+        """Test the spare pairs do not collide with seeded reviews."""
+        data = dataset.seed(users=3, platforms=1, titles=4, reviews=6)
+
+        emails = [email for email, _ in data.users]
+        for user_index, pk in data.unreviewed:
+            self.assertFalse(Review.objects.filter(
+                user__email=emails[user_index], watchlist_id=pk
+            ).exists())
+        self.assertEqual(len(data.unreviewed), 6)
+
+
+class DriverTests(TestCase):
+    """Tests for the load driver."""
+
+    def test_run_all_scenarios(self):
+        """Test every scenario succeeds and is reported."""
+        data = dataset.seed(users=5, platforms=2, titles=20, reviews=20)
+        scenarios = driver.Scenarios(data)
+
+        with patch.object(APIView, 'throttle_classes', []):
+            samples, elapsed = driver.run(scenarios, requests=60,
+                                          concurrency=1)
+        rows = driver.summarize(samples, elapsed)
+
+        self.assertEqual(len(samples), 60)
+        self.assertEqual([s for s in samples if s.status >= 400], [])
+        self.assertEqual(rows[-1]['scenario'], 'total')
+        self.assertEqual(rows[-1]['requests'], 60)
+        self.assertTrue(all(s.queries > 0 for s in samples))
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = list(range(1, 101))
+
+        self.assertEqual(driver.percentile(values, 0.50), 50)
+        self.assertEqual(driver.percentile(values, 0.99), 99)
+        self.assertEqual(driver.percentile([7], 0.95), 7)
+        self.assertEqual(driver.percentile([], 0.95), 0.0)
+
+
+class LoginsTests(TestCase):
+    """Tests for the login benchmark."""
+
+    def test_run_hashers(self):
+        """Test every hasher is reported and the logins succeed."""
+        data = dataset.seed(users=2, platforms=1, titles=2, reviews=2)
+        hashers = ['django.contrib.auth.hashers.MD5PasswordHasher',
+                   'django.contrib.auth.hashers.ScryptPasswordHasher']
+
+        rows = logins.run(data, hashers, logins=4, concurrency=1)
+
+        self.assertEqual([row['hasher'] for row in rows],
+                         ['MD5PasswordHasher', 'ScryptPasswordHasher'])
+        self.assertTrue(all(row['logins'] == 4 and not row['errors']
+                            for row in rows))
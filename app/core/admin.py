@@ -6,12 +6,23 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 
 from core import models
+from core.pagination import EstimatedCountPaginator
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelists of large tables: no exact total count."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 class UserAdmin(BaseUserAdmin):
     """Define admin model for User model."""
     ordering = ['id']
     list_display = ['email', 'name']
+    list_filter = ['is_staff', 'is_active']
+    search_fields = ['email', 'name']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
         (
@@ -40,7 +51,46 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
+class StreamingPlatformAdmin(admin.ModelAdmin):
+    """Define admin model for StreamingPlatform model."""
+    list_display = ['name', 'website']
+    search_fields = ['name']
+    raw_id_fields = ['user']
+    show_full_result_count = False
+
+
+class WatchListAdmin(LargeTableAdmin):
+    """Define admin model for WatchList model."""
+    ordering = ['-id']
+    list_display = ['title', 'platform', 'active', 'total_reviews',
+                    'average_rating', 'created_at']
+    list_select_related = ['platform']
+    list_filter = ['active']
+    search_fields = ['^title']
+    raw_id_fields = ['user']
+    autocomplete_fields = ['platform']
+    readonly_fields = ['total_reviews', 'average_rating']
+
+
+class ReviewAdmin(LargeTableAdmin):
+    """Define admin model for Review model."""
+    ordering = ['-id']
+    list_display = ['id', 'watchlist', 'user', 'rating', 'active',
+                    'created_at']
+    list_select_related = ['watchlist', 'user']
+    list_filter = ['active']
+    raw_id_fields = ['user', 'watchlist']
+
+    def get_queryset(self, request):
+        # The default manager hides inactive reviews.
+        queryset = models.Review.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+
 admin.site.register(models.User, UserAdmin)
-admin.site.register(models.WatchList)
-admin.site.register(models.StreamingPlatform)
-admin.site.register(models.Review)
+admin.site.register(models.WatchList, WatchListAdmin)
+admin.site.register(models.StreamingPlatform, StreamingPlatformAdmin)
+admin.site.register(models.Review, ReviewAdmin)
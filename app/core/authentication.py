@@ -1,8 +1,18 @@
 import pytz
-from datetime import timedelta, datetime
+from datetime import datetime
 
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import exceptions
 from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+def expired_tokens():
+    """Return the tokens older than `AUTH_TOKEN_TTL`."""
+    return Token.objects.filter(
+        created__lt=timezone.now() - settings.AUTH_TOKEN_TTL
+    )
 
 
 class ExpiringTokenAuthentication(TokenAuthentication):
@@ -19,7 +29,7 @@ class ExpiringTokenAuthentication(TokenAuthentication):
         utc_now = datetime.utcnow()
         utc_now = utc_now.replace(tzinfo=pytz.utc)
 
-        if token.created < utc_now - timedelta(hours=24):
+        if token.created < utc_now - settings.AUTH_TOKEN_TTL:
             raise exceptions.AuthenticationFailed('Token has expired')
 
         return token.user, token
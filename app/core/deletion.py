@@ -0,0 +1,121 @@
+"""
+Chunked bulk deletion for objects with large cascades.
+
+Django's `Collector` loads every cascaded object into memory and sends
+`pre_delete`/`post_delete` for each of them, so deleting a platform or a
+user runs the review signals once per review, recomputing aggregates of
+titles that are about to be deleted themselves. `bulk_delete` walks the
+same `on_delete` rules but deletes children before parents with raw
+`DELETE ... WHERE pk IN (...)` statements, a chunk at a time, then
+recomputes the aggregates of the surviving titles once.
+"""
+from django.db import models, router, transaction
+from django.db.models.deletion import (ProtectedError, RestrictedError,
+                                       get_candidate_relations_to_delete)
+
+from core.models import DeletedReview, Review
+from watchlist import counters
+
+
+CHUNK_SIZE = 2000
+
+
+class BulkDeletion:
+    """
+    Deletes the rows of a queryset and everything cascading from them.
+
+    `progress` is called with the model and the number of rows after each
+    deleted chunk.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE, progress=None):
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.deleted = {}
+        self.touched_titles = set()
+
+    def delete(self, queryset):
+        """Delete `queryset` and its cascade. Return the deleted counts."""
+        self._delete(queryset.model, queryset)
+        self.recompute_titles()
+        return self.deleted
+
+    def _delete(self, model, queryset):
+        using = router.db_for_write(model)
+        while True:
+            pks = list(queryset.order_by().values_list('pk', flat=True)
+                       [:self.chunk_size])
+            if not pks:
+                return
+
+            # Children go first, each level in its own short transactions.
+            for relation in get_candidate_relations_to_delete(model._meta):
+                self._delete_related(relation, pks)
+
+            rows = model._base_manager.using(using).filter(pk__in=pks)
+            with transaction.atomic(using=using):
+                if model is Review:
+                    # Inactive reviews are not part of the aggregates,
+                    # nor of the similar titles.
+                    reviews = list(rows.filter(active=True).values_list(
+                        'user_id', 'watchlist_id'
+                    ))
+                    self.touched_titles.update(
+                        title for user, title in reviews
+                    )
+                    DeletedReview.objects.bulk_create([
+                        DeletedReview(user_id=user, watchlist_id=title)
+                        for user, title in reviews
+                    ])
+                count = rows._raw_delete(using)
+
+            label = model._meta.label
+            self.deleted[label] = self.deleted.get(label, 0) + count
+            if self.progress:
+                self.progress(model, count)
+
+    def _delete_related(self, relation, pks):
+        field = relation.field
+        on_delete = field.remote_field.on_delete
+        related = relation.related_model._base_manager.filter(
+            **{'{}__in'.format(field.name): pks}
+        )
+        if on_delete is models.DO_NOTHING:
+            return
+        if on_delete is models.CASCADE:
+            self._delete(relation.related_model, related)
+        elif on_delete is models.SET_NULL:
+            related.update(**{field.name: None})
+        elif on_delete in (models.PROTECT, models.RESTRICT):
+            objects = list(related[:1])
+            if objects:
+                error = (ProtectedError if on_delete is models.PROTECT
+                         else RestrictedError)
+                raise error('Cannot delete, referenced through {}.'.format(
+                    field), set(objects))
+        else:
+            raise ValueError(
+                'Cannot delete, on_delete of {} is not supported.'.format(
+                    field)
+            )
+
+    def recompute_titles(self):
+        """Recompute the aggregates of titles that lost reviews."""
+        recompute_titles(self.touched_titles, self.chunk_size)
+        self.touched_titles.clear()
+
+
+def recompute_titles(title_ids, chunk_size=CHUNK_SIZE):
+    """
+    Recompute the aggregates of the titles in `title_ids` that still
+    exist, `chunk_size` at a time. Their pending rating counters are
+    dropped, the deleted reviews are counted in them.
+    """
+    titles = sorted(title_ids)
+    for start in range(0, len(titles), chunk_size):
+        counters.flush_titles(titles[start:start + chunk_size])
+
+
+def bulk_delete(queryset, chunk_size=CHUNK_SIZE, progress=None):
+    """Delete `queryset` and its cascade in chunks, see `BulkDeletion`."""
+    return BulkDeletion(chunk_size, progress).delete(queryset)
@@ -0,0 +1,57 @@
+"""
+Django command to move long inactive reviews to the archive table
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.deletion import bulk_delete
+from core.models import ArchivedReview, Review
+
+
+class Command(BaseCommand):
+    """Django command to move long inactive reviews to the archive table"""
+    help = ('Move reviews inactive for more than --days to the '
+            'ArchivedReview table, --batch-size reviews per transaction.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        # Served by the partial review_inactive_updated_idx index.
+        stale = Review.all_objects.filter(
+            active=False, updated_at__lt=cutoff
+        ).order_by('pk')
+
+        archived = 0
+        while True:
+            with transaction.atomic():
+                reviews = list(stale.select_for_update()[
+                    :options['batch_size']])
+                if not reviews:
+                    break
+
+                ArchivedReview.objects.bulk_create([
+                    ArchivedReview(id=review.pk, user_id=review.user_id,
+                                   watchlist_id=review.watchlist_id,
+                                   rating=review.rating,
+                                   description=review.description,
+                                   created_at=review.created_at,
+                                   updated_at=review.updated_at)
+                    for review in reviews
+                ], ignore_conflicts=True)
+                bulk_delete(Review.all_objects.filter(
+                    pk__in=[review.pk for review in reviews]
+                ))
+            archived += len(reviews)
+            self.stdout.write('Archived {} reviews.'.format(archived))
+
+        self.stdout.write(self.style.SUCCESS(
+            'Archived {} reviews inactive since {}.'.format(
+                archived, cutoff.date())
+        ))
@@ -0,0 +1,142 @@
+"""
+Django command to benchmark the API against a throwaway database
+"""
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (setup_test_environment,
+                               teardown_test_environment)
+from rest_framework.views import APIView
+
+from benchmarks import dataset, driver, logins, renderers
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the API against a throwaway database"""
+    help = ('Seed a throwaway test database (SQLite or Postgres, following '
+            'DATABASES) and run a benchmark suite against it: "api" loads '
+            'the endpoints from several threads, "render" times the JSON '
+            'renderers on /api/watch/ pages, "login" measures the logins '
+            'per second of every installed password hasher.')
+    suites = ('api', 'render', 'login')
+
+    def add_arguments(self, parser):
+        parser.add_argument('suite', nargs='?', default='api',
+                            choices=self.suites)
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--platforms', type=int, default=5)
+        parser.add_argument('--titles', type=int, default=500)
+        parser.add_argument('--reviews', type=int, default=5000)
+        parser.add_argument('--requests', type=int, default=2000,
+                            help='Requests (api, login) or renders (render) '
+                                 'to run.')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--scenarios',
+                            help='Comma separated subset of: {}'.format(
+                                ', '.join(driver.Scenarios.weights)))
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--throttle', action='store_true',
+                            help='Keep the API throttles enabled.')
+        parser.add_argument('--keepdb', action='store_true',
+                            help='Keep the benchmark database afterwards.')
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        if options['scenarios']:
+            unknown = (set(options['scenarios'].split(','))
+                       - set(driver.Scenarios.weights))
+            if unknown:
+                raise CommandError('Unknown scenarios: {}'.format(
+                    ', '.join(sorted(unknown))))
+
+        if connection.vendor == 'sqlite':
+            # The in-memory test database locks whole tables under
+            # concurrent writers, use a file instead.
+            connection.settings_dict['TEST']['NAME'] = os.path.join(
+                tempfile.gettempdir(), 'benchmark.sqlite3'
+            )
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options['keepdb']
+        )
+        if options['keepdb']:
+            # The kept database of a previous run is reused, empty it.
+            call_command('flush', interactive=False, verbosity=0)
+        try:
+            self.stdout.write('Seeding {users} users, {titles} titles and '
+                              '{reviews} reviews...'.format(**options))
+            data = dataset.seed(users=options['users'],
+                                platforms=options['platforms'],
+                                titles=options['titles'],
+                                reviews=options['reviews'],
+                                seed=options['seed'])
+            run = getattr(self, 'run_{}'.format(options['suite']))
+            run(data, options)
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options['keepdb']
+            )
+            teardown_test_environment()
+
+    def run_api(self, data, options):
+        names = options['scenarios'] and options['scenarios'].split(',')
+        self.stdout.write('Sending {requests} requests from '
+                          '{concurrency} threads...'.format(**options))
+        throttles = ([] if not options['throttle']
+                     else APIView.throttle_classes)
+        with patch.object(APIView, 'throttle_classes', throttles):
+            samples, elapsed = driver.run(
+                driver.Scenarios(data, names),
+                requests=options['requests'],
+                concurrency=options['concurrency'],
+                seed=options['seed'],
+            )
+
+        self.stdout.write('\nDatabase: {}'.format(connection.vendor))
+        header = '{:<16}{:>9}{:>8}{:>10}{:>9}{:>9}{:>9}{:>9}'
+        row = '{scenario:<16}{requests:>9}{errors:>8}{rps:>10.1f}' \
+              '{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}{queries:>9.1f}'
+        self.stdout.write(header.format('scenario', 'requests', 'errors',
+                                        'rps', 'p50 ms', 'p95 ms', 'p99 ms',
+                                        'queries'))
+        for values in driver.summarize(samples, elapsed):
+            self.stdout.write(row.format(**values))
+
+    def run_render(self, data, options):
+        page = renderers.watchlist_page()
+        self.stdout.write('Rendering a {}-title page {} times...\n'.format(
+            len(page['results']), options['requests']))
+
+        header = '{:<28}{:>9}{:>12}{:>12}'
+        row = '{renderer:<28}{bytes:>9}{us:>12.1f}{per_second:>12.0f}'
+        self.stdout.write(header.format('renderer', 'bytes', 'us/render',
+                                        'renders/s'))
+        for values in renderers.run(page, rounds=options['requests']):
+            self.stdout.write(row.format(**values))
+
+    def run_login(self, data, options):
+        hashers = logins.available_hashers()
+        self.stdout.write('Logging in {} times from {} threads with {} '
+                          'hashers...\n'.format(
+                              options['requests'], options['concurrency'],
+                              len(hashers)))
+        throttles = ([] if not options['throttle']
+                     else APIView.throttle_classes)
+        with patch.object(APIView, 'throttle_classes', throttles):
+            rows = logins.run(data, hashers, logins=options['requests'],
+                              concurrency=options['concurrency'],
+                              seed=options['seed'])
+
+        header = '{:<32}{:>8}{:>8}{:>10}{:>10}{:>9}{:>9}'
+        row = '{hasher:<32}{logins:>8}{errors:>8}{per_second:>10.1f}' \
+              '{per_core:>10.1f}{p50:>9.1f}{p99:>9.1f}'
+        self.stdout.write(header.format('hasher', 'logins', 'errors',
+                                        'logins/s', 'per core', 'p50 ms',
+                                        'p99 ms'))
+        for values in rows:
+            self.stdout.write(row.format(**values))
@@ -0,0 +1,49 @@
+"""
+Django command to compute the similar titles of every title
+"""
+from time import monotonic
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from watchlist import similarity
+
+
+def datetime(value):
+    """argparse type for ISO 8601 datetimes."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise CommandError('Invalid datetime: {}'.format(value))
+    return parsed
+
+
+class Command(BaseCommand):
+    """Django command to compute the similar titles of every title"""
+    help = ('Compute the item-item cosine similarity of titles from the '
+            'review ratings and store the --top-k neighbours of each title. '
+            'With --since only the titles with reviews saved or deleted '
+            'since then, and the titles sharing a reviewer with them, are '
+            'refreshed.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=20)
+        parser.add_argument('--since', type=datetime,
+                            help='ISO 8601 datetime, e.g. 2025-01-31T00:00Z')
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        started = monotonic()
+        title_ids = None
+        if options['since']:
+            title_ids = similarity.changed_titles(options['since'])
+            if not title_ids:
+                self.stdout.write('No titles reviewed since {}.'.format(
+                    options['since'].isoformat()))
+                return
+
+        written = similarity.build(top_k=options['top_k'],
+                                   title_ids=title_ids)
+        self.stdout.write(self.style.SUCCESS(
+            'Computed similar titles of {} titles in {:.1f}s.'.format(
+                written, monotonic() - started)
+        ))
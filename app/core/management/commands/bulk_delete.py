@@ -0,0 +1,53 @@
+"""
+Django command to delete platforms, titles or users with large cascades
+"""
+from time import monotonic
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.deletion import CHUNK_SIZE, bulk_delete
+from core.models import StreamingPlatform, WatchList
+
+
+class Command(BaseCommand):
+    """Django command to delete objects with large cascades"""
+    help = ('Delete the given platforms, titles or users and everything '
+            'cascading from them in chunks, without per-object signals, '
+            'then recompute the aggregates of the surviving titles.')
+    models = {
+        'platform': StreamingPlatform,
+        'title': WatchList,
+        'user': get_user_model(),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(self.models))
+        parser.add_argument('ids', nargs='+', type=int)
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        model = self.models[options['model']]
+        queryset = model._base_manager.filter(pk__in=options['ids'])
+        if not queryset.exists():
+            raise CommandError('No {} with ids {}.'.format(
+                options['model'], ', '.join(map(str, options['ids']))))
+
+        started = monotonic()
+        totals = {}
+
+        def progress(deleted_model, count):
+            label = deleted_model._meta.label
+            totals[label] = totals.get(label, 0) + count
+            self.stdout.write('{}: {} deleted ({:.0f}s)'.format(
+                label, totals[label], monotonic() - started))
+
+        deleted = bulk_delete(queryset, chunk_size=options['chunk_size'],
+                              progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            'Deleted {} in {:.0f}s.'.format(
+                ', '.join('{} {}'.format(count, label)
+                          for label, count in sorted(deleted.items())),
+                monotonic() - started)
+        ))
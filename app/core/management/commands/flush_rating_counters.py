@@ -0,0 +1,24 @@
+"""
+Django command to write the cached rating counters back to the database
+"""
+from time import monotonic
+
+from django.core.management.base import BaseCommand
+
+from watchlist import counters
+
+
+class Command(BaseCommand):
+    """Django command to write the cached rating counters back"""
+    help = ('Recompute total_reviews and average_rating of every title from '
+            'the reviews table and discard the pending cache counters. Run '
+            'it on a schedule when RATING_COUNTERS is enabled.')
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        started = monotonic()
+        written = counters.flush_all()
+        self.stdout.write(self.style.SUCCESS(
+            'Flushed rating counters of {} titles in {:.1f}s.'.format(
+                written, monotonic() - started)
+        ))
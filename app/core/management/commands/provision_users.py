@@ -0,0 +1,57 @@
+"""
+Django command to create user accounts in bulk from a CSV file
+"""
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from user.provisioning import provision
+from user.serializers import ProvisionUserSerializer
+
+
+class Command(BaseCommand):
+    """Django command to create user accounts in bulk from a CSV file"""
+    help = ('Create the users of a CSV file with email, password and name '
+            'columns, each with an auth token, --batch-size users per '
+            'INSERT and passwords hashed in --workers threads. Nothing '
+            'is created when a row is invalid.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--workers', type=int, default=1)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        with open(options['path'], newline='') as file:
+            rows = list(csv.DictReader(file))
+
+        batch_size = options['batch_size']
+        created = 0
+        with transaction.atomic():
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                serializer = ProvisionUserSerializer(data=batch, many=True)
+                try:
+                    serializer.is_valid(raise_exception=True)
+                    provision(serializer.validated_data, options['workers'])
+                except ValidationError as error:
+                    errors = error.detail
+                    if isinstance(errors, dict):
+                        errors = errors['users']
+                    raise CommandError('\n'.join(
+                        'Row {}: {}'.format(start + index + 2, '; '.join(
+                            '{}: {}'.format(field, ' '.join(messages))
+                            for field, messages in row_errors.items()
+                        ))
+                        for index, row_errors in enumerate(errors)
+                        if row_errors
+                    ))
+                created += len(batch)
+                self.stdout.write('Created {} users.'.format(created))
+
+        self.stdout.write(self.style.SUCCESS(
+            'Provisioned {} users.'.format(created)
+        ))
@@ -0,0 +1,29 @@
+"""
+Django command to rebuild the watchlist summary table
+"""
+from time import monotonic
+
+from django.core.management.base import BaseCommand
+
+from core.models import WatchList
+
+
+class Command(BaseCommand):
+    """Django command to rebuild the watchlist summary table"""
+    help = ('Create or update the WatchListSummary row of every title, for '
+            'instance after bulk imports or updates that skip signals.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        started = monotonic()
+        written = WatchList.objects.refresh_summaries(
+            batch_size=options['batch_size']
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            'Refreshed {} summaries in {:.1f}s.'.format(
+                written, monotonic() - started)
+        ))
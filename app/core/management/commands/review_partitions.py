@@ -0,0 +1,43 @@
+"""
+Django command to create the monthly partitions of the reviews table
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core import partitioning
+
+
+class Command(BaseCommand):
+    """Django command to create the monthly partitions of the reviews table"""
+    help = ('Create the partitions of the reviews table for the next '
+            '--months months. With --convert, partition the table first '
+            'if it is not partitioned yet; this locks the reviews table '
+            'for the whole copy, run it in a maintenance window.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int,
+                            default=partitioning.MONTHS_AHEAD)
+        parser.add_argument('--convert', action='store_true')
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        if connection.vendor != 'postgresql':
+            raise CommandError('Review partitioning needs PostgreSQL.')
+
+        with transaction.atomic():
+            if not partitioning.is_partitioned(connection):
+                if not options['convert']:
+                    raise CommandError('The reviews table is not '
+                                       'partitioned, see --convert.')
+                self.stdout.write('Partitioning the reviews table...')
+                partitioning.partition_table(connection, options['months'])
+
+            start = partitioning.month_start(timezone.now())
+            created = partitioning.create_partitions(
+                connection, start,
+                partitioning.add_months(start, options['months'])
+            )
+        self.stdout.write(self.style.SUCCESS(
+            'Created {} partitions.'.format(len(created))
+        ))
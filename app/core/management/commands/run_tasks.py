@@ -0,0 +1,50 @@
+"""
+Django command to run the queued background tasks
+"""
+import multiprocessing
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.tasks import run_batch
+
+
+def work(batch_size, poll, once):
+    """Run batches until the queue is empty and `once` is set."""
+    ran = 0
+    while True:
+        claimed = run_batch(batch_size)
+        ran += claimed
+        if not claimed:
+            if once:
+                return ran
+            time.sleep(poll)
+
+
+class Command(BaseCommand):
+    """Django command to run the queued background tasks"""
+    help = ('Run the queued background tasks in --workers processes, '
+            '--batch-size tasks per transaction. With --once, exit when '
+            'the queue is empty.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1)
+        parser.add_argument('--batch-size', type=int)
+        parser.add_argument('--poll', type=float, default=1.0,
+                            help='Seconds to wait when the queue is empty.')
+        parser.add_argument('--once', action='store_true')
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        arguments = (options['batch_size'], options['poll'], options['once'])
+        if options['workers'] == 1:
+            ran = work(*arguments)
+        else:
+            # Forked workers must not share the parent's connections.
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            with context.Pool(options['workers']) as pool:
+                ran = sum(pool.starmap(work,
+                                       [arguments] * options['workers']))
+        self.stdout.write(self.style.SUCCESS('Ran {} tasks.'.format(ran)))
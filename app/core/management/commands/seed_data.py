@@ -0,0 +1,276 @@
+"""
+Django command to generate large synthetic data sets
+"""
+import io
+import multiprocessing
+import os
+import random
+import secrets
+from datetime import timedelta
+from itertools import cycle
+from time import monotonic
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+
+from core.models import StreamingPlatform, WatchList, Review
+
+
+SUFFIXES = {'k': 10 ** 3, 'm': 10 ** 6}
+RATING_WEIGHTS = (4, 7, 17, 36, 36)
+PASSWORD = 'seed-pass123'
+
+# Filled in by the parent process before the worker processes fork.
+_shared = {}
+
+
+def count(value):
+    """argparse type accepting counts such as 500, 100k or 50M."""
+    try:
+        if value[-1:].lower() in SUFFIXES:
+            return int(float(value[:-1]) * SUFFIXES[value[-1].lower()])
+        return int(value)
+    except ValueError:
+        raise CommandError('Invalid count: {}'.format(value))
+
+
+def zipf_counts(total, n, exponent, cap, rand):
+    """
+    Split `total` reviews over `n` titles following Zipf's law.
+
+    No title gets more than `cap` reviews (one per user). The counts are
+    shuffled so popularity is independent of the title id.
+    """
+    total = min(total, n * cap)
+    weights = [rank ** -exponent for rank in range(1, n + 1)]
+    scale = total / sum(weights)
+    counts = [min(cap, int(weight * scale)) for weight in weights]
+
+    remainder = total - sum(counts)
+    for index in cycle(range(n)):
+        if not remainder:
+            break
+        if counts[index] < cap:
+            counts[index] += 1
+            remainder -= 1
+
+    rand.shuffle(counts)
+    return counts
+
+
+def title_ratings(seed, index, size):
+    """Return the ratings of title `index`, the same on every call."""
+    rand = random.Random('{}-ratings-{}'.format(seed, index))
+    return rand.choices(range(1, 6), RATING_WEIGHTS, k=size)
+
+
+def _create_users(task):
+    start, stop = task
+    tag, password = _shared['tag'], _shared['password']
+    users = get_user_model().objects.bulk_create([
+        get_user_model()(email='{}-{}@seed.example.com'.format(tag, i),
+                         name='Seed', password=password)
+        for i in range(start, stop)
+    ])
+    return [user.pk for user in users]
+
+
+def _create_titles(task):
+    start, stop = task
+    seed, counts = _shared['seed'], _shared['counts']
+    user_ids, platform_ids = _shared['user_ids'], _shared['platform_ids']
+    rand = random.Random('{}-titles-{}'.format(seed, start))
+
+    titles = []
+    for i in range(start, stop):
+        ratings = title_ratings(seed, i, counts[i])
+        titles.append(WatchList(
+            title='Title {}'.format(i),
+            description='Synthetic title {}'.format(i),
+            user_id=rand.choice(user_ids),
+            platform_id=rand.choice(platform_ids),
+            total_reviews=len(ratings),
+            average_rating=sum(ratings) / len(ratings) if ratings else None,
+        ))
+    return [title.pk for title in WatchList.objects.bulk_create(titles)]
+
+
+def _create_reviews(task):
+    start, stop = task
+    seed, counts = _shared['seed'], _shared['counts']
+    user_ids, title_ids = _shared['user_ids'], _shared['title_ids']
+    now = timezone.now()
+    days = _shared['days']
+
+    rows = []
+    for i in range(start, stop):
+        rand = random.Random('{}-reviews-{}'.format(seed, i))
+        ratings = title_ratings(seed, i, counts[i])
+        reviewers = rand.sample(user_ids, len(ratings))
+        for user_id, rating in zip(reviewers, ratings):
+            created = now - timedelta(seconds=rand.randrange(days * 86400))
+            rows.append((user_id, title_ids[i], rating, created))
+
+    if connection.vendor == 'postgresql':
+        _copy_reviews(rows)
+    else:
+        # auto_now_add overrides created_at, so only COPY spreads dates.
+        Review.objects.bulk_create([
+            Review(user_id=user_id, watchlist_id=watchlist_id,
+                   rating=rating, description='Synthetic review')
+            for user_id, watchlist_id, rating, _ in rows
+        ], batch_size=5000)
+    return len(rows)
+
+
+def _copy_reviews(rows):
+    """Insert review rows with a single COPY statement."""
+    buffer = io.StringIO()
+    for user_id, watchlist_id, rating, created in rows:
+        buffer.write('{}\t{}\t{}\tSynthetic review\t{}\t{}\tt\n'.format(
+            user_id, watchlist_id, rating,
+            created.isoformat(), created.isoformat()
+        ))
+    buffer.seek(0)
+
+    columns = ('user_id', 'watchlist_id', 'rating', 'description',
+               'created_at', 'updated_at', 'active')
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            'COPY {} ({}) FROM STDIN'.format(Review._meta.db_table,
+                                             ', '.join(columns)),
+            buffer
+        )
+
+
+def _ranges(total, size):
+    return [(start, min(start + size, total))
+            for start in range(0, total, size)]
+
+
+def _review_ranges(counts, size):
+    """Split the titles into ranges holding about `size` reviews each."""
+    ranges, start, pending = [], 0, 0
+    for index, value in enumerate(counts):
+        pending += value
+        if pending >= size:
+            ranges.append((start, index + 1))
+            start, pending = index + 1, 0
+    if start < len(counts):
+        ranges.append((start, len(counts)))
+    return ranges
+
+
+class Command(BaseCommand):
+    """Django command to generate large synthetic data sets"""
+    help = ('Generate users, platforms, titles and Zipf distributed reviews '
+            'with bulk inserts (COPY on Postgres) from several processes. '
+            'Title aggregates and summaries are computed up front, no '
+            'signals are run.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=count, default=count('1k'))
+        parser.add_argument('--platforms', type=count, default=20)
+        parser.add_argument('--titles', type=count, default=count('10k'))
+        parser.add_argument('--reviews', type=count, default=count('100k'))
+        parser.add_argument('--zipf', type=float, default=1.1,
+                            help='Exponent of the reviews-per-title law.')
+        parser.add_argument('--days', type=int, default=365,
+                            help='Spread review dates over this many days '
+                                 '(Postgres only).')
+        parser.add_argument('--workers', type=int,
+                            default=os.cpu_count() or 1)
+        parser.add_argument('--chunk-size', type=int, default=50000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        self.workers = options['workers']
+        if connection.vendor == 'sqlite' and self.workers > 1:
+            self.stdout.write('SQLite allows a single writer, '
+                              'using one worker.')
+            self.workers = 1
+        if min(options['users'], options['titles'],
+               options['platforms']) < 1:
+            raise CommandError('Users, titles and platforms must be > 0.')
+
+        seed = options['seed']
+        chunk_size = options['chunk_size']
+        rand = random.Random(seed)
+        _shared.update(seed=seed, days=max(options['days'], 1),
+                       tag=secrets.token_hex(4),
+                       password=make_password(PASSWORD))
+        self.started = monotonic()
+
+        _shared['user_ids'] = self.run_tasks(
+            'users', _create_users, _ranges(options['users'], chunk_size)
+        )
+
+        owner = _shared['user_ids'][0]
+        _shared['platform_ids'] = [
+            platform.pk for platform in StreamingPlatform.objects.bulk_create(
+                StreamingPlatform(user_id=owner,
+                                  name='Platform {}'.format(i),
+                                  about='Synthetic platform',
+                                  website='http://p{}.example.com'.format(i))
+                for i in range(options['platforms'])
+            )
+        ]
+
+        _shared['counts'] = zipf_counts(options['reviews'],
+                                        options['titles'], options['zipf'],
+                                        len(_shared['user_ids']), rand)
+        _shared['title_ids'] = self.run_tasks(
+            'titles', _create_titles,
+            _ranges(options['titles'], max(chunk_size // 10, 1))
+        )
+
+        created = sum(self.run_tasks(
+            'reviews', _create_reviews,
+            _review_ranges(_shared['counts'], chunk_size), flatten=False
+        ))
+
+        title_ids = _shared['title_ids']
+        WatchList.objects.filter(
+            pk__gte=min(title_ids), pk__lte=max(title_ids)
+        ).refresh_summaries()
+
+        self.stdout.write(self.style.SUCCESS(
+            'Created {} users, {} titles and {} reviews in {:.0f}s. '
+            'Password: {}'.format(len(_shared['user_ids']),
+                                  len(_shared['title_ids']), created,
+                                  monotonic() - self.started, PASSWORD)
+        ))
+        _shared.clear()
+
+    def run_tasks(self, label, func, tasks, flatten=True):
+        """Run `func` over `tasks` in the worker pool, keeping the order."""
+        results = []
+        if self.workers == 1:
+            iterator = map(func, tasks)
+            pool = None
+        else:
+            # Children must open their own database connections.
+            connections.close_all()
+            pool = multiprocessing.get_context('fork').Pool(self.workers)
+            iterator = pool.imap(func, tasks)
+
+        try:
+            step = max(len(tasks) // 10, 1)
+            for done, result in enumerate(iterator, 1):
+                if flatten:
+                    results.extend(result)
+                else:
+                    results.append(result)
+                if done % step == 0 or done == len(tasks):
+                    self.stdout.write('{}: {}/{} chunks ({:.0f}s)'.format(
+                        label, done, len(tasks), monotonic() - self.started
+                    ))
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+        return results
@@ -0,0 +1,37 @@
+"""
+Django command to delete expired auth tokens
+"""
+from django.core.management.base import BaseCommand
+
+from core.authentication import expired_tokens
+
+
+class Command(BaseCommand):
+    """Django command to delete expired auth tokens"""
+    help = ('Delete the auth tokens older than AUTH_TOKEN_TTL, --batch-size '
+            'tokens per statement. Meant to run periodically, e.g. hourly '
+            'from cron.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        deleted = 0
+        last_key = ''
+        while True:
+            # Walk the primary key so each batch resumes where the last
+            # one stopped instead of scanning the table from the start.
+            keys = list(expired_tokens().filter(key__gt=last_key).order_by(
+                'key').values_list('key', flat=True)[:options['batch_size']])
+            if not keys:
+                break
+
+            # Tokens refreshed by a login meanwhile are no longer expired.
+            count, _ = expired_tokens().filter(key__in=keys).delete()
+            deleted += count
+            last_key = keys[-1]
+
+        self.stdout.write(self.style.SUCCESS(
+            'Deleted {} expired tokens.'.format(deleted)
+        ))
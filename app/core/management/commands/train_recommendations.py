@@ -0,0 +1,51 @@
+"""
+Django command to train the recommendation model
+"""
+import os
+from time import monotonic
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from watchlist import factorization
+
+
+class Command(BaseCommand):
+    """Django command to train the recommendation model"""
+    help = ('Factorize the review ratings with alternating least squares '
+            'and save the float32 factor arrays to RECOMMENDATIONS_DIR, '
+            'where web processes pick them up.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--factors', type=int, default=32)
+        parser.add_argument('--iterations', type=int, default=10)
+        parser.add_argument('--regularization', type=float, default=0.1)
+        parser.add_argument('--workers', type=int,
+                            default=os.cpu_count() or 1)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', default=settings.RECOMMENDATIONS_DIR)
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        started = monotonic()
+        arrays = factorization.train(
+            factors=options['factors'],
+            iterations=options['iterations'],
+            regularization=options['regularization'],
+            workers=options['workers'],
+            seed=options['seed'],
+            progress=lambda iteration: self.stdout.write(
+                'iteration {}/{} ({:.0f}s)'.format(
+                    iteration, options['iterations'],
+                    monotonic() - started)
+            ),
+        )
+        os.makedirs(options['output'], exist_ok=True)
+        version = factorization.save(arrays, options['output'])
+
+        self.stdout.write(self.style.SUCCESS(
+            'Saved model {} of {} users and {} titles, training RMSE '
+            '{:.3f}, in {:.0f}s.'.format(
+                version, len(arrays['user_ids']), len(arrays['title_ids']),
+                arrays['rmse'], monotonic() - started)
+        ))
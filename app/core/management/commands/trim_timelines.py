@@ -0,0 +1,25 @@
+"""
+Django command to cap the length of the review feed timelines
+"""
+from django.core.management.base import BaseCommand
+
+from user import feed
+
+
+class Command(BaseCommand):
+    """Django command to cap the length of the review feed timelines"""
+    help = ('Delete the timeline entries beyond the newest --length of '
+            'every user (FEED["TIMELINE_LENGTH"] by default), and recount '
+            'the followers of users whose count drifted.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--length', type=int)
+
+    def handle(self, *args, **options):
+        """Entry point for command"""
+        deleted = feed.trim(options['length'])
+        recounted = feed.recount_followers()
+        self.stdout.write(self.style.SUCCESS(
+            'Deleted {} timeline entries, recounted the followers of {} '
+            'users.'.format(deleted, recounted)
+        ))
@@ -0,0 +1,239 @@
+"""
+In-process request metrics exposed in the Prometheus text format.
+"""
+import bisect
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.db import connection
+from django.http import HttpResponse
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+from core.pagination import EstimatedCountPaginator
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+current_stats = ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    """Timings collected while a single request is handled."""
+    __slots__ = ('total', 'queries', 'db_time', 'serializer_time',
+                 'serializing')
+
+    def __init__(self):
+        self.total = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        """`connection.execute_wrapper` hook counting and timing queries."""
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += perf_counter() - start
+            self.queries += 1
+
+    def server_timing(self):
+        """Return the value of the `Server-Timing` response header."""
+        return ('total;dur={:.1f}, db;dur={:.1f};desc="{} queries", '
+                'serialize;dur={:.1f}').format(self.total * 1000,
+                                               self.db_time * 1000,
+                                               self.queries,
+                                               self.serializer_time * 1000)
+
+
+@contextmanager
+def serializing():
+    """
+    Add the time spent in the block to the serializer time of the request.
+
+    Only the outermost block is timed, so nested serializers are not
+    counted twice. Outside an instrumented request this is a single lookup.
+    """
+    stats = current_stats.get()
+    if stats is None or stats.serializing:
+        yield
+        return
+
+    stats.serializing = True
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        stats.serializer_time += perf_counter() - start
+        stats.serializing = False
+
+
+class TimedSerializerMixin:
+    """Times `to_representation` of a DRF serializer, see `serializing`."""
+
+    def to_representation(self, instance):
+        with serializing():
+            return super().to_representation(instance)
+
+
+def _escape(value):
+    return (str(value).replace('\\', r'\\')
+            .replace('\n', r'\n').replace('"', r'\"'))
+
+
+def _format(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """A Prometheus histogram with a single `view` label."""
+
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, view, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(view)
+            if series is None:
+                series = self._series[view] = [0] * (len(self.buckets) + 1)
+                series.append(0)
+            series[index] += 1
+            series[-1] += value
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        lines = [
+            '# HELP {} {}'.format(self.name, self.documentation),
+            '# TYPE {} histogram'.format(self.name),
+        ]
+        with self._lock:
+            series = {view: list(values)
+                      for view, values in self._series.items()}
+
+        for view, values in sorted(series.items()):
+            label = 'view="{}"'.format(_escape(view))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), values[:-1]):
+                cumulative += count
+                lines.append('{}_bucket{{{},le="{}"}} {}'.format(
+                    self.name, label, _format(bound), cumulative))
+            lines.append('{}_sum{{{}}} {}'.format(
+                self.name, label, _format(values[-1])))
+            lines.append('{}_count{{{}}} {}'.format(
+                self.name, label, cumulative))
+        return lines
+
+
+class Gauge:
+    """A Prometheus gauge read from `read()` when rendered."""
+
+    def __init__(self, name, documentation, read):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+
+    def render(self):
+        value = self.read()
+        if value is None:
+            return []
+        return [
+            '# HELP {} {}'.format(self.name, self.documentation),
+            '# TYPE {} gauge'.format(self.name),
+            '{} {}'.format(self.name, _format(value)),
+        ]
+
+
+def token_rows():
+    """Return the rows of the token table, estimated when it is large."""
+    tokens = Token.objects.all()
+    estimate = EstimatedCountPaginator.estimate(tokens)
+    if estimate is not None and estimate > EstimatedCountPaginator.exact_limit:
+        return estimate
+    return tokens.count()
+
+
+def token_table_bytes():
+    """Return the size of the token table and its indexes on Postgres."""
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_total_relation_size(%s)',
+                       [Token._meta.db_table])
+        return cursor.fetchone()[0]
+
+
+class Registry:
+    """All request histograms of this process."""
+
+    def __init__(self):
+        self.duration = Histogram('http_request_duration_seconds',
+                                  'Wall time spent handling the request.',
+                                  DURATION_BUCKETS)
+        self.queries = Histogram('http_request_db_queries',
+                                 'Database queries run by the request.',
+                                 QUERY_BUCKETS)
+        self.db_duration = Histogram('http_request_db_duration_seconds',
+                                     'Time spent in database queries.',
+                                     DURATION_BUCKETS)
+        self.serializer_duration = Histogram(
+            'http_request_serializer_duration_seconds',
+            'Time spent serializing the response data.',
+            DURATION_BUCKETS
+        )
+        self.response_size = Histogram('http_response_size_bytes',
+                                       'Size of the response body.',
+                                       SIZE_BUCKETS)
+        self.histograms = (self.duration, self.queries, self.db_duration,
+                           self.serializer_duration, self.response_size)
+        self.gauges = (
+            Gauge('auth_tokens', 'Auth tokens stored.', token_rows),
+            Gauge('auth_token_table_bytes',
+                  'Size of the auth token table and its indexes.',
+                  token_table_bytes),
+        )
+
+    def observe(self, view, stats, size):
+        self.duration.observe(view, stats.total)
+        self.queries.observe(view, stats.queries)
+        self.db_duration.observe(view, stats.db_time)
+        self.serializer_duration.observe(view, stats.serializer_time)
+        self.response_size.observe(view, size)
+
+    def clear(self):
+        for histogram in self.histograms:
+            histogram.clear()
+
+    def render(self):
+        lines = []
+        for metric in self.histograms + self.gauges:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+class MetricsView(APIView):
+    """Expose the request metrics of this process to admins."""
+    authentication_classes = (TokenAuthentication,)
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, format=None):
+        return HttpResponse(registry.render(),
+                            content_type='text/plain; version=0.0.4')
@@ -0,0 +1,44 @@
+"""
+Custom middleware for the project.
+"""
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from core.metrics import RequestStats, current_stats, registry
+
+
+class PerformanceMiddleware:
+    """
+    Record wall time, DB queries and serializer time of every request.
+
+    The numbers are sent back in a `Server-Timing` header and aggregated
+    per view in `core.metrics.registry`. The middleware removes itself from
+    the chain unless `PERFORMANCE_METRICS_ENABLED` is set.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PERFORMANCE_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        start = perf_counter()
+        try:
+            with connection.execute_wrapper(stats):
+                response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        stats.total = perf_counter() - start
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        size = 0 if response.streaming else len(response.content)
+        registry.observe(view, stats, size)
+        response['Server-Timing'] = stats.server_timing()
+
+        return response
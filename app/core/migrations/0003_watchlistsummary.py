@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:41
+
+from itertools import islice
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_summaries(apps, schema_editor):
+    WatchList = apps.get_model('core', 'WatchList')
+    WatchListSummary = apps.get_model('core', 'WatchListSummary')
+    rows = WatchList.objects.order_by('pk').values_list(
+        'pk', 'title', 'platform__name', 'average_rating', 'total_reviews',
+        'active', 'created_at'
+    )
+    summaries = (
+        WatchListSummary(watchlist_id=pk, title=title,
+                         platform_name=platform_name,
+                         average_rating=average_rating,
+                         total_reviews=total_reviews, active=active,
+                         created_at=created_at)
+        for (pk, title, platform_name, average_rating, total_reviews,
+             active, created_at) in rows.iterator(chunk_size=2000)
+    )
+    while True:
+        batch = list(islice(summaries, 2000))
+        if not batch:
+            break
+        WatchListSummary.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_watchlist_platform'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WatchListSummary',
+            fields=[
+                ('watchlist', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='core.watchlist')),
+                ('title', models.CharField(max_length=50)),
+                ('platform_name', models.CharField(max_length=30, null=True)),
+                ('average_rating', models.FloatField(null=True)),
+                ('total_reviews', models.PositiveIntegerField(default=0)),
+                ('active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['title'], name='summary_title_idx'), models.Index(fields=['platform_name', 'title'], name='summary_platform_title_idx'), models.Index(fields=['active', 'title'], name='summary_active_title_idx')],
+            },
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
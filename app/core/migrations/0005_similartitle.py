@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_review_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarTitle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.watchlist')),
+                ('watchlist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_titles', to='core.watchlist')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['watchlist', '-score'], name='similar_title_score_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='similartitle',
+            constraint=models.UniqueConstraint(fields=('watchlist', 'similar'), name='similar_title_unique'),
+        ),
+    ]
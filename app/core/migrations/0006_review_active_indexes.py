@@ -0,0 +1,72 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_similartitle'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedReview',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('rating', models.IntegerField()),
+                ('description', models.TextField()),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='review',
+            name='review_user_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='watchlistsummary',
+            name='summary_title_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='watchlistsummary',
+            name='summary_platform_title_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='watchlistsummary',
+            name='summary_active_title_idx',
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('active', True)), fields=['user', '-created_at'], name='review_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('active', True)), fields=['watchlist', '-created_at'], name='review_title_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('active', False)), fields=['updated_at'], name='review_inactive_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchlistsummary',
+            index=models.Index(condition=models.Q(('active', True)), fields=['title'], name='summary_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchlistsummary',
+            index=models.Index(condition=models.Q(('active', True)), fields=['platform_name', 'title'], name='summary_platform_title_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedreview',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedreview',
+            name='watchlist',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.watchlist'),
+        ),
+    ]
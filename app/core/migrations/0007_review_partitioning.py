@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:04
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from core import partitioning
+
+
+def partition_reviews(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql' and settings.REVIEW_PARTITIONING:
+        partitioning.partition_table(connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_review_active_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='timelineentry',
+            name='review',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='core.review'),
+        ),
+        # Not reversed, the partitioned table serves the same models.
+        migrations.RunPython(partition_reviews, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:10
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def fill_platforms(apps, schema_editor):
+    WatchList = apps.get_model('core', 'WatchList')
+    WatchListSummary = apps.get_model('core', 'WatchListSummary')
+    WatchListSummary.objects.update(platform_id=Subquery(
+        WatchList.objects.filter(
+            pk=OuterRef('watchlist_id')
+        ).values('platform_id')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='watchlistsummary',
+            name='platform',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.streamingplatform'),
+        ),
+        migrations.RunPython(fill_platforms, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='watchlistsummary',
+            index=models.Index(condition=models.Q(('active', True)), fields=['platform', 'created_at'], name='summary_platform_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchlistsummary',
+            index=models.Index(condition=models.Q(('active', True)), fields=['platform', 'average_rating'], name='summary_platform_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchlistsummary',
+            index=models.Index(condition=models.Q(('active', True)), fields=['created_at'], name='summary_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchlistsummary',
+            index=models.Index(condition=models.Q(('active', True)), fields=['average_rating'], name='summary_rating_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_summary_range_filters'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='watchlistsummary',
+            name='platform',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.streamingplatform'),
+        ),
+        migrations.AddIndex(
+            model_name='watchlistsummary',
+            index=models.Index(fields=['platform', 'title'], name='summary_platform_id_title_idx'),
+        ),
+    ]
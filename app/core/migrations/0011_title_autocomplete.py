@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:40
+
+from django.db import migrations
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # Match the UPPER(title::text) LIKE of icontains and istartswith.
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX summary_title_trgm_idx ON core_watchlistsummary '
+        'USING gin (UPPER(title::text) gin_trgm_ops) WHERE active'
+    )
+    schema_editor.execute(
+        'CREATE INDEX summary_title_pattern_idx ON core_watchlistsummary '
+        '(UPPER(title::text) text_pattern_ops) WHERE active'
+    )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS summary_title_trgm_idx')
+    schema_editor.execute('DROP INDEX IF EXISTS summary_title_pattern_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_summary_platform_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
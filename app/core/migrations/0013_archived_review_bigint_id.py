@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_timeline_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedreview',
+            name='id',
+            field=models.BigIntegerField(primary_key=True, serialize=False),
+        ),
+    ]
@@ -1,6 +1,9 @@
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
+from django.db.models import Avg, Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings
+from django.utils import timezone
 from django.contrib.auth.models import (AbstractBaseUser,
                                         BaseUserManager,
                                         PermissionsMixin)
@@ -34,6 +37,11 @@ class User(AbstractBaseUser, PermissionsMixin):
     name = models.CharField(max_length=255)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    following = models.ManyToManyField('self',
+                                       symmetrical=False,
+                                       related_name='followers',
+                                       blank=True)
+    followers_count = models.PositiveIntegerField(default=0)
 
     objects = UserManager()
 
@@ -51,6 +59,69 @@ class StreamingPlatform(models.Model):
         return self.name
 
 
+class ActiveManager(models.Manager):
+    """Manager serving only rows with `active` set."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(active=True)
+
+
+class WatchListQuerySet(models.QuerySet):
+    """QuerySet for watchlists"""
+
+    def recompute_ratings(self):
+        """
+        Recompute total_reviews and average_rating from the reviews table
+        with a single UPDATE, bypassing the per-review signals.
+        """
+        reviews = Review.objects.filter(
+            watchlist=OuterRef('pk')
+        ).order_by().values('watchlist')
+        updated = self.update(
+            total_reviews=Coalesce(
+                Subquery(reviews.annotate(count=Count('pk')).values('count')),
+                0
+            ),
+            average_rating=Subquery(
+                reviews.annotate(avg=Avg('rating')).values('avg')
+            ),
+        )
+        self.refresh_summaries()
+        return updated
+
+    def refresh_summaries(self, batch_size=2000):
+        """
+        Create or update the WatchListSummary rows of these watchlists,
+        `batch_size` rows per statement. Return the number of rows written.
+        """
+        rows = self.order_by('pk').values_list(
+            'pk', 'title', 'platform_id', 'platform__name', 'average_rating',
+            'total_reviews', 'active', 'created_at'
+        )
+        written, last = 0, None
+        while True:
+            batch = list((rows if last is None
+                          else rows.filter(pk__gt=last))[:batch_size])
+            if not batch:
+                return written
+
+            WatchListSummary.objects.bulk_create(
+                [WatchListSummary(watchlist_id=pk, title=title,
+                                  platform_id=platform_id,
+                                  platform_name=platform_name,
+                                  average_rating=average_rating,
+                                  total_reviews=total_reviews,
+                                  active=active, created_at=created_at)
+                 for (pk, title, platform_id, platform_name, average_rating,
+                      total_reviews, active, created_at) in batch],
+                update_conflicts=True,
+                unique_fields=['watchlist'],
+                update_fields=WatchListSummary.synced_fields,
+            )
+            written += len(batch)
+            last = batch[-1][0]
+
+
 class WatchList(models.Model):
     title = models.CharField(max_length=50)
     description = models.TextField()
@@ -68,6 +139,73 @@ class WatchList(models.Model):
                                  default=None,
                                  null=True)
 
+    objects = WatchListQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored values, used to log title changes on save.
+        instance._loaded = (instance.__dict__.get('title'),
+                            instance.__dict__.get('active'))
+        return instance
+
+    def __str__(self):
+        return self.title
+
+
+class WatchListSummary(models.Model):
+    """
+    Narrow copy of a watchlist that list pages filter, order and paginate
+    on. Kept in sync by the watchlist signals and `refresh_summaries`.
+    """
+    watchlist = models.OneToOneField(WatchList,
+                                     on_delete=models.CASCADE,
+                                     primary_key=True,
+                                     related_name='summary')
+    title = models.CharField(max_length=50)
+    platform = models.ForeignKey(StreamingPlatform,
+                                 on_delete=models.CASCADE,
+                                 related_name='+',
+                                 null=True,
+                                 db_index=False)
+    platform_name = models.CharField(max_length=30, null=True)
+    average_rating = models.FloatField(null=True)
+    total_reviews = models.PositiveIntegerField(default=0)
+    active = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+
+    objects = ActiveManager()
+    all_objects = models.Manager()
+
+    synced_fields = ['title', 'platform', 'platform_name', 'average_rating',
+                     'total_reviews', 'active', 'created_at']
+
+    class Meta:
+        # List pages only read active titles, the indexes leave out the
+        # inactive ones.
+        indexes = [
+            models.Index(fields=['title'], name='summary_title_idx',
+                         condition=Q(active=True)),
+            models.Index(fields=['platform_name', 'title'],
+                         name='summary_platform_title_idx',
+                         condition=Q(active=True)),
+            # Also serves deleting platforms, so not partial.
+            models.Index(fields=['platform', 'title'],
+                         name='summary_platform_id_title_idx'),
+            # Range filters, alone or within a platform.
+            models.Index(fields=['platform', 'created_at'],
+                         name='summary_platform_created_idx',
+                         condition=Q(active=True)),
+            models.Index(fields=['platform', 'average_rating'],
+                         name='summary_platform_rating_idx',
+                         condition=Q(active=True)),
+            models.Index(fields=['created_at'], name='summary_created_idx',
+                         condition=Q(active=True)),
+            models.Index(fields=['average_rating'],
+                         name='summary_rating_idx',
+                         condition=Q(active=True)),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -86,5 +224,129 @@ class Review(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     active = models.BooleanField(default=True)
 
+    # Inactive reviews are hidden, and left out of the title aggregates.
+    objects = ActiveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at'],
+                         name='review_user_created_idx',
+                         condition=Q(active=True)),
+            models.Index(fields=['watchlist', '-created_at'],
+                         name='review_title_created_idx',
+                         condition=Q(active=True)),
+            models.Index(fields=['updated_at'],
+                         name='review_inactive_updated_idx',
+                         condition=Q(active=False)),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored values, used to record rating deltas on save.
+        instance._loaded = (instance.__dict__.get('watchlist_id'),
+                            instance.__dict__.get('rating'),
+                            instance.__dict__.get('active'))
+        return instance
+
     def __str__(self):
         return str(self.rating) + ' | ' + self.watchlist.title
+
+
+class ArchivedReview(models.Model):
+    """
+    A long inactive review moved out of the reviews table by the
+    `archive_reviews` command. Keeps the id of the review.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL,
+                             on_delete=models.CASCADE,
+                             related_name='+')
+    watchlist = models.ForeignKey(WatchList,
+                                  on_delete=models.CASCADE,
+                                  related_name='+')
+    rating = models.IntegerField()
+    description = models.TextField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return str(self.rating) + ' | ' + str(self.watchlist_id)
+
+
+class TimelineEntry(models.Model):
+    """A review in the feed of a follower of its author."""
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL,
+                              on_delete=models.CASCADE,
+                              related_name='timeline')
+    # No database constraint, the primary key of a partitioned reviews
+    # table also holds created_at.
+    review = models.ForeignKey(Review,
+                               on_delete=models.CASCADE,
+                               db_constraint=False,
+                               related_name='timeline_entries')
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'review'],
+                                    name='timeline_owner_review_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['owner', '-created_at', '-review'],
+                         name='timeline_owner_created_idx'),
+        ]
+
+
+class SimilarTitle(models.Model):
+    """A title rated similarly to `watchlist`, see watchlist.similarity."""
+    watchlist = models.ForeignKey(WatchList,
+                                  on_delete=models.CASCADE,
+                                  related_name='similar_titles')
+    similar = models.ForeignKey(WatchList,
+                                on_delete=models.CASCADE,
+                                related_name='+')
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['watchlist', 'similar'],
+                                    name='similar_title_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['watchlist', '-score'],
+                         name='similar_title_score_idx'),
+        ]
+
+
+class DeletedReview(models.Model):
+    """
+    The user and title of a deleted active review, for the incremental
+    refresh of the similar titles, see watchlist.similarity.
+    """
+    # Plain ids, the user or the title may be deleted as well.
+    user_id = models.BigIntegerField()
+    watchlist_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+
+class Task(models.Model):
+    """A queued call of a registered task, see core.tasks."""
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    failed = models.BooleanField(default=False)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['run_after'], name='task_due_idx',
+                         condition=Q(failed=False)),
+        ]
+
+    def __str__(self):
+        return self.name
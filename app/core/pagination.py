@@ -1,5 +1,14 @@
+from datetime import datetime
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import (PageNumberPagination,
-                                       LimitOffsetPagination, CursorPagination)
+                                       LimitOffsetPagination, CursorPagination,
+                                       Cursor)
+
+from core import partitioning
 
 
 class WatchListPagination(PageNumberPagination):
@@ -20,3 +29,88 @@ class WatchListCursorPagination(CursorPagination):
     page_size = 5
     cursor_query_param = 'record'
     ordering = '-created_at'
+
+
+class FeedCursorPagination(CursorPagination):
+    """
+    Forward only cursor pagination of the pages returned by a
+    `page(position, limit)` callable, see `user.feed.page`. The cursor
+    holds the `(created_at, id)` position of the next page.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    ordering = ('-created_at', '-id')
+
+    def paginate_pages(self, page, request):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+
+        position = None
+        if self.cursor and self.cursor.position:
+            try:
+                created_at, pk = self.cursor.position.rsplit('|', 1)
+                position = (datetime.fromisoformat(created_at), int(pk))
+            except ValueError:
+                raise NotFound(self.invalid_cursor_message)
+
+        results, self.next_position = page(position, self.page_size)
+        return results
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        created_at, pk = self.next_position
+        return self.encode_cursor(Cursor(
+            offset=0, reverse=False,
+            position='{}|{}'.format(created_at.isoformat(), pk)
+        ))
+
+    def get_previous_link(self):
+        return None
+
+
+class ReviewCursorPagination(FeedCursorPagination):
+    """
+    Forward only cursor pagination of a reviews queryset, newest first,
+    read with `core.partitioning.newest` so partitions are pruned.
+    """
+    page_size = 100
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_pages(
+            lambda position, limit: partitioning.newest(queryset, position,
+                                                        limit),
+            request
+        )
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator using the planner's row estimate of unfiltered Postgres
+    tables above `exact_limit` rows instead of running COUNT(*).
+    """
+    exact_limit = 100000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = self.estimate(self.object_list)
+            if estimate is not None and estimate > self.exact_limit:
+                return estimate
+        return super().count
+
+    @staticmethod
+    def estimate(queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples FROM pg_class WHERE relname = %s',
+                           [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        return int(row[0]) if row else None
@@ -0,0 +1,262 @@
+"""
+Monthly range partitioning of the reviews table on PostgreSQL.
+
+With ``REVIEW_PARTITIONING`` the reviews table is partitioned by the month
+of ``created_at``, so index maintenance and vacuum work on one month of
+reviews at a time, and old months can be detached or dropped whole. Only
+queries bounding ``created_at`` are pruned to the matching partitions, so
+the newest first review lists and the feed read through `newest`, which
+scans recent windows of months first and widens them until the page is
+full.
+
+PostgreSQL requires the partition key in the primary key, so the primary
+key becomes ``(id, created_at)``; ids still come from a single sequence.
+Reviews outside every monthly partition land in a default partition. The
+`review_partitions` command creates the partitions of the coming months
+ahead of time.
+"""
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+
+TABLE = 'core_review'
+DEFAULT_PARTITION = TABLE + '_default'
+MONTHS_AHEAD = 3
+# Bounded windows `newest` reads before dropping the lower bound, the
+# n-th one starts 2 ** (n + 1) - 1 months before the month it reads from.
+WINDOWS = 4
+
+
+def month_start(value):
+    """Return the first instant of the month of `value`."""
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value, months):
+    """Return the month start `value` moved by `months` months."""
+    month = value.month - 1 + months
+    return value.replace(year=value.year + month // 12, month=month % 12 + 1)
+
+
+def months(start, end):
+    """Yield the start of every month from the month of `start` to `end`."""
+    month = month_start(start)
+    while month <= end:
+        yield month
+        month = add_months(month, 1)
+
+
+def windows(end=None):
+    """
+    Yield the `(start, stop)` bounds of the ``created_at`` windows going
+    back from `end`, now by default: the month of `end` and the one
+    before, then windows doubling in length and last `(None, stop)`.
+    A single `(None, None)` window when the reviews are not partitioned.
+    """
+    if not settings.REVIEW_PARTITIONING:
+        yield None, None
+        return
+
+    month = month_start(end or timezone.now())
+    stop = None
+    for window in range(WINDOWS):
+        start = add_months(month, 1 - 2 ** (window + 1))
+        yield start, stop
+        stop = start
+    yield None, stop
+
+
+def newest_keys(queryset, position=None, count=20):
+    """
+    Return the `(created_at, id)` keys of the `count` newest reviews of
+    `queryset` after `position`, a key, read one of the `windows` at a
+    time so each query is pruned to the partitions of its window.
+    """
+    after = Q()
+    if position is not None:
+        created_at, pk = position
+        after = Q(created_at__lte=created_at) & (
+            Q(created_at__lt=created_at) | Q(created_at=created_at,
+                                             pk__lt=pk)
+        )
+
+    keys = []
+    for start, stop in windows(position and position[0]):
+        window = queryset.filter(after)
+        if start is not None:
+            window = window.filter(created_at__gte=start)
+        if stop is not None:
+            window = window.filter(created_at__lt=stop)
+        keys.extend(window.order_by('-created_at', '-pk').values_list(
+            'created_at', 'pk'
+        )[:count - len(keys)])
+        if len(keys) >= count:
+            break
+    return keys
+
+
+def newest(queryset, position=None, limit=20):
+    """
+    Return the `limit` newest reviews of `queryset` after `position`, a
+    `(created_at, id)` pair, and the position of the next page, None on
+    the last one. The rows are read from the partitions their keys span.
+    """
+    keys = newest_keys(queryset, position, limit + 1)
+    next_position = keys[limit - 1] if len(keys) > limit else None
+    keys = keys[:limit]
+    if not keys:
+        return [], None
+
+    rows = queryset.filter(
+        pk__in=[pk for _, pk in keys],
+        created_at__gte=keys[-1][0], created_at__lte=keys[0][0]
+    ).order_by('-created_at', '-pk')
+    return list(rows), next_position
+
+
+def partition_name(month):
+    return '{}_y{:04d}m{:02d}'.format(TABLE, month.year, month.month)
+
+
+def is_partitioned(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table p '
+            'JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s',
+            [TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def _partitions(cursor):
+    cursor.execute(
+        'SELECT c.relname FROM pg_inherits i '
+        'JOIN pg_class c ON c.oid = i.inhrelid '
+        'JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = %s',
+        [TABLE]
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def create_partitions(connection, start, end):
+    """
+    Create the missing monthly partitions from the month of `start` to
+    `end`, moving reviews of those months out of the default partition.
+    Return the names of the created partitions.
+    """
+    quote = connection.ops.quote_name
+    created = []
+    with connection.cursor() as cursor:
+        existing = _partitions(cursor)
+        for month in months(start, end):
+            name = partition_name(month)
+            if name in existing:
+                continue
+
+            bounds = [month, add_months(month, 1)]
+            in_month = 'created_at >= %s AND created_at < %s'
+            moved = False
+            if DEFAULT_PARTITION in existing:
+                cursor.execute('SELECT EXISTS (SELECT 1 FROM {} WHERE {})'
+                               .format(DEFAULT_PARTITION, in_month), bounds)
+                moved = cursor.fetchone()[0]
+            if moved:
+                # A default partition holding rows of the new range cannot
+                # be split, its rows are moved out first.
+                cursor.execute('CREATE TEMPORARY TABLE review_moved (LIKE {})'
+                               .format(TABLE))
+                cursor.execute(
+                    'WITH moved AS (DELETE FROM {} WHERE {} RETURNING *) '
+                    'INSERT INTO review_moved SELECT * FROM moved'.format(
+                        DEFAULT_PARTITION, in_month),
+                    bounds
+                )
+            cursor.execute(
+                'CREATE TABLE {} PARTITION OF {} FOR VALUES FROM (%s) TO (%s)'
+                .format(quote(name), TABLE),
+                bounds
+            )
+            if moved:
+                cursor.execute('INSERT INTO {} SELECT * FROM review_moved'
+                               .format(TABLE))
+                cursor.execute('DROP TABLE review_moved')
+            created.append(name)
+    return created
+
+
+def partition_table(connection, months_ahead=MONTHS_AHEAD):
+    """
+    Rebuild the reviews table as a partitioned table, with one partition
+    per month from the oldest review to `months_ahead` months from now.
+    Keeps the names of its indexes and constraints. Run in a transaction.
+
+    This is an offline conversion: the table is renamed, copied in one
+    statement and reindexed under an ACCESS EXCLUSIVE lock held until
+    the transaction commits, so reviews can neither be read nor written
+    meanwhile. The downtime grows with the table; plan a maintenance
+    window for large tables.
+    """
+    quote = connection.ops.quote_name
+    old = TABLE + '_unpartitioned'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT indexname, indexdef FROM pg_indexes '
+            'WHERE tablename = %s AND indexname != %s',
+            [TABLE, TABLE + '_pkey']
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            'SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint '
+            'WHERE conrelid = %s::regclass AND contype = %s',
+            [TABLE, 'f']
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute('SELECT MIN(created_at) FROM {}'.format(TABLE))
+        oldest = cursor.fetchone()[0] or timezone.now()
+
+        # Free the names for the partitioned table.
+        cursor.execute('ALTER TABLE {} RENAME TO {}'.format(TABLE, old))
+        for name, _ in indexes:
+            cursor.execute('DROP INDEX {}'.format(quote(name)))
+        for name, _ in foreign_keys:
+            cursor.execute('ALTER TABLE {} DROP CONSTRAINT {}'.format(
+                old, quote(name)))
+        cursor.execute('ALTER TABLE {} ALTER COLUMN id DROP IDENTITY '
+                       'IF EXISTS'.format(old))
+        cursor.execute('ALTER TABLE {} ALTER COLUMN id DROP DEFAULT'
+                       .format(old))
+        cursor.execute('DROP SEQUENCE IF EXISTS {}_id_seq'.format(TABLE))
+
+        cursor.execute(
+            'CREATE TABLE {} (LIKE {} INCLUDING DEFAULTS INCLUDING '
+            'CONSTRAINTS) PARTITION BY RANGE (created_at)'.format(TABLE, old)
+        )
+        cursor.execute('CREATE SEQUENCE {0}_id_seq OWNED BY {0}.id'
+                       .format(TABLE))
+        cursor.execute(
+            "ALTER TABLE {0} ALTER COLUMN id SET DEFAULT "
+            "nextval('{0}_id_seq')".format(TABLE)
+        )
+        cursor.execute('CREATE TABLE {} PARTITION OF {} DEFAULT'.format(
+            DEFAULT_PARTITION, TABLE))
+        create_partitions(connection, oldest, add_months(
+            month_start(timezone.now()), months_ahead))
+
+        cursor.execute('INSERT INTO {} SELECT * FROM {}'.format(TABLE, old))
+        cursor.execute(
+            "SELECT setval('{0}_id_seq', COALESCE(MAX(id), 0) + 1, false) "
+            "FROM {0}".format(TABLE)
+        )
+        cursor.execute('DROP TABLE {}'.format(old))
+
+        # Indexes of a partitioned table are built on every partition.
+        cursor.execute(
+            'ALTER TABLE {0} ADD CONSTRAINT {0}_pkey '
+            'PRIMARY KEY (id, created_at)'.format(TABLE)
+        )
+        for _, definition in indexes:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute('ALTER TABLE {} ADD CONSTRAINT {} {}'.format(
+                TABLE, quote(name), definition))
@@ -0,0 +1,105 @@
+"""
+Detection of repeated (N+1) and slow SQL queries.
+"""
+import logging
+import re
+from collections import defaultdict
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r'\bIN \((?:%s, )*%s\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r'\s+')
+
+
+class DuplicateQueryError(Exception):
+    """Raised when a request repeats a query shape too often."""
+
+
+def sql_shape(sql):
+    """
+    Return `sql` with its literals and variable-length IN lists collapsed.
+
+    Queries that only differ in their parameters share the same shape.
+    """
+    shape = _IN_LIST.sub('IN (...)', sql)
+    shape = _LITERAL.sub('?', shape)
+    return _SPACE.sub(' ', shape).strip()
+
+
+class QueryInspector:
+    """
+    `connection.execute_wrapper` hook grouping queries by their shape.
+
+    A shape is reported when it runs more than `max_repeats` times or when
+    a single execution takes longer than `slow_ms` milliseconds.
+    """
+
+    def __init__(self, max_repeats=None, slow_ms=None):
+        self.max_repeats = max_repeats
+        self.slow_ms = slow_ms
+        self.shapes = defaultdict(int)
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (perf_counter() - start) * 1000
+            shape = sql_shape(sql)
+            self.shapes[shape] += 1
+            if self.slow_ms is not None and duration > self.slow_ms:
+                self.slow.append((shape, duration))
+
+    def problems(self):
+        """Return a description of every repeated or slow query shape."""
+        messages = []
+        if self.max_repeats is not None:
+            for shape, count in self.shapes.items():
+                if count > self.max_repeats:
+                    messages.append(
+                        'Query ran {} times: {}'.format(count, shape)
+                    )
+        for shape, duration in self.slow:
+            messages.append(
+                'Query took {:.1f} ms: {}'.format(duration, shape)
+            )
+        return messages
+
+
+class QueryInspectorMiddleware:
+    """
+    Run every request under a `QueryInspector` (development only).
+
+    Problems are logged to the `core.queries` logger, or raised as
+    `DuplicateQueryError` when `QUERY_INSPECTOR['RAISE']` is set.
+    """
+
+    def __init__(self, get_response):
+        self.options = settings.QUERY_INSPECTOR
+        if not self.options['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        inspector = QueryInspector(max_repeats=self.options['MAX_REPEATS'],
+                                   slow_ms=self.options['SLOW_QUERY_MS'])
+        with connection.execute_wrapper(inspector):
+            response = self.get_response(request)
+
+        problems = inspector.problems()
+        if problems:
+            message = '{} {}:\n{}'.format(request.method, request.path,
+                                          '\n'.join(problems))
+            if self.options['RAISE']:
+                raise DuplicateQueryError(message)
+            logger.warning(message)
+
+        return response
@@ -0,0 +1,61 @@
+"""
+JSON renderer and parser backed by orjson, with a stdlib fallback.
+"""
+from django.conf import settings
+from rest_framework.utils import encoders
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_fallback_encoder = encoders.JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` using orjson when it is installed.
+
+    Datetimes, dates, UUIDs and dataclasses are encoded natively (UTC as
+    ``Z``); Decimals and lazy strings go through DRF's encoder. Indented
+    output and ASCII-only output fall back to the stdlib implementation.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if (orjson is None or self.ensure_ascii
+                or self.get_indent(accepted_media_type,
+                                   renderer_context) is not None):
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+
+        ret = orjson.dumps(data, default=_fallback_encoder.default,
+                           option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+        # Keep the output a strict javascript subset, like `JSONRenderer`.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028')
+            ret = ret.replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """`JSONParser` using orjson for UTF-8 bodies when it is installed."""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
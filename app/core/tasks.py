@@ -0,0 +1,100 @@
+"""
+Database backed queue of background tasks.
+
+Tasks are functions registered with `@task(name)` in the ``tasks`` module
+of an app. `enqueue` stores a call as a `Task` row in the transaction of
+the write that caused it, so it is queued if and only if the write
+commits. The `run_tasks` workers claim due rows with ``SKIP LOCKED``,
+call each task once with the payloads of all its claimed rows, and delete
+the rows in the same transaction. A worker dying mid-batch releases its
+rows to the next worker, so every task runs at least once and handlers
+must be idempotent. A failing call is split in halves, run again, down to
+single tasks, so one bad payload does not fail the others claimed with it.
+Failed tasks are retried with a growing delay, then kept with ``failed``
+set.
+
+With ``TASK_QUEUE['ENABLED']`` off, `enqueue` runs the task right away.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Task
+
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+
+def task(name):
+    """Register the decorated function, called with a list of payloads."""
+    def register(handler):
+        _handlers[name] = handler
+        return handler
+    return register
+
+
+def enqueue(name, payload):
+    """Run task `name` with the JSON serializable `payload` later."""
+    if not settings.TASK_QUEUE['ENABLED']:
+        _handlers[name]([payload])
+        return
+    Task.objects.create(name=name, payload=payload)
+
+
+def run_batch(batch_size=None):
+    """
+    Run the due tasks of one batch, grouped by name. Return the number of
+    tasks claimed.
+    """
+    options = settings.TASK_QUEUE
+    with transaction.atomic():
+        tasks = list(Task.objects.select_for_update(skip_locked=True).filter(
+            failed=False, run_after__lte=timezone.now()
+        ).order_by('run_after')[:batch_size or options['BATCH_SIZE']])
+
+        groups = defaultdict(list)
+        for claimed in tasks:
+            groups[claimed.name].append(claimed)
+        done, retried = [], []
+        for name, group in groups.items():
+            _run(name, group, done, retried, options)
+
+        Task.objects.filter(pk__in=done).delete()
+        Task.objects.bulk_update(retried, ['attempts', 'run_after',
+                                           'failed', 'last_error'])
+    return len(tasks)
+
+
+def _run(name, group, done, retried, options):
+    """Run `group`, bisecting it on failure to isolate the failing tasks."""
+    try:
+        with transaction.atomic():
+            _handlers[name]([claimed.payload for claimed in group])
+    except Exception as error:
+        if len(group) > 1:
+            middle = len(group) // 2
+            _run(name, group[:middle], done, retried, options)
+            _run(name, group[middle:], done, retried, options)
+            return
+        logger.exception('Task %s failed', name)
+        _retry(group, error, options)
+        retried.extend(group)
+    else:
+        done.extend(claimed.pk for claimed in group)
+
+
+def _retry(group, error, options):
+    now = timezone.now()
+    for failed in group:
+        failed.attempts += 1
+        failed.failed = failed.attempts >= options['MAX_ATTEMPTS']
+        failed.run_after = now + timedelta(
+            seconds=options['RETRY_DELAY'] * 2 ** (failed.attempts - 1)
+        )
+        failed.last_error = repr(error)
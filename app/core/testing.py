@@ -0,0 +1,24 @@
+"""
+Helpers shared by the test suites of the project apps.
+"""
+from contextlib import contextmanager
+
+from django.db import connections
+
+from core.queries import QueryInspector
+
+
+class QueryInspectorMixin:
+    """`TestCase` mixin with assertions about the queries a block runs."""
+
+    @contextmanager
+    def assertNoDuplicateQueries(self, max_repeats=1, slow_ms=None,
+                                 using='default'):
+        """Fail when a query shape repeats more than `max_repeats` times."""
+        inspector = QueryInspector(max_repeats=max_repeats, slow_ms=slow_ms)
+        with connections[using].execute_wrapper(inspector):
+            yield inspector
+
+        problems = inspector.problems()
+        if problems:
+            self.fail('\n'.join(problems))
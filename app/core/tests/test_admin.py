@@ -0,0 +1,66 @@
+"""
+Tests for the Django admin changelists
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from core import models
+from core.pagination import EstimatedCountPaginator
+from core.testing import QueryInspectorMixin
+
+
+class AdminChangelistTests(QueryInspectorMixin, TestCase):
+    """Tests for the admin changelists."""
+
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            email='admin@example.com', password='testpass123'
+        )
+        self.client.force_login(self.admin)
+        platform = models.StreamingPlatform.objects.create(
+            user=self.admin, name='Netflix', about='About',
+            website='http://www.netflix.com'
+        )
+        for i in range(3):
+            user = get_user_model().objects.create_user(
+                email='user{}@example.com'.format(i), password='pass12345',
+                name='Name{}'.format(i)
+            )
+            watchlist = models.WatchList.objects.create(
+                user=user, title='Title {}'.format(i), description='Desc',
+                platform=platform
+            )
+            models.Review.objects.create(user=user, watchlist=watchlist,
+                                         rating=4, description='Review')
+
+    def test_changelists_without_n_plus_one(self):
+        """Test changelists do not query per row."""
+        for model in ('user', 'watchlist', 'streamingplatform', 'review'):
+            url = reverse('admin:core_{}_changelist'.format(model))
+            with self.assertNoDuplicateQueries():
+                res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+
+    def test_search_users(self):
+        """Test users are searched by email and name."""
+        url = reverse('admin:core_user_changelist')
+
+        res = self.client.get(url, {'q': 'Name1'})
+
+        self.assertContains(res, 'user1@example.com')
+        self.assertNotContains(res, 'user2@example.com')
+
+    def test_estimated_count(self):
+        """Test unfiltered large tables use the estimate."""
+        queryset = models.Review.all_objects.order_by('id')
+        with patch.object(EstimatedCountPaginator, 'estimate',
+                          return_value=10 ** 7):
+            self.assertEqual(EstimatedCountPaginator(queryset, 10).count,
+                             10 ** 7)
+            filtered = queryset.filter(rating=4)
+            self.assertEqual(EstimatedCountPaginator(filtered, 10).count, 3)
+
+        self.assertEqual(EstimatedCountPaginator(queryset, 10).count, 3)
@@ -1,13 +1,22 @@
 """
 Test custom Django commands
 """
+import random
+from datetime import timedelta
+from io import StringIO
 from unittest.mock import patch
 
 from psycopg2 import OperationalError as Psycopg2OpError
 
+from django.contrib.auth import get_user_model
 from django.core.management import call_command
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from core.management.commands.seed_data import count, zipf_counts
+from core.models import ArchivedReview, Review, WatchList, WatchListSummary
 
 
 @patch("core.management.commands.wait_for_db.Command.check")
@@ -32,3 +41,112 @@ class CommandTests(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=['default'])
+
+
+class SeedDataCommandTests(TestCase):
+    """Test the seed_data command."""
+
+    def test_count_suffixes(self):
+        """Test counts accept k and M suffixes."""
+        self.assertEqual(count('500'), 500)
+        self.assertEqual(count('100k'), 100000)
+        self.assertEqual(count('1.5M'), 1500000)
+
+    def test_zipf_counts(self):
+        """Test reviews are split over titles with a long tail."""
+        counts = zipf_counts(1000, 100, 1.1, 50, random.Random(0))
+
+        self.assertEqual(sum(counts), 1000)
+        self.assertEqual(max(counts), 50)
+        self.assertLess(sorted(counts)[50], 10)
+
+    def test_seed_data(self):
+        """Test seeding creates rows with consistent aggregates."""
+        call_command('seed_data', '--users=20', '--titles=30',
+                     '--reviews=200', '--platforms=3', '--workers=1',
+                     stdout=StringIO())
+
+        self.assertEqual(WatchList.objects.count(), 30)
+        self.assertEqual(Review.objects.count(), 200)
+        expected = {
+            title.pk: (title.total_reviews, title.average_rating)
+            for title in WatchList.objects.all()
+        }
+        self.assertEqual(WatchListSummary.objects.count(), 30)
+        WatchList.objects.recompute_ratings()
+        for title in WatchList.objects.all():
+            total, average = expected[title.pk]
+            self.assertEqual(title.total_reviews, total)
+            if total:
+                self.assertAlmostEqual(title.average_rating, average)
+            else:
+                self.assertIsNone(title.average_rating)
+
+    def test_refresh_watchlist_summary(self):
+        """Test the summary table is rebuilt from the titles."""
+        call_command('seed_data', '--users=5', '--titles=10',
+                     '--reviews=20', '--platforms=2', '--workers=1',
+                     stdout=StringIO())
+        WatchListSummary.objects.all().delete()
+        WatchList.objects.filter(pk=WatchList.objects.first().pk).update(
+            title='Updated'
+        )
+
+        call_command('refresh_watchlist_summary', '--batch-size=3',
+                     stdout=StringIO())
+
+        self.assertEqual(WatchListSummary.objects.count(), 10)
+        self.assertTrue(WatchListSummary.objects.filter(
+            title='Updated').exists())
+
+
+class ArchiveReviewsCommandTests(TestCase):
+    """Test archiving long inactive reviews."""
+
+    def test_archive_reviews(self):
+        """Test only long inactive reviews move to the archive."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+        watchlist = WatchList.objects.create(user=user, title='Heat',
+                                             description='Desc')
+        stale, recent, active = [
+            Review.objects.create(user=user, watchlist=watchlist, rating=4,
+                                  description='Review', active=False)
+            for _ in range(3)
+        ]
+        Review.all_objects.filter(pk=active.pk).update(active=True)
+        Review.all_objects.filter(pk__in=[stale.pk, active.pk]).update(
+            updated_at=timezone.now() - timedelta(days=100)
+        )
+
+        call_command('archive_reviews', '--days=90', stdout=StringIO())
+
+        self.assertEqual(
+            sorted(Review.all_objects.values_list('pk', flat=True)),
+            [recent.pk, active.pk]
+        )
+        archived = ArchivedReview.objects.get()
+        self.assertEqual((archived.pk, archived.rating, archived.watchlist),
+                         (stale.pk, 4, watchlist))
+
+
+class SweepTokensCommandTests(TestCase):
+    """Test deleting expired auth tokens."""
+
+    def test_sweep_tokens(self):
+        """Test tokens older than AUTH_TOKEN_TTL are deleted in batches."""
+        users = [get_user_model().objects.create_user(
+            email='user{}@example.com'.format(i), password='testpass123'
+        ) for i in range(5)]
+        tokens = [Token.objects.create(user=user) for user in users]
+        Token.objects.filter(pk__in=[token.pk for token in tokens[:3]]).update(
+            created=timezone.now() - timedelta(days=2)
+        )
+        out = StringIO()
+
+        call_command('sweep_tokens', '--batch-size=2', stdout=out)
+
+        self.assertEqual(set(Token.objects.values_list('pk', flat=True)),
+                         {tokens[3].pk, tokens[4].pk})
+        self.assertIn('Deleted 3 expired tokens.', out.getvalue())
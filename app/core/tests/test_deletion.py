@@ -0,0 +1,115 @@
+"""
+Tests for chunked bulk deletion
+"""
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+
+from core import models
+from core.deletion import bulk_delete
+
+
+class BulkDeleteTests(TestCase):
+    """Tests for bulk_delete and the bulk_delete command."""
+
+    def setUp(self):
+        User = get_user_model()
+        self.owner = User.objects.create_user(email='owner@example.com',
+                                              password='testpass123')
+        self.reviewer = User.objects.create_user(email='rev@example.com',
+                                                 password='testpass123')
+        self.owner.following.add(self.reviewer)
+        self.platform = models.StreamingPlatform.objects.create(
+            user=self.owner, name='Netflix', about='About',
+            website='http://www.netflix.com'
+        )
+        self.doomed = [
+            models.WatchList.objects.create(
+                user=self.owner, title='Doomed {}'.format(i),
+                description='Desc', platform=self.platform
+            )
+            for i in range(3)
+        ]
+        self.survivor = models.WatchList.objects.create(
+            user=self.owner, title='Survivor', description='Desc'
+        )
+        for title in self.doomed + [self.survivor]:
+            for user, rating in ((self.owner, 5), (self.reviewer, 1)):
+                models.Review.objects.create(user=user, watchlist=title,
+                                             rating=rating,
+                                             description='Review')
+
+    def test_delete_platform(self):
+        """Test a platform is deleted with its titles and reviews."""
+        deleted = bulk_delete(
+            models.StreamingPlatform.objects.filter(pk=self.platform.pk),
+            chunk_size=2
+        )
+
+        self.assertEqual(deleted['core.WatchList'], 3)
+        self.assertEqual(deleted['core.Review'], 6)
+        self.assertEqual(list(models.WatchList.objects.all()),
+                         [self.survivor])
+        self.assertEqual(models.Review.objects.count(), 2)
+        self.assertEqual(models.WatchListSummary.objects.count(), 1)
+
+    def test_delete_user_recomputes_survivors(self):
+        """Test deleting a user recomputes titles it reviewed once."""
+        reviewed = {title.pk for title in self.doomed + [self.survivor]}
+        self.doomed[0].delete()
+
+        bulk_delete(get_user_model().objects.filter(pk=self.reviewer.pk),
+                    chunk_size=1)
+
+        self.survivor.refresh_from_db()
+        self.assertEqual(self.survivor.total_reviews, 1)
+        self.assertEqual(self.survivor.average_rating, 5)
+        self.assertEqual(self.survivor.summary.average_rating, 5)
+        self.assertFalse(Token.objects.filter(user=self.reviewer).exists())
+        self.assertFalse(self.owner.following.exists())
+        self.assertEqual(
+            set(models.DeletedReview.objects.filter(
+                user_id=self.reviewer.pk
+            ).values_list('watchlist_id', flat=True)),
+            reviewed
+        )
+
+    def test_command(self):
+        """Test the command deletes users and reports progress."""
+        out = StringIO()
+        call_command('bulk_delete', 'user', str(self.owner.pk),
+                     stdout=out)
+
+        self.assertFalse(models.WatchList.objects.exists())
+        self.assertFalse(models.StreamingPlatform.objects.exists())
+        self.assertIn('core.Review: 8 deleted', out.getvalue())
+
+    def test_command_unknown_ids(self):
+        """Test unknown ids are an error."""
+        with self.assertRaises(CommandError):
+            call_command('bulk_delete', 'platform', '0', stdout=StringIO())
+
+    def test_cascade_recomputes_survivors_on_commit(self):
+        """Test a regular cascade recomputes surviving titles once."""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.reviewer.delete()
+
+        self.assertEqual(len(callbacks), 1)
+        self.survivor.refresh_from_db()
+        self.assertEqual(self.survivor.total_reviews, 1)
+        self.assertEqual(self.survivor.average_rating, 5)
+
+    def test_cascade_skips_deleted_titles(self):
+        """Test deleting a title does not recreate its summary."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.platform.delete()
+
+        self.assertEqual(
+            list(models.WatchListSummary.objects.values_list(
+                'watchlist_id', flat=True)),
+            [self.survivor.pk]
+        )
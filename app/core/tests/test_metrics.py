@@ -0,0 +1,83 @@
+"""
+Tests for the request instrumentation middleware and metrics endpoint
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.metrics import registry
+
+
+METRICS_URL = reverse('metrics')
+WATCHLIST_URL = reverse('watch:watchlist-list')
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+@override_settings(PERFORMANCE_METRICS_ENABLED=True)
+class PerformanceMiddlewareTests(TestCase):
+    """Tests for the enabled instrumentation."""
+
+    def setUp(self):
+        registry.clear()
+        self.client = APIClient()
+
+    def test_server_timing_header(self):
+        """Test responses carry a Server-Timing header."""
+        res = self.client.get(WATCHLIST_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('total;dur=', res['Server-Timing'])
+        self.assertIn('queries', res['Server-Timing'])
+        self.assertIn('serialize;dur=', res['Server-Timing'])
+
+    def test_metrics_aggregated_per_view(self):
+        """Test requests are aggregated under their view name."""
+        self.client.get(WATCHLIST_URL)
+        self.client.get(WATCHLIST_URL)
+
+        output = registry.render()
+
+        self.assertIn('http_request_duration_seconds_count'
+                      '{view="watch:watchlist-list"} 2', output)
+        self.assertIn('# TYPE http_response_size_bytes histogram', output)
+
+    def test_metrics_endpoint_admin_only(self):
+        """Test only admins can read the metrics."""
+        user = create_user(email='user@example.com', password='pass12345')
+        self.client.force_authenticate(user=user)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_metrics_endpoint(self):
+        """Test admins get the metrics in the Prometheus text format."""
+        admin = create_user(email='admin@example.com', password='pass12345',
+                            is_staff=True)
+        self.client.force_authenticate(user=admin)
+        self.client.get(WATCHLIST_URL)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res['Content-Type'].startswith('text/plain'))
+        self.assertIn(b'http_request_db_queries_bucket', res.content)
+        self.assertIn(b'# TYPE auth_tokens gauge\nauth_tokens 0\n',
+                      res.content)
+
+
+class DisabledMiddlewareTests(TestCase):
+    """Tests for the default, disabled instrumentation."""
+
+    def test_no_server_timing_header(self):
+        """Test nothing is recorded while the middleware is disabled."""
+        res = APIClient().get(WATCHLIST_URL)
+
+        self.assertFalse(res.has_header('Server-Timing'))
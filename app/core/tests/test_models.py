@@ -76,3 +76,80 @@ class ModelTests(TestCase):
         self.assertEqual(
             str(review), str(review.rating) + ' | ' + review.watchlist.title
         )
+
+    def test_recompute_ratings(self):
+        """Test aggregates are recomputed from the reviews table."""
+        watchlist = models.WatchList.objects.create(
+            user=self.user,
+            title='Test Movie',
+            description='Test Movie Description',
+        )
+        for rating in (2, 5):
+            models.Review.objects.create(user=self.user, rating=rating,
+                                         watchlist=watchlist,
+                                         description='Test Review')
+        models.WatchList.objects.filter(pk=watchlist.pk).update(
+            total_reviews=0, average_rating=None
+        )
+
+        models.WatchList.objects.recompute_ratings()
+
+        watchlist.refresh_from_db()
+        self.assertEqual(watchlist.total_reviews, 2)
+        self.assertEqual(watchlist.average_rating, 3.5)
+        self.assertEqual(watchlist.summary.total_reviews, 2)
+        self.assertEqual(watchlist.summary.average_rating, 3.5)
+
+    def test_inactive_reviews_hidden(self):
+        """Test inactive reviews are hidden and left out of aggregates."""
+        watchlist = models.WatchList.objects.create(
+            user=self.user,
+            title='Test Movie',
+            description='Test Movie Description',
+        )
+        review = models.Review.objects.create(user=self.user, rating=2,
+                                              watchlist=watchlist,
+                                              description='Test Review')
+        models.Review.objects.create(user=self.user, rating=5,
+                                     watchlist=watchlist, active=False,
+                                     description='Test Review')
+
+        watchlist.refresh_from_db()
+        self.assertEqual(list(watchlist.reviews.all()), [review])
+        self.assertEqual(models.Review.all_objects.count(), 2)
+        self.assertEqual(watchlist.total_reviews, 1)
+        self.assertEqual(watchlist.average_rating, 2)
+
+        review.active = False
+        review.save()
+
+        watchlist.refresh_from_db()
+        self.assertEqual(watchlist.total_reviews, 0)
+
+    def test_inactive_titles_not_listed(self):
+        """Test the summaries of inactive titles are hidden."""
+        watchlist = models.WatchList.objects.create(
+            user=self.user,
+            title='Test Movie',
+            description='Test Movie Description',
+            active=False,
+        )
+
+        self.assertFalse(models.WatchListSummary.objects.exists())
+        self.assertEqual(models.WatchListSummary.all_objects.get().watchlist,
+                         watchlist)
+
+    def test_watchlist_summary_synced(self):
+        """Test saving a watchlist creates and updates its summary."""
+        watchlist = models.WatchList.objects.create(
+            user=self.user,
+            title='Test Movie',
+            description='Test Movie Description',
+        )
+        watchlist.title = 'Renamed'
+        watchlist.save()
+
+        summary = models.WatchListSummary.objects.get(watchlist=watchlist)
+        self.assertEqual(summary.title, 'Renamed')
+        self.assertIsNone(summary.platform_name)
+        self.assertEqual(summary.created_at, watchlist.created_at)
@@ -0,0 +1,133 @@
+"""
+Tests for the monthly partitions of the reviews table
+"""
+from datetime import datetime, timezone
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core import partitioning
+from core.models import Review, WatchList
+
+
+class MonthTests(SimpleTestCase):
+    """Test the partition month ranges."""
+
+    def test_months(self):
+        """Test months run across years, from the month of the start."""
+        start = datetime(2025, 11, 17, 8, 30, tzinfo=timezone.utc)
+        end = datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+        names = [partitioning.partition_name(month)
+                 for month in partitioning.months(start, end)]
+
+        self.assertEqual(names, [
+            'core_review_y2025m11', 'core_review_y2025m12',
+            'core_review_y2026m01', 'core_review_y2026m02',
+        ])
+
+    def test_add_months(self):
+        """Test months are added across year boundaries."""
+        month = datetime(2026, 12, 1, tzinfo=timezone.utc)
+
+        self.assertEqual(partitioning.add_months(month, 14),
+                         datetime(2028, 2, 1, tzinfo=timezone.utc))
+
+    @override_settings(REVIEW_PARTITIONING=True)
+    def test_windows(self):
+        """Test read windows double going back, then drop the bound."""
+        end = datetime(2026, 3, 17, tzinfo=timezone.utc)
+
+        bounds = [(start and start.date().isoformat(),
+                   stop and stop.date().isoformat())
+                  for start, stop in partitioning.windows(end)]
+
+        self.assertEqual(bounds, [
+            ('2026-02-01', None), ('2025-12-01', '2026-02-01'),
+            ('2025-08-01', '2025-12-01'), ('2024-12-01', '2025-08-01'),
+            (None, '2024-12-01'),
+        ])
+
+    @override_settings(REVIEW_PARTITIONING=False)
+    def test_windows_unpartitioned(self):
+        """Test unpartitioned reviews are read in one window."""
+        self.assertEqual(list(partitioning.windows()), [(None, None)])
+
+
+class ReviewPartitionsCommandTests(TestCase):
+    """Test the review_partitions command."""
+
+    @skipUnless(connection.vendor != 'postgresql', 'Tested on SQLite.')
+    def test_postgres_required(self):
+        """Test partitioning is refused on other databases."""
+        with self.assertRaisesRegex(CommandError, 'PostgreSQL'):
+            call_command('review_partitions', stdout=StringIO())
+
+    @skipUnless(connection.vendor == 'postgresql', 'Needs PostgreSQL.')
+    def test_unpartitioned_refused(self):
+        """Test partitions are only created on a partitioned table."""
+        with self.assertRaises(CommandError):
+            call_command('review_partitions', stdout=StringIO())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Needs PostgreSQL.')
+class PartitionTableTests(TestCase):
+    """Test converting the reviews table to monthly partitions."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+        self.titles = [WatchList.objects.create(user=self.user,
+                                                title='Title {}'.format(i),
+                                                description='Desc')
+                       for i in range(3)]
+
+    def review(self, title, created_at):
+        review = Review.objects.create(user=self.user, watchlist=title,
+                                       rating=4, description='Review')
+        Review.all_objects.filter(pk=review.pk).update(created_at=created_at)
+        return review
+
+    def partition_of(self, review):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT tableoid::regclass::text FROM core_review '
+                           'WHERE id = %s', [review.pk])
+            return cursor.fetchone()[0]
+
+    def test_convert(self):
+        """Test rows are kept in their month and ids keep counting."""
+        old = self.review(self.titles[0],
+                          datetime(2024, 5, 3, tzinfo=timezone.utc))
+        recent = self.review(self.titles[1],
+                             datetime(2024, 7, 9, tzinfo=timezone.utc))
+
+        call_command('review_partitions', '--convert', stdout=StringIO())
+
+        self.assertTrue(partitioning.is_partitioned(connection))
+        self.assertEqual(self.partition_of(old), 'core_review_y2024m05')
+        self.assertEqual(self.partition_of(recent), 'core_review_y2024m07')
+        self.assertEqual(Review.objects.count(), 2)
+        newest = self.review(self.titles[2], datetime.now(timezone.utc))
+        self.assertGreater(newest.pk, recent.pk)
+
+    def test_default_partition_split(self):
+        """Test new partitions take their rows from the default one."""
+        partitioning.partition_table(connection, months_ahead=0)
+        future = self.review(self.titles[0],
+                             datetime(2099, 1, 15, tzinfo=timezone.utc))
+        self.assertEqual(self.partition_of(future),
+                         partitioning.DEFAULT_PARTITION)
+
+        created = partitioning.create_partitions(
+            connection, datetime(2099, 1, 1, tzinfo=timezone.utc),
+            datetime(2099, 1, 1, tzinfo=timezone.utc)
+        )
+
+        self.assertEqual(created, ['core_review_y2099m01'])
+        self.assertEqual(self.partition_of(future), 'core_review_y2099m01')
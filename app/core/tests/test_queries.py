@@ -0,0 +1,72 @@
+"""
+Tests for the repeated and slow query detection
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.models import StreamingPlatform
+from core.queries import DuplicateQueryError, sql_shape
+from core.testing import QueryInspectorMixin
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+class SqlShapeTests(TestCase):
+    """Tests for grouping queries by shape."""
+
+    def test_in_lists_collapsed(self):
+        """Test IN lists of any length share a shape."""
+        self.assertEqual(
+            sql_shape('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            sql_shape('SELECT * FROM t WHERE id IN (%s)'),
+        )
+
+    def test_literals_collapsed(self):
+        """Test inlined literals do not create new shapes."""
+        self.assertEqual(
+            sql_shape("SELECT * FROM t WHERE name = 'a' LIMIT 21"),
+            sql_shape("SELECT * FROM t WHERE name = 'b''c'  LIMIT 1"),
+        )
+
+
+class QueryInspectorTests(QueryInspectorMixin, TestCase):
+    """Tests for the query inspector and its test helper."""
+
+    def setUp(self):
+        self.user = create_user(email='test@example.com', password='pass123')
+        for name in ('A', 'B', 'C'):
+            StreamingPlatform.objects.create(user=self.user, name=name,
+                                             about='About',
+                                             website='http://a.com')
+
+    def test_repeated_shape_reported(self):
+        """Test an N+1 loop is reported."""
+        with self.assertRaises(AssertionError):
+            with self.assertNoDuplicateQueries(max_repeats=2) as inspector:
+                for platform in StreamingPlatform.objects.all():
+                    platform.user.email
+
+        self.assertEqual(len(inspector.problems()), 1)
+
+    def test_prefetched_loop_passes(self):
+        """Test the same loop with select_related is clean."""
+        with self.assertNoDuplicateQueries():
+            platforms = StreamingPlatform.objects.select_related('user')
+            for platform in platforms:
+                platform.user.email
+
+    @override_settings(QUERY_INSPECTOR={'ENABLED': True, 'MAX_REPEATS': 0,
+                                        'SLOW_QUERY_MS': None,
+                                        'RAISE': True})
+    def test_middleware_raises(self):
+        """Test the middleware raises when configured to."""
+        client = APIClient()
+
+        with self.assertRaises(DuplicateQueryError):
+            client.get(reverse('watch:streaming-list'))
@@ -0,0 +1,65 @@
+"""
+Tests for the JSON renderer and parser
+"""
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from core import renderers
+from core.renderers import FastJSONParser, FastJSONRenderer
+
+
+PAYLOAD = {
+    'count': 1,
+    'results': [{
+        'title': 'Amélie \u2028',
+        'average_rating': 4.5,
+        'price': Decimal('9.99'),
+        'created_at': datetime(2025, 1, 5, 20, 31, tzinfo=timezone.utc),
+        'reviews': [],
+    }],
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """Tests for the orjson backed renderer."""
+
+    def test_same_output_as_json_renderer(self):
+        """Test the output matches DRF's renderer byte for byte."""
+        self.assertEqual(FastJSONRenderer().render(PAYLOAD),
+                         JSONRenderer().render(PAYLOAD))
+
+    def test_stdlib_fallback(self):
+        """Test the renderer works without orjson."""
+        with patch.object(renderers, 'orjson', None):
+            output = FastJSONRenderer().render(PAYLOAD)
+
+        self.assertEqual(output, JSONRenderer().render(PAYLOAD))
+
+    def test_indent_requested(self):
+        """Test indented output is still supported."""
+        output = FastJSONRenderer().render({'a': 1},
+                                           'application/json; indent=2')
+
+        self.assertEqual(output, b'{\n  "a": 1\n}')
+
+
+class FastJSONParserTests(SimpleTestCase):
+    """Tests for the orjson backed parser."""
+
+    def test_parse(self):
+        """Test parsing a UTF-8 body."""
+        stream = io.BytesIO('{"title": "Amélie"}'.encode())
+
+        self.assertEqual(FastJSONParser().parse(stream),
+                         {'title': 'Amélie'})
+
+    def test_parse_error(self):
+        """Test invalid JSON raises a ParseError."""
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"title": '))
@@ -0,0 +1,117 @@
+"""
+Tests for the background task queue
+"""
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import tasks
+from core.models import Review, Task, WatchList
+
+
+calls = []
+
+
+@tasks.task('tests.record')
+def record(payloads):
+    calls.append(payloads)
+
+
+@tasks.task('tests.fail')
+def fail(payloads):
+    raise ValueError('Failed')
+
+
+@tasks.task('tests.poison')
+def poison(payloads):
+    if any(payload.get('bad') for payload in payloads):
+        raise ValueError('Bad payload')
+    calls.append(payloads)
+
+
+QUEUE = {'ENABLED': True, 'BATCH_SIZE': 100, 'MAX_ATTEMPTS': 2,
+         'RETRY_DELAY': 10}
+
+
+@override_settings(TASK_QUEUE=QUEUE)
+class TaskQueueTests(TestCase):
+    """Test tasks are queued and run by the workers."""
+
+    def setUp(self):
+        calls.clear()
+
+    def test_disabled_runs_right_away(self):
+        """Test tasks run when enqueued with the queue disabled."""
+        with self.settings(TASK_QUEUE=dict(QUEUE, ENABLED=False)):
+            tasks.enqueue('tests.record', {'n': 1})
+
+        self.assertEqual(calls, [[{'n': 1}]])
+        self.assertFalse(Task.objects.exists())
+
+    def test_batched(self):
+        """Test queued tasks of one name run in a single call."""
+        for n in range(3):
+            tasks.enqueue('tests.record', {'n': n})
+
+        self.assertEqual(tasks.run_batch(), 3)
+
+        self.assertEqual(calls, [[{'n': 0}, {'n': 1}, {'n': 2}]])
+        self.assertFalse(Task.objects.exists())
+
+    def test_retried_then_failed(self):
+        """Test failing tasks are delayed, then kept as failed."""
+        tasks.enqueue('tests.fail', {})
+        tasks.enqueue('tests.record', {})
+
+        with self.assertLogs('core.tasks', 'ERROR'):
+            tasks.run_batch()
+        failed = Task.objects.get()
+        self.assertEqual(failed.attempts, 1)
+        self.assertGreater(failed.run_after, timezone.now())
+        self.assertIn('Failed', failed.last_error)
+        self.assertEqual(tasks.run_batch(), 0)
+
+        Task.objects.update(run_after=timezone.now())
+        with self.assertLogs('core.tasks', 'ERROR'):
+            tasks.run_batch()
+        failed.refresh_from_db()
+        self.assertTrue(failed.failed)
+        self.assertEqual(calls, [[{}]])
+
+    def test_bad_payload_isolated(self):
+        """Test one failing payload does not fail the others of its batch."""
+        for n in range(5):
+            tasks.enqueue('tests.poison', {'n': n, 'bad': n == 3})
+
+        with self.assertLogs('core.tasks', 'ERROR') as logs:
+            self.assertEqual(tasks.run_batch(), 5)
+
+        self.assertEqual(len(logs.output), 1)
+        self.assertEqual(sorted(payload['n'] for payloads in calls
+                                for payload in payloads), [0, 1, 2, 4])
+        failed = Task.objects.get()
+        self.assertEqual(failed.payload['n'], 3)
+        self.assertEqual(failed.attempts, 1)
+
+    def test_writes_deferred_to_workers(self):
+        """Test aggregates are written by the workers."""
+        user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123'
+        )
+        watchlist = WatchList.objects.create(user=user, title='Heat',
+                                             description='Desc')
+        for rating in (2, 4):
+            Review.objects.create(user=user, watchlist=watchlist,
+                                  rating=rating, description='Review')
+
+        watchlist.refresh_from_db()
+        self.assertEqual(watchlist.total_reviews, 0)
+
+        call_command('run_tasks', '--once', stdout=StringIO())
+
+        watchlist.refresh_from_db()
+        self.assertEqual(watchlist.total_reviews, 2)
+        self.assertEqual(watchlist.summary.average_rating, 3)
@@ -0,0 +1,76 @@
+"""
+Tests for the GCRA throttles
+"""
+from unittest.mock import patch
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import SimpleTestCase, RequestFactory
+
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from core.throttling import (AnonGCRAThrottle,
+                             GCRARateThrottle,
+                             ScopedGCRAThrottle)
+
+
+class ThreePerMinuteThrottle(AnonGCRAThrottle):
+    rate = '3/min'
+
+
+class ThrottlingTests(SimpleTestCase):
+    """Tests for cache-backed GCRA throttling."""
+
+    def setUp(self):
+        cache.clear()
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        self.request = Request(request)
+        self.view = APIView()
+
+    def allow(self, throttle_class, now):
+        throttle = throttle_class()
+        with patch.object(GCRARateThrottle, 'timer', return_value=now):
+            return throttle.allow_request(self.request, self.view), throttle
+
+    def test_burst_up_to_limit(self):
+        """Test a full burst is allowed and the next request is not."""
+        results = [self.allow(ThreePerMinuteThrottle, 1000)[0]
+                   for _ in range(4)]
+
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_wait_until_next_cell(self):
+        """Test the wait time points at the next emission interval."""
+        for _ in range(3):
+            self.allow(ThreePerMinuteThrottle, 1000)
+
+        allowed, throttle = self.allow(ThreePerMinuteThrottle, 1005)
+
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 15.0)
+        self.assertTrue(self.allow(ThreePerMinuteThrottle, 1020)[0])
+
+    def test_idle_client_refills(self):
+        """Test an idle client gets a full burst back."""
+        for _ in range(3):
+            self.allow(ThreePerMinuteThrottle, 1000)
+
+        results = [self.allow(ThreePerMinuteThrottle, 1060)[0]
+                   for _ in range(4)]
+
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_state_is_a_single_integer(self):
+        """Test only one integer is kept in the cache per client."""
+        for _ in range(3):
+            _, throttle = self.allow(ThreePerMinuteThrottle, 1000)
+
+        self.assertEqual(cache.get(throttle.key), 1000 * 1000 + 60000)
+
+    def test_scoped_throttle_without_scope(self):
+        """Test views without `throttle_scope` are not throttled."""
+        allowed, _ = self.allow(ScopedGCRAThrottle, 1000)
+
+        self.assertTrue(allowed)
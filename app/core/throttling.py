@@ -0,0 +1,79 @@
+"""
+Cache-backed GCRA throttles.
+
+DRF's stock throttles keep a list with one timestamp per request for every
+client and rewrite the whole list on each call. The classes below implement
+the Generic Cell Rate Algorithm instead: the only state per client is a
+single integer, the "theoretical arrival time" (TAT) in milliseconds, which
+is advanced with an atomic ``cache.incr``. Any shared cache backend
+(Redis, Memcached) makes the limits global across processes and hosts.
+"""
+from rest_framework.throttling import (SimpleRateThrottle,
+                                       AnonRateThrottle,
+                                       UserRateThrottle,
+                                       ScopedRateThrottle)
+
+
+class GCRARateThrottle(SimpleRateThrottle):
+    """
+    Drop-in replacement for `SimpleRateThrottle` with O(1) state per key.
+
+    A rate of ``N/period`` lets every client send a burst of up to N
+    requests and then one request every ``period / N``.
+    """
+    cache_format = 'throttle_gcra_%(scope)s_%(ident)s'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = int(self.timer() * 1000)
+        period = self.duration * 1000
+        if not self.num_requests:
+            self.retry_after = period
+            return self.throttle_failure()
+        interval = period // self.num_requests
+
+        self.cache.add(self.key, self.now, self.duration)
+        try:
+            tat = self.cache.incr(self.key, interval)
+        except ValueError:
+            # The key expired between `add` and `incr`.
+            tat = self.now + interval
+            self.cache.set(self.key, tat, self.duration)
+
+        if tat - interval < self.now:
+            # The client has been idle; its bucket is full again.
+            tat = self.now + interval
+            self.cache.set(self.key, tat, self.duration)
+
+        if tat - self.now > period:
+            self.cache.decr(self.key, interval)
+            self.retry_after = tat - self.now - period
+            return self.throttle_failure()
+
+        self.cache.touch(self.key, self.duration)
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """Returns the number of seconds until the next request is allowed."""
+        return self.retry_after / 1000.0
+
+
+class AnonGCRAThrottle(AnonRateThrottle, GCRARateThrottle):
+    """GCRA version of `AnonRateThrottle` (the ``anon`` scope)."""
+
+
+class UserGCRAThrottle(UserRateThrottle, GCRARateThrottle):
+    """GCRA version of `UserRateThrottle` (the ``user`` scope)."""
+
+
+class ScopedGCRAThrottle(ScopedRateThrottle, GCRARateThrottle):
+    """GCRA version of `ScopedRateThrottle` (``throttle_scope`` on views)."""
@@ -0,0 +1,218 @@
+"""
+Review feeds: the reviews written by the users someone follows.
+
+New reviews are copied into the timelines of the author's followers
+(fan-out on write), capped at ``FEED['TIMELINE_LENGTH']`` entries as they
+are written. Reviews of users followed by more than
+``FEED['CELEBRITY_FOLLOWERS']`` people are not copied, they are merged in
+when a feed is read (fan-out on read). Feeds are paged on the
+``(created_at, id)`` of the reviews, newest first.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Window
+from django.db.models.functions import Coalesce, Left, RowNumber
+
+from core import partitioning
+from core.models import Review, TimelineEntry
+
+
+EXCERPT_LENGTH = 200
+BATCH_SIZE = 1000
+
+
+def _is_celebrity(followers_count):
+    return followers_count > settings.FEED['CELEBRITY_FOLLOWERS']
+
+
+def fan_out(review):
+    """
+    Add `review` to the timelines of its author's followers.
+    Return the number of timelines written.
+    """
+    User = get_user_model()
+    followers_count = User.objects.filter(
+        pk=review.user_id
+    ).values_list('followers_count', flat=True).get()
+    if _is_celebrity(followers_count):
+        return 0
+
+    follower_ids = list(User.following.through.objects.filter(
+        to_user_id=review.user_id
+    ).values_list('from_user_id', flat=True))
+    for start in range(0, len(follower_ids), BATCH_SIZE):
+        batch = follower_ids[start:start + BATCH_SIZE]
+        TimelineEntry.objects.bulk_create(
+            [TimelineEntry(owner_id=follower_id, review_id=review.pk,
+                           created_at=review.created_at)
+             for follower_id in batch],
+            ignore_conflicts=True,
+        )
+        cap(batch)
+    return len(follower_ids)
+
+
+def cap(owner_ids, length=None):
+    """
+    Delete the timeline entries of `owner_ids` older than their newest
+    `length`, ``FEED['TIMELINE_LENGTH']`` by default. Entries as old as
+    the last one kept stay too.
+    """
+    length = length or settings.FEED['TIMELINE_LENGTH']
+    # The last entry kept, found on timeline_owner_created_idx.
+    last_kept = TimelineEntry.objects.filter(
+        owner=OuterRef('owner')
+    ).order_by('-created_at', '-review_id').values('created_at')
+    TimelineEntry.objects.filter(
+        owner_id__in=owner_ids,
+        created_at__lt=Subquery(last_kept[length - 1:length]),
+    ).delete()
+
+
+def follow(user, target):
+    """
+    Make `user` follow `target` and copy the latest reviews of `target`
+    into the timeline of `user`. Return False if it already did.
+    """
+    User = get_user_model()
+    with transaction.atomic():
+        # Concurrent follows of `target` wait here, so each is counted once.
+        followers_count = User.objects.select_for_update().filter(
+            pk=target.pk
+        ).values_list('followers_count', flat=True).get()
+        if user.following.filter(pk=target.pk).exists():
+            return False
+        user.following.add(target)
+        User.objects.filter(pk=target.pk).update(
+            followers_count=F('followers_count') + 1
+        )
+
+    if not _is_celebrity(followers_count + 1):
+        latest = Review.objects.filter(user=target).order_by(
+            '-created_at'
+        ).values_list('pk', 'created_at')[:settings.FEED['BACKFILL']]
+        TimelineEntry.objects.bulk_create(
+            [TimelineEntry(owner=user, review_id=pk, created_at=created_at)
+             for pk, created_at in latest],
+            ignore_conflicts=True,
+        )
+        cap([user.pk])
+    return True
+
+
+def unfollow(user, target):
+    """
+    Make `user` stop following `target` and drop the reviews of `target`
+    from the timeline of `user`. Return False if it did not follow.
+    """
+    User = get_user_model()
+    with transaction.atomic():
+        User.objects.select_for_update().filter(pk=target.pk).exists()
+        if not user.following.filter(pk=target.pk).exists():
+            return False
+        user.following.remove(target)
+        User.objects.filter(pk=target.pk).update(
+            followers_count=F('followers_count') - 1
+        )
+
+    TimelineEntry.objects.filter(owner=user, review__user=target).delete()
+    return True
+
+
+def forget(user):
+    """
+    Uncount `user` from the followers of the users it follows, before
+    `user` is deleted and its follows with it.
+    """
+    User = get_user_model()
+    User.objects.filter(pk__in=User.following.through.objects.filter(
+        from_user_id=user.pk
+    ).values('to_user_id')).update(followers_count=F('followers_count') - 1)
+
+
+def recount_followers():
+    """
+    Recount the followers of the users whose count drifted, e.g. after
+    their followers were deleted by `core.deletion.bulk_delete`, which
+    sends no signals. Return the number of users fixed.
+    """
+    User = get_user_model()
+    followers = User.following.through.objects.filter(
+        to_user_id=OuterRef('pk')
+    ).order_by().values('to_user_id').annotate(
+        count=Count('*')
+    ).values('count')
+    counted = Coalesce(Subquery(followers), 0)
+    return User.objects.annotate(counted=counted).exclude(
+        followers_count=F('counted')
+    ).update(followers_count=counted)
+
+
+def _older(position, id_field):
+    """Filter for the rows after `position`, a `(created_at, id)` pair."""
+    if position is None:
+        return Q()
+    created_at, pk = position
+    return (Q(created_at__lt=created_at)
+            | Q(created_at=created_at, **{id_field + '__lt': pk}))
+
+
+def page(user, position=None, limit=20):
+    """
+    Return the `limit` newest reviews in the feed of `user` after
+    `position`, with an `excerpt` of the description, and the position
+    of the next page, None on the last one.
+
+    The timeline is read `limit` entries at a time, and merged with the
+    `limit` newest reviews of each celebrity `user` follows.
+    """
+    keys = list(TimelineEntry.objects.filter(
+        _older(position, 'review_id'), owner=user
+    ).order_by('-created_at', '-review_id').values_list(
+        'created_at', 'review_id'
+    )[:limit + 1])
+
+    celebrities = user.following.filter(
+        followers_count__gt=settings.FEED['CELEBRITY_FOLLOWERS']
+    ).values_list('pk', flat=True)
+    for celebrity in celebrities:
+        keys.extend(partitioning.newest_keys(
+            Review.objects.filter(user_id=celebrity), position, limit + 1
+        ))
+
+    keys = sorted(set(keys), reverse=True)
+    next_position = keys[limit - 1] if len(keys) > limit else None
+    keys = keys[:limit]
+    if not keys:
+        return [], None
+    # Bounded on created_at, only the partitions of the page are read.
+    reviews = Review.objects.filter(
+        pk__in=[pk for _, pk in keys],
+        created_at__gte=keys[-1][0], created_at__lte=keys[0][0]
+    ).select_related('watchlist').only(
+        'id', 'user_id', 'watchlist_id', 'watchlist__title', 'rating',
+        'created_at'
+    ).annotate(
+        excerpt=Left('description', EXCERPT_LENGTH)
+    ).order_by('-created_at', '-id')
+    return list(reviews), next_position
+
+
+def trim(length=None):
+    """
+    Delete the timeline entries beyond the newest `length` of every user,
+    ``FEED['TIMELINE_LENGTH']`` by default. Return the number deleted.
+    """
+    length = length or settings.FEED['TIMELINE_LENGTH']
+    stale = TimelineEntry.objects.annotate(
+        position=Window(RowNumber(), partition_by=F('owner'),
+                        order_by=(F('created_at').desc(), F('pk').desc()))
+    ).filter(position__gt=length).values_list('pk', flat=True)
+
+    deleted = 0
+    while True:
+        batch = list(stale[:BATCH_SIZE * 10])
+        if not batch:
+            return deleted
+        deleted += TimelineEntry.objects.filter(pk__in=batch).delete()[0]
@@ -0,0 +1,58 @@
+"""
+Bounded concurrency for password checks.
+
+Checking a password costs tens of milliseconds of CPU by design, so a
+burst of logins, e.g. every client signing in again after an outage,
+would otherwise take every worker thread and starve the other requests.
+`slot()` lets at most `WORKERS` checks of the process run at once and up
+to `QUEUE` more wait for their turn. Logins beyond that, or waiting longer
+than `TIMEOUT` seconds, are answered 429 right away so clients back off.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib import auth
+from rest_framework.exceptions import Throttled
+
+
+_pool = {}
+_pool_lock = threading.Lock()
+
+
+def _semaphores():
+    config = settings.LOGIN_POOL
+    key = (config['WORKERS'], config['QUEUE'])
+    with _pool_lock:
+        if _pool.get('key') != key:
+            # Logins holding the previous semaphores release those.
+            _pool.update(
+                key=key,
+                running=threading.BoundedSemaphore(config['WORKERS']),
+                admitted=threading.BoundedSemaphore(config['WORKERS']
+                                                    + config['QUEUE']),
+            )
+        return _pool['running'], _pool['admitted'], config['TIMEOUT']
+
+
+@contextmanager
+def slot():
+    """Run the block as one of the `WORKERS` concurrent password checks."""
+    running, admitted, timeout = _semaphores()
+    if not admitted.acquire(blocking=False):
+        raise Throttled(wait=timeout)
+    try:
+        if not running.acquire(timeout=timeout):
+            raise Throttled(wait=timeout)
+        try:
+            yield
+        finally:
+            running.release()
+    finally:
+        admitted.release()
+
+
+def authenticate(request=None, **credentials):
+    """`django.contrib.auth.authenticate` in a login slot."""
+    with slot():
+        return auth.authenticate(request, **credentials)
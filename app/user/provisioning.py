@@ -0,0 +1,82 @@
+"""
+Bulk provisioning of user accounts.
+
+Signing users up one at a time costs an `exists()` query, a password hash
+and two INSERTs (user and token) per user. `provision` checks all emails
+with one ``IN`` query, hashes the passwords in a pool of threads (the
+hashers release the GIL) and inserts the users and their auth tokens with
+one `bulk_create` each.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext as _
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ValidationError
+
+
+def hash_passwords(passwords, workers=1):
+    """Return the hashes of `passwords`, computed in `workers` threads."""
+    if workers == 1 or len(passwords) < 2:
+        return [make_password(password) for password in passwords]
+
+    with ThreadPoolExecutor(workers) as executor:
+        return list(executor.map(make_password, passwords))
+
+
+def check_emails(emails):
+    """
+    Return the errors of each of `emails`, normalized, as a list of dicts:
+    emails already taken, found with one query, or repeated in the list.
+    """
+    taken = set(get_user_model().objects.filter(
+        email__in=emails
+    ).values_list('email', flat=True))
+
+    errors, seen = [], set()
+    for email in emails:
+        if email in taken:
+            errors.append({'email': [
+                _('A user with this email already exists.')
+            ]})
+        elif email in seen:
+            errors.append({'email': [_('This email is repeated.')]})
+        else:
+            errors.append({})
+        seen.add(email)
+    return errors
+
+
+def provision(users, workers=1):
+    """
+    Create `users`, validated dicts of `email`, `password` and `name`,
+    each with an auth token. Return the tokens, in the order of `users`.
+
+    Raises `ValidationError` with the errors of each user when an email
+    is taken or repeated, also when taken by a signup racing the insert.
+    """
+    model = get_user_model()
+    emails = [model.objects.normalize_email(user['email'])
+              for user in users]
+    errors = check_emails(emails)
+    if any(errors):
+        raise ValidationError({'users': errors})
+
+    passwords = hash_passwords([user['password'] for user in users], workers)
+    try:
+        with transaction.atomic():
+            created = model.objects.bulk_create([
+                model(email=email, name=user['name'], password=password)
+                for email, user, password in zip(emails, users, passwords)
+            ])
+            return Token.objects.bulk_create([
+                Token(key=Token.generate_key(), user=user)
+                for user in created
+            ])
+    except IntegrityError:
+        errors = check_emails(emails)
+        if not any(errors):
+            raise
+        raise ValidationError({'users': errors})
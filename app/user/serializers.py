@@ -1,14 +1,15 @@
 """
 Serializer for the user API view
 """
-from django.contrib.auth import (
-    get_user_model,
-    authenticate,
-)
+from django.contrib.auth import get_user_model
 from django.utils.translation import gettext as _
+from rest_framework_simplejwt import serializers as jwt_serializers
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework import serializers
 
+from core.models import Review
+from user.login import authenticate, slot
+
 
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for the user object"""
@@ -68,6 +69,33 @@ class UserSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class ProvisionUserSerializer(UserSerializer):
+    """Serializer for a user created by the bulk provisioning endpoint"""
+    # Emails are checked for the whole batch, see user.provisioning.
+    jwt_token = None
+
+    class Meta(UserSerializer.Meta):
+        fields = ['email', 'password', 'name']
+        extra_kwargs = dict(UserSerializer.Meta.extra_kwargs,
+                            email={'validators': []})
+
+    def validate_email(self, value):
+        return value
+
+
+class ProvisionUsersSerializer(serializers.Serializer):
+    """Serializer for the users to create at once"""
+    users = ProvisionUserSerializer(many=True, allow_empty=False,
+                                    max_length=1000)
+
+
+class ProvisionedUserSerializer(serializers.Serializer):
+    """Serializer for a provisioned user and its auth token"""
+    id = serializers.IntegerField(source='user_id')
+    email = serializers.EmailField(source='user.email')
+    token = serializers.CharField(source='key')
+
+
 class AuthTokenSerializer(serializers.Serializer):
     """Serializer for the user authentication object"""
     email = serializers.EmailField()
@@ -91,3 +119,33 @@ class AuthTokenSerializer(serializers.Serializer):
 
         attrs['user'] = user
         return attrs
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    """Serializer obtaining a JWT pair, authenticating in a login slot"""
+
+    def validate(self, attrs):
+        with slot():
+            return super().validate(attrs)
+
+
+class FeedSerializer(serializers.ModelSerializer):
+    """Serializer for the reviews of a feed"""
+    watchlist_title = serializers.CharField(source='watchlist.title',
+                                            read_only=True)
+    excerpt = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Review
+        fields = ['id', 'user', 'watchlist', 'watchlist_title', 'rating',
+                  'excerpt', 'created_at']
+        read_only_fields = fields
+
+
+class RecommendationSerializer(serializers.Serializer):
+    """Serializer for a title recommended to a user"""
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    average_rating = serializers.FloatField()
+    total_reviews = serializers.IntegerField()
+    score = serializers.FloatField(allow_null=True)
@@ -1,10 +1,19 @@
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
-from rest_framework.authtoken.models import Token
 
+from core.models import Review
+from core.tasks import enqueue
+from user import feed
+from user.tasks import FAN_OUT_REVIEWS
 
-@receiver(post_save, sender=settings.AUTH_USER_MODEL)
-def create_auth_token(sender, instance=None, created=False, **kwargs):
-    if created:
-        Token.objects.create(user=instance)
+
+@receiver(post_save, sender=Review)
+def fan_out_review(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        enqueue(FAN_OUT_REVIEWS, {'review_id': instance.pk})
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def uncount_deleted_follower(sender, instance, **kwargs):
+    feed.forget(instance)
@@ -0,0 +1,18 @@
+"""
+Background tasks of the user app
+"""
+from core.models import Review
+from core.tasks import task
+from user import feed
+
+
+FAN_OUT_REVIEWS = 'user.fan_out_reviews'
+
+
+@task(FAN_OUT_REVIEWS)
+def fan_out_reviews(payloads):
+    """Copy the reviews into the timelines of their authors' followers."""
+    for review in Review.objects.filter(
+        pk__in=[payload['review_id'] for payload in payloads]
+    ).order_by('pk'):
+        feed.fan_out(review)
@@ -0,0 +1,201 @@
+"""
+Tests for the review feed
+"""
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.deletion import bulk_delete
+from core.models import WatchList, Review, TimelineEntry
+
+
+FEED_URL = reverse('user:feed')
+
+
+def follow_url(user_id):
+    return reverse('user:follow', args=[user_id])
+
+
+def create_user(**params):
+    """Create a user with the given parameters."""
+    return get_user_model().objects.create_user(**params)
+
+
+class FeedApiTests(TestCase):
+    """Test the follow and feed endpoints."""
+
+    def setUp(self):
+        self.user = create_user(email='reader@example.com',
+                                password='testpass123')
+        self.author = create_user(email='author@example.com',
+                                  password='testpass123')
+        self.other = create_user(email='other@example.com',
+                                 password='testpass123')
+        self.titles = [
+            WatchList.objects.create(user=self.author,
+                                     title='Title {}'.format(i),
+                                     description='Desc')
+            for i in range(3)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def review(self, user, title, description='Review'):
+        return Review.objects.create(user=user, watchlist=title, rating=4,
+                                     description=description)
+
+    def test_feed_requires_auth(self):
+        """Test the feed is only available to authenticated users."""
+        res = APIClient().get(FEED_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_follow_backfills_and_fans_out(self):
+        """Test the feed holds old and new reviews of followed users."""
+        old = self.review(self.author, self.titles[0])
+        self.review(self.other, self.titles[0])
+
+        res = self.client.post(follow_url(self.author.pk))
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        new = self.review(self.author, self.titles[1],
+                          description='x' * 300)
+
+        res = self.client.get(FEED_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in res.data['results']],
+                         [new.pk, old.pk])
+        self.assertEqual(len(res.data['results'][0]['excerpt']), 200)
+        self.assertEqual(res.data['results'][0]['watchlist_title'],
+                         'Title 1')
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 1)
+
+    def test_follow_twice(self):
+        """Test following again changes nothing."""
+        self.client.post(follow_url(self.author.pk))
+        res = self.client.post(follow_url(self.author.pk))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 1)
+
+    def test_follow_self(self):
+        """Test users cannot follow themselves."""
+        res = self.client.post(follow_url(self.user.pk))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unfollow(self):
+        """Test unfollowing removes the reviews from the feed."""
+        self.client.post(follow_url(self.author.pk))
+        self.review(self.author, self.titles[0])
+
+        res = self.client.delete(follow_url(self.author.pk))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get(FEED_URL).data['results'], [])
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 0)
+
+    @override_settings(FEED={'TIMELINE_LENGTH': 500,
+                             'CELEBRITY_FOLLOWERS': 0, 'BACKFILL': 20})
+    def test_celebrity_merged_on_read(self):
+        """Test reviews of celebrities are read, not fanned out."""
+        self.client.post(follow_url(self.author.pk))
+        review = self.review(self.author, self.titles[0])
+
+        res = self.client.get(FEED_URL)
+
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual([item['id'] for item in res.data['results']],
+                         [review.pk])
+
+    def test_cursor_pagination(self):
+        """Test the feed is paginated by cursor."""
+        self.client.post(follow_url(self.author.pk))
+        for title in self.titles:
+            self.review(self.author, title)
+
+        res = self.client.get(FEED_URL, {'page_size': 2})
+        self.assertEqual(len(res.data['results']), 2)
+        res = self.client.get(res.data['next'])
+
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertIsNone(res.data['next'])
+
+    def test_trim_timelines(self):
+        """Test the trim command keeps the newest entries."""
+        self.client.post(follow_url(self.author.pk))
+        reviews = [self.review(self.author, title) for title in self.titles]
+
+        call_command('trim_timelines', '--length=2', stdout=StringIO())
+
+        self.assertEqual(
+            set(TimelineEntry.objects.values_list('review_id', flat=True)),
+            {reviews[1].pk, reviews[2].pk}
+        )
+
+    def test_deleted_follower_uncounted(self):
+        """Test deleting a follower decrements the followers count."""
+        self.client.post(follow_url(self.author.pk))
+        self.client.force_authenticate(self.other)
+        self.client.post(follow_url(self.author.pk))
+
+        self.user.delete()
+
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 1)
+
+    def test_recount_after_bulk_delete(self):
+        """Test the trim command recounts followers deleted in bulk."""
+        self.client.post(follow_url(self.author.pk))
+        bulk_delete(get_user_model().objects.filter(pk=self.user.pk))
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 1)
+
+        call_command('trim_timelines', stdout=StringIO())
+
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 0)
+
+    @override_settings(FEED={'TIMELINE_LENGTH': 2,
+                             'CELEBRITY_FOLLOWERS': 10000, 'BACKFILL': 20})
+    def test_timeline_capped_on_write(self):
+        """Test fanning out keeps the newest TIMELINE_LENGTH entries."""
+        self.client.post(follow_url(self.author.pk))
+        reviews = [self.review(self.author, title) for title in self.titles]
+
+        self.assertEqual(
+            set(TimelineEntry.objects.values_list('review_id', flat=True)),
+            {reviews[1].pk, reviews[2].pk}
+        )
+
+    def test_pages_merge_celebrities(self):
+        """Test pages merge the timeline with the celebrity reviews."""
+        self.client.post(follow_url(self.author.pk))
+        self.client.post(follow_url(self.other.pk))
+        get_user_model().objects.filter(pk=self.other.pk).update(
+            followers_count=20000
+        )
+        reviews = []
+        for title in self.titles:
+            reviews.append(self.review(self.author, title))
+            reviews.append(self.review(self.other, title))
+
+        ids = []
+        res = self.client.get(FEED_URL, {'page_size': 4})
+        while True:
+            ids.extend(item['id'] for item in res.data['results'])
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(TimelineEntry.objects.count(), 3)
+        self.assertEqual(ids, [review.pk for review in reversed(reviews)])
@@ -0,0 +1,146 @@
+"""
+Tests for the bulk user provisioning
+"""
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from user import provisioning
+
+
+PROVISION_URL = reverse('user:provision')
+
+
+def create_user(**params):
+    """Create a user with the given parameters."""
+    return get_user_model().objects.create_user(**params)
+
+
+@override_settings(PROVISIONING_WORKERS=2)
+class ProvisioningApiTests(TestCase):
+    """Test the bulk provisioning endpoint."""
+
+    def setUp(self):
+        self.admin = create_user(email='admin@example.com',
+                                 password='testpass123', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_staff_only(self):
+        """Test only staff can provision users."""
+        user = create_user(email='user@example.com', password='testpass123')
+        self.client.force_authenticate(user)
+
+        res = self.client.post(PROVISION_URL, {'users': []}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_provision_users(self):
+        """Test users are created with usable passwords and tokens."""
+        payload = {'users': [
+            {'email': 'user{}@EXAMPLE.com'.format(i),
+             'password': 'secret-{}'.format(i), 'name': 'Name'}
+            for i in range(3)
+        ]}
+
+        res = self.client.post(PROVISION_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([item['email'] for item in res.data],
+                         ['user{}@example.com'.format(i) for i in range(3)])
+        for i, item in enumerate(res.data):
+            user = get_user_model().objects.get(pk=item['id'])
+            self.assertTrue(user.check_password('secret-{}'.format(i)))
+            self.assertEqual(Token.objects.get(user=user).key, item['token'])
+
+    def test_taken_and_repeated_emails(self):
+        """Test taken or repeated emails are reported and nothing created."""
+        payload = {'users': [
+            {'email': 'admin@example.com', 'password': 'secret',
+             'name': 'Name'},
+            {'email': 'new@example.com', 'password': 'secret',
+             'name': 'Name'},
+            {'email': 'new@example.com', 'password': 'secret',
+             'name': 'Name'},
+        ]}
+
+        res = self.client.post(PROVISION_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = res.data['users']
+        self.assertIn('email', errors[0])
+        self.assertEqual(errors[1], {})
+        self.assertIn('email', errors[2])
+        self.assertEqual(get_user_model().objects.count(), 1)
+
+    def test_email_taken_meanwhile(self):
+        """Test an email taken after the check is reported, not a 500."""
+        check_emails = provisioning.check_emails
+        checks = []
+
+        def stale_check(emails):
+            # The first check misses a signup committed right after it.
+            checks.append(emails)
+            if len(checks) == 1:
+                create_user(email='new@example.com', password='secret')
+                return [{} for email in emails]
+            return check_emails(emails)
+
+        payload = {'users': [{'email': 'new@example.com',
+                              'password': 'secret', 'name': 'Name'}]}
+        with patch.object(provisioning, 'check_emails', stale_check):
+            res = self.client.post(PROVISION_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', res.data['users'][0])
+        self.assertEqual(len(checks), 2)
+
+
+class ProvisionUsersCommandTests(TestCase):
+    """Test provisioning users from a CSV file."""
+
+    def write_csv(self, *rows):
+        file = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False)
+        self.addCleanup(os.remove, file.name)
+        with file:
+            file.write('email,password,name\n')
+            file.writelines(','.join(row) + '\n' for row in rows)
+        return file.name
+
+    def test_provision_users(self):
+        """Test every row is created, batch after batch."""
+        path = self.write_csv(*[
+            ('user{}@example.com'.format(i), 'secret', 'Name')
+            for i in range(5)
+        ])
+        out = StringIO()
+
+        call_command('provision_users', path, '--batch-size=2',
+                     '--workers=2', stdout=out)
+
+        self.assertEqual(get_user_model().objects.count(), 5)
+        self.assertEqual(Token.objects.count(), 5)
+        self.assertIn('Provisioned 5 users.', out.getvalue())
+
+    def test_invalid_row(self):
+        """Test an invalid row is reported and nothing is created."""
+        path = self.write_csv(('user@example.com', 'secret', 'Name'),
+                              ('other@example.com', 'secret', 'Name'),
+                              ('user@example.com', 'secret', 'Name'))
+
+        with self.assertRaisesRegex(CommandError, 'Row 4: email'):
+            call_command('provision_users', path, '--batch-size=2',
+                         stdout=StringIO())
+
+        self.assertFalse(get_user_model().objects.exists())
@@ -0,0 +1,166 @@
+"""
+Tests for the personalized recommendations
+"""
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+import numpy as np
+from scipy import sparse
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import WatchList, Review
+from watchlist import factorization
+
+
+RECOMMENDATIONS_URL = reverse('user:recommendations')
+
+
+def create_user(**params):
+    """Create a user with the given parameters."""
+    return get_user_model().objects.create_user(**params)
+
+
+class SolveRowsTests(SimpleTestCase):
+    """Test the vectorized least squares step."""
+
+    def test_matches_ridge_regression(self):
+        """Test each row solves its own ridge regression."""
+        rand = np.random.default_rng(0)
+        dense = rand.integers(0, 6, (6, 5)).astype(np.float32)
+        dense[2] = 0
+        fixed = rand.normal(size=(5, 3)).astype(np.float32)
+
+        factors = factorization.solve_rows(sparse.csr_matrix(dense), fixed,
+                                           0.5, 0, 6)
+
+        for row, values in enumerate(dense):
+            rated = values > 0
+            if not rated.any():
+                self.assertFalse(factors[row].any())
+                continue
+            selected = fixed[rated]
+            expected = np.linalg.solve(
+                selected.T @ selected + 0.5 * rated.sum() * np.eye(3),
+                selected.T @ values[rated]
+            )
+            np.testing.assert_allclose(factors[row], expected, rtol=1e-4)
+
+    def test_rows_split_across_chunks(self):
+        """Test rows with more ratings than a chunk give the same factors."""
+        rand = np.random.default_rng(2)
+        dense = rand.integers(1, 6, (3, 40)).astype(np.float32)
+        dense[1, 5:] = 0
+        matrix = sparse.csr_matrix(dense)
+        fixed = rand.normal(size=(40, 4)).astype(np.float32)
+
+        expected = factorization.solve_rows(matrix, fixed, 0.5, 0, 3)
+        with patch.object(factorization, 'CHUNK_RATINGS', 7):
+            factors = factorization.solve_rows(matrix, fixed, 0.5, 0, 3)
+
+        np.testing.assert_allclose(factors, expected, rtol=1e-4, atol=1e-5)
+
+
+class RecommendationsApiTests(TestCase):
+    """Test training and serving recommendations."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        override = override_settings(RECOMMENDATIONS_DIR=self.directory)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.users = [create_user(email='user{}@example.com'.format(i),
+                                  password='testpass123') for i in range(6)]
+        self.titles = [
+            WatchList.objects.create(user=self.users[0],
+                                     title='Title {}'.format(i),
+                                     description='Desc')
+            for i in range(6)
+        ]
+        rand = np.random.default_rng(1)
+        for user in self.users[1:]:
+            for title in rand.choice(self.titles, 4, replace=False):
+                Review.objects.create(user=user, watchlist=title,
+                                      rating=int(rand.integers(1, 6)),
+                                      description='Review')
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[1])
+
+    def train(self, *args):
+        call_command('train_recommendations', '--factors=4',
+                     '--iterations=5', *args, stdout=StringIO())
+
+    def test_trained_recommendations(self):
+        """Test recommendations skip reviewed titles and are ranked."""
+        self.train('--workers=1')
+
+        res = self.client.get(RECOMMENDATIONS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        reviewed = set(Review.objects.filter(
+            user=self.users[1]).values_list('watchlist_id', flat=True))
+        ids = [item['id'] for item in res.data]
+        self.assertEqual(len(ids), len(self.titles) - len(reviewed))
+        self.assertFalse(reviewed & set(ids))
+        scores = [item['score'] for item in res.data]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_factors_memory_mapped(self):
+        """Test saved factors are float32 and served memory-mapped."""
+        self.train('--workers=1')
+
+        model = factorization.load()
+
+        self.assertIsInstance(model['title_factors'], np.memmap)
+        self.assertEqual(model['title_factors'].dtype, np.float32)
+        self.assertEqual(model['user_factors'].shape, (5, 4))
+
+    def test_workers_same_model(self):
+        """Test training in several processes gives the same factors."""
+        self.train('--workers=1')
+        single = np.array(factorization.load()['title_factors'])
+        self.train('--workers=2')
+
+        np.testing.assert_allclose(factorization.load()['title_factors'],
+                                   single, rtol=1e-4, atol=1e-5)
+        self.assertEqual(len(os.listdir(self.directory)), 3)
+
+    def test_rating_equal_to_mean(self):
+        """Test ratings equal to the mean rating are trained on."""
+        Review.objects.all().delete()
+        ratings = ((0, 0, 3), (0, 1, 5), (1, 0, 4), (1, 2, 4))
+        for user, title, rating in ratings:
+            Review.objects.create(user=self.users[user + 1],
+                                  watchlist=self.titles[title],
+                                  rating=rating, description='Review')
+
+        arrays = factorization.train(factors=2, iterations=3)
+
+        predicted = arrays['user_factors'] @ arrays['title_factors'].T + 4
+        errors = [predicted[user, title] - rating
+                  for user, title, rating in ratings]
+        self.assertAlmostEqual(arrays['rmse'],
+                               np.sqrt(np.mean(np.square(errors))), places=5)
+
+    def test_cold_start(self):
+        """Test users outside the model get the most reviewed titles."""
+        self.client.force_authenticate(self.users[0])
+
+        res = self.client.get(RECOMMENDATIONS_URL, {'limit': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 2)
+        self.assertIsNone(res.data[0]['score'])
+        self.assertGreaterEqual(res.data[0]['total_reviews'],
+                                res.data[1]['total_reviews'])
@@ -2,12 +2,15 @@
 Tests for the user API endpoints
 """
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.urls import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from user import login
 
 CREATE_USER_URL = reverse('user:create')
 TOKEN_URL = reverse('user:token')
@@ -81,10 +84,12 @@ class PublicUserTests(TestCase):
             'email': user_details['email'],
             'password': user_details['password'],
         }
+        self.assertFalse(Token.objects.exists())
         res = self.client.post(TOKEN_URL, payload)
 
         self.assertIn('token', res.data)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(Token.objects.get().key, res.data['token'])
 
     def test_jwt_token_for_user(self):
         """Test that a JWT token is created for the user."""
@@ -126,6 +131,36 @@ class PublicUserTests(TestCase):
         self.assertNotIn('token', res.data)
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_login_rehashes_password(self):
+        """Test logging in rehashes an old hash with the preferred hasher."""
+        user = create_user(email='test@example.com', password='test123')
+        user.password = make_password('test123', hasher='pbkdf2_sha1')
+        user.save()
+
+        res = self.client.post(TOKEN_URL, {'email': 'test@example.com',
+                                           'password': 'test123'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertFalse(user.password.startswith('pbkdf2_sha1$'))
+        self.assertTrue(user.check_password('test123'))
+
+    @override_settings(LOGIN_POOL={'WORKERS': 1, 'QUEUE': 0, 'TIMEOUT': 0})
+    def test_login_pool_full(self):
+        """Test logins beyond the login pool are throttled."""
+        create_user(email='test@example.com', password='test123')
+        payload = {'email': 'test@example.com', 'password': 'test123'}
+
+        with login.slot():
+            res = self.client.post(TOKEN_URL, payload)
+            jwt_res = self.client.post(JWT_TOKEN_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(jwt_res.status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+        res = self.client.post(TOKEN_URL, payload)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
     def test_retrieve_user_unauthorized(self):
         """Test that authentication is required."""
         res = self.client.get(ME_URL)
@@ -221,3 +256,14 @@ class PrivateUserTests(TestCase):
 
         res = self.client.post(LOGOUT_URL, payload)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_log_out_twice(self):
+        """Test logging out deletes the token and can be repeated."""
+        Token.objects.create(user=self.user)
+
+        res = self.client.post(LOGOUT_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.post(LOGOUT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
@@ -11,9 +11,14 @@ app_name = 'user'
 
 urlpatterns = [
     path('create/', views.CreateUserView.as_view(), name='create'),
+    path('provision/', views.ProvisionUsersView.as_view(), name='provision'),
     path('token/', views.ObtainExpiringAuthToken.as_view(), name='token'),
     path('me/', views.ManageUserView.as_view(), name='me'),
+    path('me/recommendations/', views.RecommendationsView.as_view(),
+         name='recommendations'),
     path('log-out/', views.LogOutView.as_view(), name='log-out'),
+    path('feed/', views.FeedView.as_view(), name='feed'),
+    path('<int:pk>/follow/', views.FollowView.as_view(), name='follow'),
     path('jwt-token/', TokenObtainPairView.as_view(),
          name='token_obtain_pair'),
     path('jwt-token/refresh/', TokenRefreshView.as_view(),
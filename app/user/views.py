@@ -1,16 +1,25 @@
 """
 Views for the user API
 """
+from django.conf import settings
 from django.utils import timezone
 
-from django.contrib.auth import logout
+from django.contrib.auth import get_user_model, logout
 from rest_framework import generics, authentication, permissions, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 
-from user.serializers import UserSerializer, AuthTokenSerializer
+from core.models import Review, WatchList, WatchListSummary
+from core.pagination import FeedCursorPagination
+from user import feed, provisioning
+from user.serializers import (UserSerializer, AuthTokenSerializer,
+                              ProvisionUsersSerializer,
+                              ProvisionedUserSerializer,
+                              FeedSerializer, RecommendationSerializer)
+from watchlist import factorization
 
 
 class LogOutView(generics.GenericAPIView):
@@ -22,16 +31,10 @@ class LogOutView(generics.GenericAPIView):
         return self.logout(request)
 
     def logout(self, request):
-        try:
-            # Attempt to delete the token associated with the logged-in user
-            request.user.auth_token.delete()
-            logout(request)
-            return Response(status=status.HTTP_200_OK)
-        except Token.DoesNotExist:
-            # In case the user doesn't have a token
-            return Response({'detail': 'Token does not '
-                                       'exist or already deleted.'},
-                            status=status.HTTP_400_BAD_REQUEST)
+        # A single DELETE, logging out twice is not an error.
+        Token.objects.filter(user=request.user).delete()
+        logout(request)
+        return Response(status=status.HTTP_200_OK)
 
 
 class CreateUserView(generics.CreateAPIView):
@@ -39,6 +42,21 @@ class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
 
 
+class ProvisionUsersView(generics.GenericAPIView):
+    """Create many users with their auth tokens at once, for staff"""
+    serializer_class = ProvisionUsersSerializer
+    authentication_classes = (authentication.TokenAuthentication,)
+    permission_classes = (permissions.IsAdminUser,)
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        tokens = provisioning.provision(serializer.validated_data['users'],
+                                        settings.PROVISIONING_WORKERS)
+        return Response(ProvisionedUserSerializer(tokens, many=True).data,
+                        status=status.HTTP_201_CREATED)
+
+
 class ObtainExpiringAuthToken(ObtainAuthToken):
     serializer_class = AuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
@@ -68,3 +86,87 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         """Retrieve the authenticated user"""
         return self.request.user
+
+
+class FeedView(generics.ListAPIView):
+    """List the reviews of the users the authenticated user follows"""
+    serializer_class = FeedSerializer
+    authentication_classes = (authentication.TokenAuthentication,)
+    permission_classes = (permissions.IsAuthenticated,)
+    pagination_class = FeedCursorPagination
+
+    def list(self, request, *args, **kwargs):
+        reviews = self.paginator.paginate_pages(
+            lambda position, limit: feed.page(request.user, position, limit),
+            request
+        )
+        return self.get_paginated_response(
+            self.get_serializer(reviews, many=True).data
+        )
+
+
+class FollowView(generics.GenericAPIView):
+    """Follow (POST) or unfollow (DELETE) a user"""
+    authentication_classes = (authentication.TokenAuthentication,)
+    permission_classes = (permissions.IsAuthenticated,)
+    queryset = get_user_model().objects.all()
+
+    def post(self, request, pk):
+        target = self.get_object()
+        if target == request.user:
+            raise ValidationError('You cannot follow yourself.')
+
+        created = feed.follow(request.user, target)
+        return Response(status=status.HTTP_201_CREATED if created
+                        else status.HTTP_200_OK)
+
+    def delete(self, request, pk):
+        feed.unfollow(request.user, self.get_object())
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class RecommendationsView(generics.GenericAPIView):
+    """
+    List titles recommended to the authenticated user, the most reviewed
+    titles until the user is part of a trained model.
+    """
+    serializer_class = RecommendationSerializer
+    authentication_classes = (authentication.TokenAuthentication,)
+    permission_classes = (permissions.IsAuthenticated,)
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get('limit',
+                                                 self.default_limit))
+        except ValueError:
+            raise ValidationError({'limit': 'A valid integer is required.'})
+        limit = max(1, min(limit, self.max_limit))
+
+        user = request.user
+        reviewed = set(Review.objects.filter(user=user).values_list(
+            'watchlist_id', flat=True
+        ))
+        model = factorization.load()
+        result = model and factorization.top_n(model, [user.pk], limit,
+                                               {user.pk: reviewed})[0]
+        if result:
+            title_ids, scores = result
+        else:
+            title_ids = list(WatchListSummary.objects.exclude(
+                watchlist_id__in=reviewed
+            ).order_by('-total_reviews').values_list(
+                'watchlist_id', flat=True
+            )[:limit])
+            scores = [None] * len(title_ids)
+
+        titles = WatchList.objects.only(
+            'title', 'average_rating', 'total_reviews'
+        ).in_bulk(title_ids)
+        recommended = []
+        for pk, score in zip(title_ids, scores):
+            if pk in titles:
+                titles[pk].score = score
+                recommended.append(titles[pk])
+        return Response(self.get_serializer(recommended, many=True).data)
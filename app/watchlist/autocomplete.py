@@ -0,0 +1,163 @@
+"""
+Title autocomplete.
+
+On PostgreSQL active titles starting with the query come first, read in
+order from the ``text_pattern_ops`` index on the summary table. Remaining
+slots are filled with titles containing the query, through a ``pg_trgm``
+GIN index, shortest first among the few fetched. Queries too short for
+trigrams only match prefixes. Both indexes are created by the
+``0011_title_autocomplete`` migration.
+
+Other databases use a prefix index held in memory by every process: the
+active titles sorted by their case folded form, searched with bisect.
+Renames, (de)activations and deletes are appended to a change log in the
+shared cache under an increasing version. Processes replay the changes
+since their version, and only reload every title when changes are
+missing from the cache or too many to replay.
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from core.models import WatchListSummary
+
+
+LIMIT = 10
+TRIGRAM_LENGTH = 3
+VERSION_KEY = 'autocomplete:version'
+CHANGE_KEY = 'autocomplete:change:{}'
+# Changes kept in the cache and replayed before a reload is cheaper.
+CHANGE_TIMEOUT = 86400
+MAX_CHANGES = 1000
+
+_index = {'version': None, 'keys': [], 'titles': {}}
+_lock = threading.Lock()
+
+
+def search(query, limit=LIMIT):
+    """Return the ids and titles of the best `limit` matches of `query`."""
+    query = query.strip()
+    if not query:
+        return []
+    if connection.vendor == 'postgresql':
+        return _search_database(query, limit)
+    return _search_prefix(query, limit)
+
+
+def _like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _search_database(query, limit):
+    # USING ~<~ orders like text_pattern_ops, so the index returns the
+    # prefix matches in order and the scan stops at the limit.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT watchlist_id, title FROM core_watchlistsummary '
+            'WHERE active AND UPPER(title::text) LIKE UPPER(%s) '
+            'ORDER BY UPPER(title::text) USING ~<~ LIMIT %s',
+            [_like(query) + '%', limit]
+        )
+        rows = cursor.fetchall()
+
+    if len(rows) < limit and len(query) >= TRIGRAM_LENGTH:
+        # Unordered, the GIN index cannot sort; only the few rows fetched
+        # are ranked.
+        contains = WatchListSummary.objects.filter(
+            title__icontains=query
+        ).exclude(title__istartswith=query).order_by().values_list(
+            'watchlist_id', 'title'
+        )[:limit - len(rows)]
+        rows.extend(sorted(contains, key=lambda row: (len(row[1]), row[1])))
+    return [{'id': pk, 'title': title} for pk, title in rows]
+
+
+def _search_prefix(query, limit):
+    prefix = query.casefold()
+    with _lock:
+        _sync()
+        keys, titles = _index['keys'], _index['titles']
+        results = []
+        position = bisect_left(keys, (prefix,))
+        while len(results) < limit and position < len(keys):
+            folded, pk = keys[position]
+            if not folded.startswith(prefix):
+                break
+            results.append({'id': pk, 'title': titles[pk][1]})
+            position += 1
+    return results
+
+
+def _version():
+    # Seeded with the clock, so a flushed cache never repeats a version.
+    return cache.get_or_set(VERSION_KEY, time.time_ns, timeout=None)
+
+
+def _sync():
+    """Catch up with the changes of every process. Hold _lock."""
+    version = _version()
+    current = _index['version']
+    if current == version:
+        return
+
+    if current is not None and 0 < version - current <= MAX_CHANGES:
+        keys = [CHANGE_KEY.format(number)
+                for number in range(current + 1, version + 1)]
+        changes = cache.get_many(keys)
+        if len(changes) == len(keys):
+            for key in keys:
+                _apply(*changes[key])
+            _index['version'] = version
+            return
+
+    # Read the version first: changes committed meanwhile are replayed
+    # again on the next sync, which is harmless.
+    titles = {
+        pk: (title.casefold(), title) for pk, title in
+        WatchListSummary.objects.values_list(
+            'watchlist_id', 'title'
+        ).iterator(chunk_size=10000)
+    }
+    _index.update(version=version, titles=titles,
+                  keys=sorted((folded, pk)
+                              for pk, (folded, _) in titles.items()))
+
+
+def _apply(pk, title):
+    """Replace the entry of title `pk` with `title`, dropped if None."""
+    keys, titles = _index['keys'], _index['titles']
+    if pk in titles:
+        del keys[bisect_left(keys, (titles.pop(pk)[0], pk))]
+    if title is not None:
+        titles[pk] = (title.casefold(), title)
+        insort(keys, (titles[pk][0], pk))
+
+
+def _changed(pk, title=None):
+    """Append a change of title `pk` to the log, `title` None drops it."""
+    _version()
+    version = cache.incr(VERSION_KEY)
+    cache.set(CHANGE_KEY.format(version), (pk, title), CHANGE_TIMEOUT)
+
+
+def title_saved(watchlist):
+    """Log a renamed, (de)activated or new title once committed."""
+    if connection.vendor == 'postgresql':
+        return
+
+    loaded = getattr(watchlist, '_loaded', None)
+    watchlist._loaded = (watchlist.title, watchlist.active)
+    if loaded == watchlist._loaded:
+        return
+    title = watchlist.title if watchlist.active else None
+    transaction.on_commit(lambda: _changed(watchlist.pk, title))
+
+
+def title_deleted(watchlist):
+    """Log a deleted title once committed."""
+    if connection.vendor != 'postgresql':
+        pk = watchlist.pk
+        transaction.on_commit(lambda: _changed(pk))
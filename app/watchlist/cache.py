@@ -0,0 +1,42 @@
+"""
+Cache of serialized reviews.
+
+Entries are keyed by review id and `updated_at`, so an edited review is
+never served from a stale entry; the `Review` signals drop the entries of
+saved and deleted reviews.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+
+def review_key(pk, updated_at):
+    return 'review:{}:{}'.format(pk, updated_at.isoformat())
+
+
+def get_many_reviews(reviews, serialize):
+    """
+    Return the serialized `reviews`, in order, with a single cache lookup.
+
+    Only the misses are passed to `serialize`, one review at a time, and
+    stored back with a single write.
+    """
+    reviews = list(reviews)
+    keys = [review_key(review.pk, review.updated_at) for review in reviews]
+    cached = cache.get_many(keys)
+
+    missing = {}
+    data = []
+    for key, review in zip(keys, reviews):
+        item = cached.get(key)
+        if item is None:
+            item = missing[key] = serialize(review)
+        data.append(item)
+
+    if missing:
+        cache.set_many(missing, settings.REVIEW_CACHE_TIMEOUT)
+    return data
+
+
+def delete_review(review):
+    """Drop the cached representation of `review`."""
+    cache.delete(review_key(review.pk, review.updated_at))
@@ -0,0 +1,144 @@
+"""
+Rating aggregates of titles kept as counters in the cache.
+
+With ``RATING_COUNTERS['ENABLED']`` review writes only increment the
+pending review count and rating sum of their title instead of rewriting
+the `WatchList` row. Reads add the pending deltas to the stored values.
+A title is written back with `recompute_ratings` once it collects
+``FLUSH_EVERY`` events, and the `flush_rating_counters` command brings
+every title to the exact value.
+
+Counter keys carry a generation that the flush command bumps, which
+discards all pending deltas at once. Writes racing with a flush may be
+missing from, or counted twice in, the deltas until the next flush; the
+database itself is always exact after a flush.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from core.models import WatchList
+
+
+GENERATION_KEY = 'rating:generation'
+FIELDS = ('count', 'sum', 'events')
+
+
+def enabled():
+    return settings.RATING_COUNTERS['ENABLED']
+
+
+def _generation():
+    return cache.get_or_set(GENERATION_KEY, 0, timeout=None)
+
+
+def _keys(generation, pk):
+    return ['rating:{}:{}:{}'.format(generation, pk, field)
+            for field in FIELDS]
+
+
+def record(pk, count, total):
+    """
+    Add a review `count` and rating `total` delta to the title `pk`,
+    flushing the title once it collected enough events.
+    """
+    keys = _keys(_generation(), pk)
+    for key in keys:
+        cache.add(key, 0, timeout=None)
+    if count:
+        cache.incr(keys[0], count)
+    if total:
+        cache.incr(keys[1], total)
+    if cache.incr(keys[2]) >= settings.RATING_COUNTERS['FLUSH_EVERY']:
+        flush_title(pk)
+
+
+def flush_title(pk):
+    """Write the exact aggregates of title `pk` and drop its deltas."""
+    flush_titles([pk])
+
+
+def flush_titles(pks):
+    """Write the exact aggregates of the titles `pks` and drop their deltas."""
+    pending = {}
+    if enabled():
+        generation = _generation()
+        pending = cache.get_many([key for pk in pks
+                                  for key in _keys(generation, pk)])
+    WatchList.objects.filter(pk__in=pks).recompute_ratings()
+    # Only take off what was written back, later events stay pending.
+    for key, value in pending.items():
+        if value:
+            cache.decr(key, value)
+
+
+def flush_all():
+    """
+    Write the exact aggregates of every title and drop all deltas.
+    Return the number of titles written.
+    """
+    cache.add(GENERATION_KEY, 0, timeout=None)
+    cache.incr(GENERATION_KEY)
+    return WatchList.objects.recompute_ratings()
+
+
+def record_save(review, created):
+    """
+    Record the deltas of a saved `review`. Return False if the stored
+    values of an updated review are unknown.
+    """
+    watchlist_id, rating, active = getattr(review, '_loaded',
+                                           (None, None, None))
+    if not created and None in (watchlist_id, rating, active):
+        return False
+
+    # Only active reviews count, (title, rating) before and after.
+    old = (watchlist_id, rating) if not created and active else None
+    new = (review.watchlist_id, review.rating) if review.active else None
+    if old and new and old[0] == new[0]:
+        if old[1] != new[1]:
+            record(new[0], 0, new[1] - old[1])
+    else:
+        if old:
+            record(old[0], -1, -old[1])
+        if new:
+            record(new[0], 1, new[1])
+
+    review._loaded = (review.watchlist_id, review.rating, review.active)
+    return True
+
+
+def record_delete(review):
+    """Record the deltas of a deleted `review`."""
+    watchlist_id, rating, active = getattr(review, '_loaded',
+                                           (None, None, None))
+    if active is False or (active is None and not review.active):
+        return
+    record(watchlist_id or review.watchlist_id, -1,
+           -(rating or review.rating))
+
+
+def overlay(items):
+    """
+    Add the pending deltas to serialized titles, dicts with `id`,
+    `total_reviews` and `average_rating`, with a single cache lookup.
+    """
+    if not enabled() or not items:
+        return items
+
+    generation = _generation()
+    keys = {item['id']: _keys(generation, item['id']) for item in items}
+    pending = cache.get_many([key for item_keys in keys.values()
+                              for key in item_keys])
+    for item in items:
+        count_key, sum_key, _ = keys[item['id']]
+        count, total = pending.get(count_key, 0), pending.get(sum_key, 0)
+        if not count and not total:
+            continue
+
+        stored = item['total_reviews']
+        item['total_reviews'] = stored + count
+        item['average_rating'] = (
+            ((item['average_rating'] or 0) * stored + total)
+            / item['total_reviews'] if item['total_reviews'] else None
+        )
+    return items
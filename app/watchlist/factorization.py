@@ -0,0 +1,235 @@
+"""
+Personalized title recommendations from a matrix factorization.
+
+Alternating least squares factorizes the user x title rating matrix,
+centered on the mean rating, into user and title factors. Training runs
+offline (see the `train_recommendations` command) and saves the factors
+as float32 ``.npy`` files that web processes memory-map, so they share
+one copy through the page cache. A user's recommendations are the
+unreviewed titles with the highest dot product with the user's factors.
+"""
+import multiprocessing
+import os
+import shutil
+import threading
+from time import time
+
+import numpy as np
+from django.conf import settings
+
+from watchlist.similarity import review_matrix
+
+
+# Ratings whose k x k outer products are summed at once, bounds the
+# memory per chunk whatever the number of ratings of a single row.
+CHUNK_RATINGS = 8192
+FILES = ('user_ids', 'user_factors', 'title_ids', 'title_factors')
+
+# Filled in by the parent process before the worker processes fork.
+_shared = {}
+
+
+def _row_chunks(indptr):
+    """Split CSR rows into ranges holding about `CHUNK_RATINGS` ratings."""
+    bounds = np.searchsorted(indptr, np.arange(0, indptr[-1],
+                                               CHUNK_RATINGS), side='right')
+    bounds = np.unique(np.concatenate(([0], bounds - 1, [len(indptr) - 1])))
+    return [(int(start), int(stop))
+            for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+
+def solve_rows(matrix, fixed, regularization, start, stop):
+    """
+    Return the least squares factors of rows `start:stop` of the CSR
+    `matrix` given the `fixed` factors of its columns, with a ridge
+    penalty weighted by the ratings of each row.
+    """
+    rows = matrix[start:stop]
+    counts = np.diff(rows.indptr)
+    rated = counts > 0
+    size = fixed.shape[1]
+    factors = np.zeros((stop - start, size), dtype=np.float32)
+    if not rated.any():
+        return factors
+
+    # The k x k outer products are summed `CHUNK_RATINGS` ratings at a
+    # time, a chunk may end in the middle of a row with many ratings.
+    lhs = np.zeros((stop - start, size, size), dtype=np.float32)
+    rhs = np.zeros((stop - start, size), dtype=np.float32)
+    row_of = np.repeat(np.arange(stop - start), counts)
+    for begin in range(0, rows.nnz, CHUNK_RATINGS):
+        end = min(begin + CHUNK_RATINGS, rows.nnz)
+        selected = fixed[rows.indices[begin:end]]
+        chunk_rows = row_of[begin:end]
+        offsets = np.flatnonzero(np.diff(chunk_rows, prepend=-1))
+        chunk_rows = chunk_rows[offsets]
+        lhs[chunk_rows] += np.add.reduceat(
+            np.einsum('ni,nj->nij', selected, selected), offsets, axis=0
+        )
+        rhs[chunk_rows] += np.add.reduceat(
+            selected * rows.data[begin:end, None], offsets, axis=0
+        )
+
+    lhs = lhs[rated]
+    lhs += (regularization * counts[rated])[:, None, None] \
+        * np.eye(size, dtype=np.float32)
+    factors[rated] = np.linalg.solve(lhs, rhs[rated][..., None])[..., 0]
+    return factors
+
+
+def _solve_chunk(bounds):
+    return solve_rows(_shared['matrix'], _shared['fixed'],
+                      _shared['regularization'], *bounds)
+
+
+def _solve(matrix, fixed, regularization, workers):
+    """Solve the factors of every row of `matrix`, in `workers` processes."""
+    _shared.update(matrix=matrix, fixed=fixed,
+                   regularization=regularization)
+    chunks = _row_chunks(matrix.indptr)
+    try:
+        if workers == 1:
+            parts = list(map(_solve_chunk, chunks))
+        else:
+            context = multiprocessing.get_context('fork')
+            with context.Pool(workers) as pool:
+                parts = pool.map(_solve_chunk, chunks)
+    finally:
+        _shared.clear()
+    return (np.concatenate(parts) if parts
+            else np.zeros((0, fixed.shape[1]), dtype=np.float32))
+
+
+def train(factors=32, iterations=10, regularization=0.1, workers=1, seed=0,
+          progress=None):
+    """
+    Factorize the ratings of all reviews. Return a dict of the arrays in
+    `FILES` plus the training RMSE.
+    """
+    matrix, user_ids, title_ids = review_matrix()
+    mean = float(matrix.data.mean()) if matrix.nnz else 0.0
+    matrix.data -= mean
+    by_title = matrix.T.tocsr()
+
+    rand = np.random.default_rng(seed)
+    title_factors = rand.normal(
+        0, 0.1, (len(title_ids), factors)
+    ).astype(np.float32)
+    for iteration in range(iterations):
+        user_factors = _solve(matrix, title_factors, regularization,
+                              workers)
+        title_factors = _solve(by_title, user_factors, regularization,
+                               workers)
+        if progress:
+            progress(iteration + 1)
+
+    if not matrix.nnz:
+        user_factors = np.zeros((0, factors), dtype=np.float32)
+    # Ratings equal to the mean are stored zeros, which `nonzero()` skips.
+    ratings = matrix.tocoo()
+    errors = np.einsum('nk,nk->n', user_factors[ratings.row],
+                       title_factors[ratings.col]) - ratings.data
+    return {
+        'user_ids': user_ids,
+        'user_factors': user_factors,
+        'title_ids': title_ids,
+        'title_factors': title_factors,
+        'rmse': float(np.sqrt(np.mean(errors ** 2))) if matrix.nnz else 0.0,
+    }
+
+
+def save(arrays, directory=None):
+    """
+    Save `arrays` as a new version in `directory` and make it current.
+    Return the version.
+    """
+    directory = directory or settings.RECOMMENDATIONS_DIR
+    version = '{:.6f}'.format(time())
+    path = os.path.join(directory, version)
+    os.makedirs(path)
+    for name in FILES:
+        np.save(os.path.join(path, name + '.npy'), arrays[name])
+
+    previous = _current_version(directory)
+    pointer = os.path.join(directory, 'current.tmp')
+    with open(pointer, 'w') as file:
+        file.write(version)
+    os.replace(pointer, os.path.join(directory, 'current'))
+
+    # Keep the previous version for processes about to load it; those
+    # mapping older files keep them until they unmap them.
+    for name in os.listdir(directory):
+        entry = os.path.join(directory, name)
+        if os.path.isdir(entry) and name not in (version, previous):
+            shutil.rmtree(entry, ignore_errors=True)
+    return version
+
+
+def _current_version(directory):
+    try:
+        with open(os.path.join(directory, 'current')) as file:
+            return file.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+_model = {}
+_model_lock = threading.Lock()
+
+
+def load(directory=None):
+    """
+    Return the current factor arrays memory-mapped read-only, or None
+    when no model was trained yet. Reloaded when a new version is saved.
+    """
+    directory = directory or settings.RECOMMENDATIONS_DIR
+    version = _current_version(directory)
+    if version is None:
+        return None
+
+    with _model_lock:
+        if _model.get('key') != (directory, version):
+            path = os.path.join(directory, version)
+            _model.clear()
+            _model.update({
+                name: np.load(os.path.join(path, name + '.npy'),
+                              mmap_mode='r')
+                for name in FILES
+            })
+            _model['key'] = (directory, version)
+        return dict(_model)
+
+
+def top_n(model, user_ids, n, exclude=None):
+    """
+    Return `(title ids, scores)` of the `n` best titles of each of
+    `user_ids`, or None for users unknown to the model, scored with one
+    batched dot product. `exclude` maps user ids to title ids to skip.
+    """
+    exclude = exclude or {}
+    user_ids = np.asarray(user_ids, dtype=np.int64)
+    known_ids, title_ids = model['user_ids'], model['title_ids']
+    rows = np.searchsorted(known_ids, user_ids)
+    known = rows < len(known_ids)
+    known[known] = known_ids[rows[known]] == user_ids[known]
+
+    scores = np.asarray(model['user_factors'][rows[known]]) \
+        @ np.asarray(model['title_factors']).T
+    results = []
+    known_scores = iter(scores)
+    for user_id, is_known in zip(user_ids.tolist(), known):
+        if not is_known:
+            results.append(None)
+            continue
+
+        user_scores = next(known_scores)
+        user_scores[np.isin(title_ids, list(exclude.get(user_id, ())))] = \
+            -np.inf
+        count = min(n, len(user_scores))
+        best = np.argpartition(-user_scores, count - 1)[:count] \
+            if count else np.zeros(0, dtype=np.int64)
+        best = best[np.argsort(-user_scores[best])]
+        best = best[np.isfinite(user_scores[best])]
+        results.append((title_ids[best].tolist(),
+                        user_scores[best].tolist()))
+    return results
@@ -0,0 +1,61 @@
+"""
+Filters for the watchlist endpoints
+"""
+import django_filters
+from rest_framework import filters
+
+from core.models import WatchListSummary
+from watchlist import platforms
+
+
+class NumberInFilter(django_filters.BaseInFilter,
+                     django_filters.NumberFilter):
+    """Comma separated numbers."""
+
+
+class WatchListSummaryFilter(django_filters.FilterSet):
+    """
+    `/api/watch/` filters, applied to the summary table. The range filters
+    are served by the partial indexes of `WatchListSummary`.
+    """
+    platform__name = django_filters.CharFilter(method='filter_platform_name')
+    platform__in = NumberInFilter(field_name='platform_id',
+                                  lookup_expr='in')
+
+    class Meta:
+        model = WatchListSummary
+        fields = {
+            'active': ['exact'],
+            'average_rating': ['gte', 'lte'],
+            'total_reviews': ['gte', 'lte'],
+            'created_at': ['gte', 'lt'],
+        }
+
+    def filter_queryset(self, queryset):
+        # Served from `all_objects`, only active titles unless asked for.
+        if self.form.cleaned_data.get('active') is None:
+            queryset = queryset.filter(active=True)
+        return super().filter_queryset(queryset)
+
+    def filter_platform_name(self, queryset, name, value):
+        """Filter on the ids of the platforms named `value`."""
+        return queryset.filter(platform_id__in=platforms.ids_for([value]))
+
+
+class AliasOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter accepting the public names in `ordering_fields` and
+    ordering by the fields they map to in the view's `ordering_aliases`.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        aliases = getattr(view, 'ordering_aliases', {})
+        if not ordering or not aliases:
+            return ordering
+
+        return [
+            ('-' if term.startswith('-') else '')
+            + aliases.get(term.lstrip('-'), term.lstrip('-'))
+            for term in ordering
+        ]
@@ -0,0 +1,80 @@
+"""
+In-process lookup of streaming platform ids by name.
+
+The platform table is small and rarely written, so every process keeps a
+map of platform names to ids, which turns name filters into an indexed
+``platform_id IN (...)`` and spares list pages a join for the names.
+Names are not unique, a name maps to all its platforms. Writes bump a
+version in the cache, and each process reloads its maps once it sees a
+newer version.
+
+A per process cache (the default LocMemCache) never carries the version
+of one process to another, so a lookup miss also reloads the maps, and
+they are reloaded after `MAX_AGE` seconds regardless, which bounds how
+long a platform renamed by another process keeps its old name here.
+"""
+import threading
+from collections import defaultdict
+from time import monotonic
+
+from django.core.cache import cache
+from django.db import transaction
+
+from core.models import StreamingPlatform
+
+
+VERSION_KEY = 'platforms:version'
+MAX_AGE = 60
+
+_lookup = {'version': None, 'loaded': None, 'ids': {}, 'names': {}}
+_lock = threading.Lock()
+
+
+def _current(reload=False):
+    """
+    Return the lookup maps, reloaded if a platform was written, if they
+    are older than `MAX_AGE` or if `reload` is set.
+    """
+    version = cache.get_or_set(VERSION_KEY, 0, timeout=None)
+    with _lock:
+        if (reload or _lookup['version'] != version
+                or monotonic() - _lookup['loaded'] > MAX_AGE):
+            ids, names = defaultdict(list), {}
+            for pk, name in StreamingPlatform.objects.values_list('pk',
+                                                                  'name'):
+                ids[name].append(pk)
+                names[pk] = name
+            _lookup.update(version=version, loaded=monotonic(),
+                           ids=dict(ids), names=names)
+        return dict(_lookup)
+
+
+def ids_for(names):
+    """Return the sorted ids of the platforms named any of `names`."""
+    lookup = _current()['ids']
+    if any(name not in lookup for name in names):
+        lookup = _current(reload=True)['ids']
+    return sorted({pk for name in names for pk in lookup.get(name, ())})
+
+
+def names(ids=()):
+    """Return the platform names by id, with all of `ids` if they exist."""
+    lookup = _current()['names']
+    if any(pk is not None and pk not in lookup for pk in ids):
+        lookup = _current(reload=True)['names']
+    return lookup
+
+
+def _bump():
+    cache.add(VERSION_KEY, 0, timeout=None)
+    cache.incr(VERSION_KEY)
+
+
+def invalidate():
+    """
+    Make every process reload its map. Bumped right away for this
+    transaction, and again on commit, as other processes may have loaded
+    the uncommitted state in between.
+    """
+    _bump()
+    transaction.on_commit(_bump)
@@ -0,0 +1,138 @@
+"""
+Read-only serializers building list responses from ``values_list`` rows.
+
+They skip model instances and DRF's per-field machinery on the GET list
+hot path. Their output must stay identical to the serializers in
+``watchlist.serializers``, which ``tests/test_read_serializers.py`` checks.
+"""
+from collections import defaultdict
+
+from rest_framework import serializers
+
+from core.metrics import serializing
+from core.models import Review, WatchList
+from watchlist import counters, platforms
+
+
+_datetime = serializers.DateTimeField().to_representation
+
+
+class ReviewReadSerializer:
+    """Read-only twin of `ReviewSerializer`."""
+    columns = ('id', 'rating', 'description', 'created_at', 'updated_at',
+               'active', 'user_id')
+
+    @classmethod
+    def rows(cls, queryset):
+        """Return `queryset` as rows of `columns`."""
+        return queryset.prefetch_related(None).values_list(*cls.columns)
+
+    @staticmethod
+    def to_representation(row):
+        pk, rating, description, created_at, updated_at, active, user = row
+        return {
+            'id': pk,
+            'rating': rating,
+            'description': description,
+            'created_at': _datetime(created_at),
+            'updated_at': _datetime(updated_at),
+            'active': active,
+            'user': user,
+        }
+
+    @classmethod
+    def many(cls, rows):
+        with serializing():
+            return [cls.to_representation(row) for row in rows]
+
+
+class WatchListReadSerializer:
+    """Read-only twin of `WatchListSerializer`, nested reviews included."""
+    columns = ('id', 'title', 'platform__name', 'description', 'active',
+               'created_at', 'average_rating', 'total_reviews', 'user_id',
+               'platform_id')
+
+    @classmethod
+    def rows(cls, queryset):
+        """Return `queryset` as rows of `columns`."""
+        return queryset.prefetch_related(None).values_list(*cls.columns)
+
+    @staticmethod
+    def reviews_for(ids):
+        """Return the serialized reviews of the titles `ids` by title id."""
+        reviews = defaultdict(list)
+        rows = Review.objects.filter(watchlist_id__in=ids).order_by(
+            'pk'
+        ).values_list('watchlist_id', *ReviewReadSerializer.columns)
+        for row in rows:
+            reviews[row[0]].append(
+                ReviewReadSerializer.to_representation(row[1:])
+            )
+        return reviews
+
+    @staticmethod
+    def to_representation(row, reviews):
+        (pk, title, platform_name, description, active, created_at,
+         average_rating, total_reviews, user, platform) = row
+        data = {
+            'id': pk,
+            'len_title': len(title),
+            'title': title,
+            'platform_name': platform_name,
+            'reviews': reviews,
+            'description': description,
+            'active': active,
+            'created_at': _datetime(created_at),
+            'average_rating': (None if average_rating is None
+                               else float(average_rating)),
+            'total_reviews': total_reviews,
+            'user': user,
+            'platform': platform,
+        }
+        if platform is None:
+            # `platform.name` cannot be resolved, DRF skips the field.
+            del data['platform_name']
+        return data
+
+    @classmethod
+    def many(cls, rows):
+        rows = list(rows)
+        reviews = cls.reviews_for([row[0] for row in rows])
+        with serializing():
+            data = [cls.to_representation(row, reviews.get(row[0], []))
+                    for row in rows]
+        return counters.overlay(data)
+
+
+class WatchListSummaryReadSerializer:
+    """
+    Lists titles from `WatchListSummary` rows, which only carry the ids of
+    the page, hydrated with `WatchListReadSerializer` in the page order.
+    """
+
+    @classmethod
+    def rows(cls, queryset):
+        """Return the title ids of the summary `queryset`."""
+        return queryset.values_list('watchlist_id', flat=True)
+
+    # Platform names come from the in-process platform lookup, not a join.
+    columns = tuple('platform_id' if column == 'platform__name' else column
+                    for column in WatchListReadSerializer.columns)
+    name_position = WatchListReadSerializer.columns.index('platform__name')
+
+    @classmethod
+    def many(cls, ids):
+        ids = list(ids)
+        position = cls.name_position
+        rows = list(WatchList.objects.filter(pk__in=ids).values_list(
+            *cls.columns
+        ))
+        names = platforms.names({row[position] for row in rows})
+        rows = {
+            row[0]: (row[:position] + (names.get(row[position]),)
+                     + row[position + 1:])
+            for row in rows
+        }
+        return WatchListReadSerializer.many(
+            [rows[pk] for pk in ids if pk in rows]
+        )
@@ -1,9 +1,13 @@
 """
 Serializers for WatchList API
 """
+from django.db import models
 from django.urls import reverse
 from rest_framework import serializers
+from core.metrics import TimedSerializerMixin, serializing
 from core.models import WatchList, StreamingPlatform, Review
+from watchlist import counters
+from watchlist.cache import get_many_reviews
 from profanity.extras import ProfanityFilter
 
 
@@ -16,15 +20,28 @@ def check_string_len(value):
                                           'the field is to short')
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class CachedReviewListSerializer(serializers.ListSerializer):
+    """Serializes lists of reviews through the review cache."""
+
+    def to_representation(self, data):
+        if isinstance(data, models.manager.BaseManager):
+            data = data.all()
+        with serializing():
+            return get_many_reviews(data, self.child.to_representation)
+
+
+class ReviewSerializer(TimedSerializerMixin,
+                       serializers.ModelSerializer):
     """Serializer for Review object"""
     class Meta:
         model = Review
         read_only_fields = ('id', 'user')
         exclude = ('watchlist',)
+        list_serializer_class = CachedReviewListSerializer
 
 
-class WatchListSerializer(serializers.ModelSerializer):
+class WatchListSerializer(TimedSerializerMixin,
+                          serializers.ModelSerializer):
     """Serializer for WatchList object"""
     len_title = serializers.SerializerMethodField()
     title = serializers.CharField(validators=[check_string_len],
@@ -58,6 +75,10 @@ class WatchListSerializer(serializers.ModelSerializer):
     #             watchlist.streaming_platforms.add(sp_object)
     #     return watchlist
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        return counters.overlay([data])[0]
+
     def get_len_title(self, obj):
         """"""
         return len(obj.title)
@@ -74,7 +95,8 @@ class WatchListSerializer(serializers.ModelSerializer):
         return data
 
 
-class StreamingPlatformSerializer(serializers.ModelSerializer):
+class StreamingPlatformSerializer(TimedSerializerMixin,
+                                  serializers.ModelSerializer):
     """Serializer for StreamingPlatform object"""
     watchlist = WatchListSerializer(many=True, read_only=True)
     watchlist_links = serializers.SerializerMethodField()
@@ -89,12 +111,19 @@ class StreamingPlatformSerializer(serializers.ModelSerializer):
         url_scheme = request.scheme
         hostname = request.get_host()
 
-        if obj.watchlist.exists():
-            return [
-                '{}://{}{}'.format(url_scheme,
-                                   hostname,
-                                   reverse("watch:watchlist-detail",
-                                           kwargs={"pk": watch.pk}))
-                for watch in obj.watchlist.all()
-            ]
-        return []
+        return [
+            '{}://{}{}'.format(url_scheme,
+                               hostname,
+                               reverse("watch:watchlist-detail",
+                                       kwargs={"pk": watch.pk}))
+            for watch in obj.watchlist.all()
+        ]
+
+
+class SimilarTitleSerializer(serializers.Serializer):
+    """Serializer for a title similar to another one"""
+    id = serializers.IntegerField(source='similar_id')
+    title = serializers.CharField(source='similar.title')
+    average_rating = serializers.FloatField(source='similar.average_rating')
+    total_reviews = serializers.IntegerField(source='similar.total_reviews')
+    score = serializers.FloatField()
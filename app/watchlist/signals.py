@@ -1,32 +1,94 @@
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from core.models import Review
-from django.db.models import Avg
+from core.models import (DeletedReview, Review, StreamingPlatform,
+                         WatchList, WatchListSummary)
+from core.tasks import enqueue
+from watchlist import autocomplete, counters, platforms
+from watchlist.cache import delete_review
+from watchlist.tasks import RECOMPUTE_TITLES
 
 
 @receiver(post_save, sender=Review)
-def update_watchlist_on_review_save(sender, instance, **kwargs):
+def update_watchlist_on_review_save(sender, instance, created=False,
+                                    **kwargs):
     """Update total_reviews and average_rating on Review save."""
-    watchlist = instance.watchlist
-    reviews = watchlist.reviews.all()
-    total_reviews = reviews.count()
-    average_rating = (reviews.aggregate(avg_rating=Avg('rating'))['avg_rating']
-                      or 0)
+    delete_review(instance)
+    if counters.enabled() and counters.record_save(instance, created):
+        return
 
-    watchlist.total_reviews = total_reviews
-    watchlist.average_rating = average_rating
-    watchlist.save()
+    enqueue(RECOMPUTE_TITLES, {'watchlist_ids': [instance.watchlist_id]})
+
+
+def _recompute_after_delete(origin, watchlist_id):
+    """
+    Recompute a title once the delete of `origin` commits, for reviews
+    deleted by a cascade. Titles deleted by the same cascade are gone by
+    then and skipped; saving them here would recreate their summary.
+    """
+    titles = getattr(origin, '_touched_titles', None)
+    if titles is None:
+        titles = origin._touched_titles = set()
+        transaction.on_commit(lambda: enqueue(
+            RECOMPUTE_TITLES, {'watchlist_ids': sorted(titles)}
+        ))
+    titles.add(watchlist_id)
 
 
 @receiver(post_delete, sender=Review)
-def update_watchlist_on_review_delete(sender, instance, **kwargs):
+def update_watchlist_on_review_delete(sender, instance, origin=None,
+                                      **kwargs):
     """Update total_reviews and average_rating on Review delete."""
-    watchlist = instance.watchlist
-    reviews = watchlist.reviews.all()
-    total_reviews = reviews.count()
-    average_rating = (reviews.aggregate(avg_rating=Avg('rating'))['avg_rating']
-                      or 0)
-
-    watchlist.total_reviews = total_reviews
-    watchlist.average_rating = average_rating
-    watchlist.save()
+    delete_review(instance)
+    if origin is not None and not isinstance(origin, Review):
+        _recompute_after_delete(origin, instance.watchlist_id)
+        return
+
+    if counters.enabled():
+        counters.record_delete(instance)
+        return
+
+    enqueue(RECOMPUTE_TITLES, {'watchlist_ids': [instance.watchlist_id]})
+
+
+@receiver(post_delete, sender=Review)
+def log_deleted_review(sender, instance, **kwargs):
+    """Log a deleted active Review for the similar titles refresh."""
+    if instance.active:
+        DeletedReview.objects.create(user_id=instance.user_id,
+                                     watchlist_id=instance.watchlist_id)
+
+
+@receiver(post_save, sender=WatchList)
+def sync_summary_on_watchlist_save(sender, instance, raw=False, **kwargs):
+    """Create or update the WatchListSummary row of a saved WatchList."""
+    if raw:
+        return
+
+    WatchList.objects.filter(pk=instance.pk).refresh_summaries()
+    autocomplete.title_saved(instance)
+
+
+@receiver(post_delete, sender=WatchList)
+def drop_deleted_title(sender, instance, **kwargs):
+    """Drop a deleted WatchList from the title autocomplete."""
+    autocomplete.title_deleted(instance)
+
+
+@receiver(post_save, sender=StreamingPlatform)
+def sync_summaries_on_platform_save(sender, instance, created, raw=False,
+                                    **kwargs):
+    """Copy a renamed StreamingPlatform name to the WatchListSummary rows."""
+    platforms.invalidate()
+    if created or raw:
+        return
+
+    WatchListSummary.all_objects.filter(
+        watchlist__platform=instance
+    ).exclude(platform_name=instance.name).update(platform_name=instance.name)
+
+
+@receiver(post_delete, sender=StreamingPlatform)
+def invalidate_platforms_on_delete(sender, instance, **kwargs):
+    """Drop a deleted StreamingPlatform from the platform lookups."""
+    platforms.invalidate()
@@ -0,0 +1,153 @@
+"""
+Item-item similarity of titles computed from the review ratings.
+
+Titles are columns of a sparse user x title rating matrix. Two titles are
+similar when the cosine of their rating columns is high, i.e. the same
+users reviewed both and rated them alike. The `top_k` most similar titles
+of each title are stored as `SimilarTitle` rows, so serving them is a
+single indexed lookup.
+"""
+import numpy as np
+from scipy import sparse
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from core.models import DeletedReview, Review, SimilarTitle
+
+
+# Dense similarity cells computed at once, bounds the memory per chunk.
+CHUNK_CELLS = 2 ** 24
+BATCH_SIZE = 5000
+
+
+def review_matrix():
+    """
+    Return the user x title rating matrix of all reviews as CSR, with the
+    sorted user ids of its rows and title ids of its columns.
+    """
+    rows = Review.objects.values_list('user_id', 'watchlist_id', 'rating')
+    data = np.fromiter(
+        (value for row in rows.iterator(chunk_size=10000) for value in row),
+        dtype=np.int64
+    ).reshape(-1, 3)
+
+    user_ids, users = np.unique(data[:, 0], return_inverse=True)
+    title_ids, titles = np.unique(data[:, 1], return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (data[:, 2].astype(np.float32), (users, titles)),
+        shape=(len(user_ids), len(title_ids))
+    )
+    return matrix, user_ids, title_ids
+
+
+def rating_matrix():
+    """
+    Return the L2 normalized user x title rating matrix, and the title
+    ids of its columns.
+    """
+    matrix, _, title_ids = review_matrix()
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0))).ravel()
+    norms[norms == 0] = 1
+    return (matrix @ sparse.diags(1 / norms)).tocsc(), title_ids
+
+
+def top_similar(matrix, columns, top_k):
+    """
+    Yield `(column, neighbour columns, scores)` for the given `columns`,
+    best first, computed `CHUNK_CELLS` similarities at a time.
+    """
+    chunk_size = max(1, CHUNK_CELLS // max(matrix.shape[1], 1))
+    transposed = matrix.T.tocsr()
+    top_k = min(top_k, matrix.shape[1] - 1)
+    if top_k < 1:
+        return
+
+    for start in range(0, len(columns), chunk_size):
+        chunk = columns[start:start + chunk_size]
+        scores = (transposed[chunk] @ matrix).toarray()
+        scores[np.arange(len(chunk)), chunk] = 0
+
+        best = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+
+        for column, neighbours, values in zip(chunk, best, best_scores):
+            keep = values > 0
+            yield column, neighbours[keep], values[keep]
+
+
+def build(top_k=20, title_ids=None):
+    """
+    Store the `top_k` most similar titles of `title_ids`, of every
+    reviewed title by default. Return the number of titles written.
+    """
+    started = timezone.now()
+    matrix, column_ids = rating_matrix()
+    if title_ids is None:
+        columns = np.arange(len(column_ids))
+    else:
+        columns = np.flatnonzero(np.isin(column_ids, list(title_ids)))
+
+    titles, rows = [], []
+    for column, neighbours, scores in top_similar(matrix, columns, top_k):
+        pk = int(column_ids[column])
+        titles.append(pk)
+        rows.extend(
+            SimilarTitle(watchlist_id=pk,
+                         similar_id=int(column_ids[neighbour]),
+                         score=float(score))
+            for neighbour, score in zip(neighbours, scores)
+        )
+        if len(rows) >= BATCH_SIZE:
+            _store(titles, rows)
+            titles, rows = [], []
+    _store(titles, rows)
+
+    # Titles without reviews have no similar titles.
+    unreviewed = SimilarTitle.objects.exclude(Exists(
+        Review.objects.filter(watchlist_id=OuterRef('watchlist_id'))
+    ))
+    if title_ids is not None:
+        unreviewed = unreviewed.filter(watchlist_id__in=title_ids)
+    unreviewed.delete()
+    if title_ids is None:
+        # Deletions before a full build are counted in it.
+        DeletedReview.objects.filter(deleted_at__lt=started).delete()
+    return len(columns)
+
+
+def _store(titles, rows):
+    """Replace the similar titles of `titles` with `rows`."""
+    with transaction.atomic():
+        SimilarTitle.objects.filter(watchlist_id__in=titles).delete()
+        SimilarTitle.objects.bulk_create(rows)
+
+
+def changed_titles(since):
+    """
+    Return the ids of the titles whose similar titles may have changed
+    since `since`: the titles with reviews saved or deleted since then,
+    and every title reviewed by a user who reviewed one of them, since
+    their similarity with the changed titles moved.
+    """
+    # Deactivated reviews leave the matrix, they are changes too.
+    reviews = Review.all_objects.filter(updated_at__gte=since)
+    changed = set(reviews.values_list('watchlist_id', flat=True).distinct())
+    users = set(reviews.values_list('user_id', flat=True).distinct())
+    for user, title in DeletedReview.objects.filter(
+        deleted_at__gte=since
+    ).values_list('user_id', 'watchlist_id'):
+        users.add(user)
+        changed.add(title)
+
+    users.update(Review.objects.filter(
+        watchlist_id__in=changed
+    ).values_list('user_id', flat=True).distinct())
+    changed.update(Review.objects.filter(
+        user_id__in=users
+    ).values_list('watchlist_id', flat=True).distinct())
+    return changed
@@ -0,0 +1,15 @@
+"""
+Background tasks of the watchlist app
+"""
+from core.deletion import recompute_titles
+from core.tasks import task
+
+
+RECOMPUTE_TITLES = 'watchlist.recompute_titles'
+
+
+@task(RECOMPUTE_TITLES)
+def recompute(payloads):
+    """Recompute the aggregates of the titles of all payloads at once."""
+    recompute_titles({pk for payload in payloads
+                      for pk in payload['watchlist_ids']})
@@ -0,0 +1,103 @@
+"""
+Tests for the title autocomplete
+"""
+from django.contrib.auth import get_user_model
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import WatchList
+from watchlist import autocomplete
+
+
+AUTOCOMPLETE_URL = reverse('watch:watchlist-autocomplete')
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+class AutocompleteApiTests(TestCase):
+    """Test the prefix index behind the autocomplete endpoint."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com',
+                                password='testpass123')
+        self.titles = {
+            title: WatchList.objects.create(user=self.user, title=title,
+                                            description='Desc')
+            for title in ('Heat', 'heathers', 'Alien', 'Heavy')
+        }
+
+    def suggest(self, query):
+        res = self.client.get(AUTOCOMPLETE_URL, {'q': query})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [item['title'] for item in res.data]
+
+    def test_prefix_matches(self):
+        """Test titles starting with the query match, ignoring case."""
+        self.assertEqual(self.suggest('HEA'), ['Heat', 'heathers', 'Heavy'])
+        self.assertEqual(self.suggest('heat'), ['Heat', 'heathers'])
+        self.assertEqual(self.suggest(' '), [])
+
+    def test_limited(self):
+        """Test at most ten titles are suggested."""
+        for i in range(12):
+            WatchList.objects.create(user=self.user, title='Up {}'.format(i),
+                                     description='Desc')
+
+        self.assertEqual(len(self.suggest('up')), 10)
+
+    def test_updated_on_writes(self):
+        """Test renamed, deactivated and deleted titles are updated."""
+        self.suggest('a')
+        with self.captureOnCommitCallbacks(execute=True):
+            heat = self.titles['Heat']
+            heat.title = 'Aliens'
+            heat.save()
+            self.titles['Heavy'].active = False
+            self.titles['Heavy'].save()
+            self.titles['heathers'].delete()
+
+        self.assertEqual(self.suggest('alien'), ['Alien', 'Aliens'])
+        self.assertEqual(self.suggest('hea'), [])
+
+    @skipUnless(connection.vendor != 'postgresql', 'In-memory index.')
+    def test_changes_replayed(self):
+        """Test changes logged by any process are applied as deltas."""
+        self.suggest('a')
+        version = cache.get(autocomplete.VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            heat = WatchList.objects.get(pk=self.titles['Heat'].pk)
+            heat.description = 'Other'
+            heat.save()
+        self.assertEqual(cache.get(autocomplete.VERSION_KEY), version)
+
+        # A rename logged by another process.
+        autocomplete._changed(heat.pk, 'Aliens')
+        with self.assertNumQueries(0):
+            self.assertEqual(autocomplete.search('alien'),
+                             [{'id': self.titles['Alien'].pk,
+                               'title': 'Alien'},
+                              {'id': heat.pk, 'title': 'Aliens'}])
+
+    @skipUnless(connection.vendor == 'postgresql', 'Needs PostgreSQL.')
+    def test_prefix_before_substring(self):
+        """Test prefix matches come first, then the shortest others."""
+        for title in ('Theatre', 'The Heat', 'Overheated'):
+            WatchList.objects.create(user=self.user, title=title,
+                                     description='Desc')
+
+        self.assertEqual(self.suggest('heat'),
+                         ['Heat', 'heathers', 'Theatre', 'The Heat',
+                          'Overheated'])
+        self.assertEqual(self.suggest('he'), ['Heat', 'heathers', 'Heavy'])
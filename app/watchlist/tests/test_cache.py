@@ -0,0 +1,84 @@
+"""
+Tests for the review cache
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.models import WatchList, Review
+
+from watchlist.cache import review_key
+from watchlist.serializers import ReviewSerializer, WatchListSerializer
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+class ReviewCacheTests(TestCase):
+    """Test serialized reviews are cached and invalidated."""
+
+    def setUp(self):
+        cache.clear()
+        user = create_user(email='user@example.com', password='testpass123')
+        self.watchlist = WatchList.objects.create(user=user, title='Heat',
+                                                  description='Desc')
+        for rating in (3, 4):
+            Review.objects.create(user=user, watchlist=self.watchlist,
+                                  rating=rating, description='Review')
+
+    def serialize(self):
+        return ReviewSerializer(Review.objects.order_by('id'),
+                                many=True).data
+
+    def test_hits_skip_serialization(self):
+        """Test a second listing is served from the cache."""
+        expected = self.serialize()
+
+        with patch.object(ReviewSerializer, 'to_representation') as mock:
+            data = self.serialize()
+
+        mock.assert_not_called()
+        self.assertEqual(data, expected)
+
+    def test_single_round_trip(self):
+        """Test a list of reviews is looked up with one cache call."""
+        with patch('watchlist.cache.cache.get_many',
+                   return_value={}) as get_many:
+            self.serialize()
+
+        get_many.assert_called_once()
+        self.assertEqual(len(get_many.call_args[0][0]), 2)
+
+    def test_edited_review_not_stale(self):
+        """Test an edited review is serialized again."""
+        self.serialize()
+        review = Review.objects.order_by('id').first()
+        review.rating = 1
+        review.save()
+
+        self.assertEqual(self.serialize()[0]['rating'], 1)
+
+    def test_deleted_review_dropped(self):
+        """Test deleting a review drops its cache entry."""
+        self.serialize()
+        review = Review.objects.order_by('id').first()
+        key = review_key(review.pk, review.updated_at)
+        self.assertIsNotNone(cache.get(key))
+
+        review.delete()
+
+        self.assertIsNone(cache.get(key))
+
+    def test_nested_reviews_cached(self):
+        """Test reviews nested in watchlists use the cache."""
+        expected = WatchListSerializer(self.watchlist).data
+
+        with patch.object(ReviewSerializer, 'to_representation') as mock:
+            data = WatchListSerializer(self.watchlist).data
+
+        mock.assert_not_called()
+        self.assertEqual(data['reviews'], expected['reviews'])
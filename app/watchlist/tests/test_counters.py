@@ -0,0 +1,113 @@
+"""
+Tests for the cached rating counters
+"""
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.deletion import bulk_delete
+from core.models import WatchList, Review
+
+
+WATCHLIST_URL = reverse('watch:watchlist-list')
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+@override_settings(RATING_COUNTERS={'ENABLED': True, 'FLUSH_EVERY': 100})
+class RatingCounterTests(TestCase):
+    """Test review writes are counted in the cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.users = [create_user(email='user{}@example.com'.format(i),
+                                  password='testpass123') for i in range(3)]
+        self.watchlist = WatchList.objects.create(user=self.users[0],
+                                                  title='Heat',
+                                                  description='Desc')
+
+    def review(self, user, rating):
+        return Review.objects.create(user=user, watchlist=self.watchlist,
+                                     rating=rating, description='Review')
+
+    def listed(self):
+        res = self.client.get(WATCHLIST_URL)
+        item = res.data['results'][0]
+        return item['total_reviews'], item['average_rating']
+
+    def test_writes_skip_the_row(self):
+        """Test reviews leave the title row alone but show on reads."""
+        self.review(self.users[0], 2)
+        review = self.review(self.users[1], 5)
+        review = Review.objects.get(pk=review.pk)
+        review.rating = 3
+        review.save()
+
+        self.watchlist.refresh_from_db()
+        self.assertEqual(self.watchlist.total_reviews, 0)
+        self.assertEqual(self.listed(), (2, 2.5))
+
+        review.delete()
+        self.assertEqual(self.listed(), (1, 2.0))
+
+    def test_deactivation_counted(self):
+        """Test deactivating and restoring a review moves the counts."""
+        self.review(self.users[0], 2)
+        review = self.review(self.users[1], 4)
+        review = Review.objects.get(pk=review.pk)
+
+        review.active = False
+        review.save()
+        self.assertEqual(self.listed(), (1, 2.0))
+
+        review.active = True
+        review.rating = 5
+        review.save()
+        self.assertEqual(self.listed(), (2, 3.5))
+
+    def test_flush_command_exact(self):
+        """Test the flush command writes the exact aggregates."""
+        self.review(self.users[0], 2)
+        self.review(self.users[1], 4)
+
+        call_command('flush_rating_counters', stdout=StringIO())
+
+        self.watchlist.refresh_from_db()
+        self.assertEqual(self.watchlist.total_reviews, 2)
+        self.assertEqual(self.watchlist.average_rating, 3)
+        self.assertEqual(self.watchlist.summary.total_reviews, 2)
+        self.assertEqual(self.listed(), (2, 3))
+
+    @override_settings(RATING_COUNTERS={'ENABLED': True, 'FLUSH_EVERY': 2})
+    def test_flush_at_threshold(self):
+        """Test a title is written back once it collects enough events."""
+        self.review(self.users[0], 1)
+        self.review(self.users[1], 5)
+        self.review(self.users[2], 3)
+
+        self.watchlist.refresh_from_db()
+        self.assertEqual(self.watchlist.total_reviews, 2)
+        self.assertEqual(self.listed(), (3, 3))
+
+    def test_cascade_drops_deltas(self):
+        """Test reviews deleted with their author leave no deltas."""
+        self.review(self.users[0], 2)
+        self.review(self.users[1], 4)
+        self.review(self.users[2], 5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.users[1].delete()
+        self.assertEqual(self.listed(), (2, 3.5))
+
+        bulk_delete(get_user_model().objects.filter(pk=self.users[2].pk))
+        self.assertEqual(self.listed(), (1, 2.0))
@@ -0,0 +1,90 @@
+"""
+Tests for the read-only list serializers
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+from django.test import TestCase
+
+from core.models import WatchList, StreamingPlatform, Review
+
+from watchlist.read_serializers import (WatchListReadSerializer,
+                                        ReviewReadSerializer)
+from watchlist.serializers import WatchListSerializer, ReviewSerializer
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+def as_items(data):
+    """Return `data` as nested item lists, so key order is compared too."""
+    if isinstance(data, dict):
+        return [(key, as_items(value)) for key, value in data.items()]
+    if isinstance(data, list):
+        return [as_items(value) for value in data]
+    return data
+
+
+class ReadSerializerParityTests(TestCase):
+    """Test the read serializers match the model serializers."""
+
+    def setUp(self):
+        self.user = create_user(email='user@example.com',
+                                password='testpass123')
+        other = create_user(email='other@example.com',
+                            password='testpass123')
+        platform = StreamingPlatform.objects.create(
+            user=self.user, name='Netflix', about='About',
+            website='http://www.netflix.com'
+        )
+        reviewed = WatchList.objects.create(
+            user=self.user, title='Amélie', description='Desc',
+            platform=platform
+        )
+        WatchList.objects.create(user=self.user, title='No reviews',
+                                 description='Desc', platform=platform,
+                                 active=False)
+        unlisted = WatchList.objects.create(user=self.user,
+                                            title='No platform',
+                                            description='Desc')
+        Review.objects.create(user=other, watchlist=unlisted, rating=1,
+                              description='Hidden', active=False)
+        for user, rating in ((self.user, 5), (other, 2)):
+            Review.objects.create(user=user, watchlist=reviewed,
+                                  rating=rating, description='Review')
+        WatchList.objects.filter(pk=reviewed.pk).update(average_rating=3.5,
+                                                        total_reviews=2)
+
+    def test_watchlist_parity(self):
+        """Test titles serialize identically, nested reviews included."""
+        queryset = WatchList.objects.order_by('id')
+        expected = WatchListSerializer(
+            queryset.prefetch_related(Prefetch(
+                'reviews', queryset=Review.objects.order_by('pk')
+            )), many=True
+        ).data
+
+        data = WatchListReadSerializer.many(
+            WatchListReadSerializer.rows(queryset)
+        )
+
+        self.assertEqual(as_items(data), as_items(expected))
+        self.assertNotIn('platform_name', data[2])
+        self.assertEqual(data[2]['reviews'], [])
+
+    def test_review_parity(self):
+        """Test reviews serialize identically."""
+        queryset = Review.objects.order_by('id')
+        expected = ReviewSerializer(queryset, many=True).data
+
+        data = ReviewReadSerializer.many(ReviewReadSerializer.rows(queryset))
+
+        self.assertEqual(as_items(data), as_items(expected))
+
+    def test_watchlist_single_reviews_query(self):
+        """Test a page of titles fetches its reviews in one query."""
+        rows = list(WatchListReadSerializer.rows(WatchList.objects.all()))
+
+        with self.assertNumQueries(1):
+            WatchListReadSerializer.many(rows)
@@ -1,14 +1,20 @@
 """
 Tests for the streaming platform API
 """
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.urls import reverse
-from django.test import TestCase, RequestFactory
+from django.test import TestCase, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from core.models import Review, WatchList, StreamingPlatform
+from core.testing import QueryInspectorMixin
 from watchlist.serializers import ReviewSerializer
 
 
@@ -88,7 +94,7 @@ class ReviewPublicAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class ReviewPrivateAPITests(TestCase):
+class ReviewPrivateAPITests(QueryInspectorMixin, TestCase):
     """Test the private API"""
     def setUp(self):
         self.client = APIClient()
@@ -112,12 +118,75 @@ class ReviewPrivateAPITests(TestCase):
 
         # Verify pagination and data
         reviews = Review.objects.filter(watchlist=watchlist).order_by(
-            '-created_at'
+            '-created_at', '-id'
         )
         serializer = ReviewSerializer(reviews, many=True)
 
         self.assertEqual(res.data['results'], serializer.data)
-        self.assertEqual(res.data['count'], reviews.count())
+        self.assertIsNone(res.data['next'])
+
+    @override_settings(REVIEW_PARTITIONING=True)
+    def test_list_reviews_by_month_windows(self):
+        """Test pages are read from created_at windows, newest first"""
+        watchlist = create_watchlist(self.user)
+        now = timezone.now()
+        expected = []
+        for days in (0, 10, 40, 100, 200, 400, 900):
+            review = create_review(user=self.user, watchlist=watchlist)
+            Review.all_objects.filter(pk=review.pk).update(
+                created_at=now - timedelta(days=days)
+            )
+            expected.append(review.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(REVIEW_URL(watchlist.id), {'page_size': 2})
+        self.assertIn('"created_at" >=', queries[0]['sql'])
+        self.assertIn('"created_at" >=', queries[-1]['sql'])
+
+        ids = []
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids.extend(item['id'] for item in res.data['results'])
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+        self.assertEqual(ids, expected)
+
+    def test_list_reviews_no_duplicate_queries(self):
+        """Test listing reviews does not query per review"""
+        watchlist = create_watchlist(self.user)
+        for _ in range(3):
+            create_review(user=self.user, watchlist=watchlist)
+
+        with self.assertNoDuplicateQueries():
+            res = self.client.get(REVIEW_URL(watchlist.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_inactive_reviews(self):
+        """Test inactive reviews are unlisted but reachable by authors"""
+        author = create_user(email='author@test.com', password='testpass123')
+        watchlist = create_watchlist(self.user)
+        review = create_review(user=author, watchlist=watchlist,
+                               active=False)
+
+        res = self.client.get(REVIEW_URL(watchlist.id))
+        self.assertEqual(res.data['results'], [])
+        res = self.client.get(detail_url(watchlist.id, review.id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        client = APIClient()
+        client.force_authenticate(author)
+        res = client.get(detail_url(watchlist.id, review.id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = client.post(REVIEW_URL(watchlist.id),
+                          {'rating': 4, 'description': 'Again'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        client.force_authenticate(create_user(email='other@test.com',
+                                              password='testpass123'))
+        res = client.get(detail_url(watchlist.id, review.id))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_create_second_review_existing_user(self):
         """Test creating a second review with an existing user"""
@@ -0,0 +1,136 @@
+"""
+Tests for the similar titles
+"""
+from datetime import timedelta
+from io import StringIO
+
+import numpy as np
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import WatchList, Review, SimilarTitle
+from watchlist import similarity
+
+
+def similar_url(watch_id):
+    return reverse('watch:watchlist-similar', args=[watch_id])
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+class SimilarTitlesTests(TestCase):
+    """Test computing and serving similar titles."""
+
+    # Ratings of four users (rows) for four titles (columns), 0 = none.
+    RATINGS = [
+        [5, 5, 0, 1],
+        [4, 4, 1, 0],
+        [5, 4, 0, 0],
+        [0, 0, 5, 0],
+    ]
+
+    def setUp(self):
+        self.client = APIClient()
+        users = [create_user(email='user{}@example.com'.format(i),
+                             password='testpass123')
+                 for i in range(len(self.RATINGS))]
+        self.titles = [
+            WatchList.objects.create(user=users[0],
+                                     title='Title {}'.format(i),
+                                     description='Desc')
+            for i in range(len(self.RATINGS[0]))
+        ]
+        for user, ratings in zip(users, self.RATINGS):
+            for title, rating in zip(self.titles, ratings):
+                if rating:
+                    Review.objects.create(user=user, watchlist=title,
+                                          rating=rating, description='Review')
+
+    def test_matches_dense_cosine(self):
+        """Test stored scores are the cosine of the rating columns."""
+        call_command('build_similar_titles', '--top-k=2', stdout=StringIO())
+
+        ratings = np.array(self.RATINGS, dtype=float)
+        unit = ratings / np.linalg.norm(ratings, axis=0)
+        cosine = unit.T @ unit
+        for row in SimilarTitle.objects.all():
+            i = self.titles.index(row.watchlist)
+            j = self.titles.index(row.similar)
+            self.assertAlmostEqual(row.score, cosine[i, j], places=5)
+        self.assertEqual(
+            SimilarTitle.objects.filter(watchlist=self.titles[0]).count(), 2
+        )
+
+    def test_similar_endpoint(self):
+        """Test the endpoint lists neighbours best first."""
+        similarity.build(top_k=3)
+
+        res = self.client.get(similar_url(self.titles[0].pk))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]['id'], self.titles[1].pk)
+        self.assertEqual(res.data[0]['title'], 'Title 1')
+        self.assertEqual([item['score'] for item in res.data],
+                         sorted((item['score'] for item in res.data),
+                                reverse=True))
+
+    def test_similar_endpoint_not_found(self):
+        """Test unknown titles return a 404."""
+        res = self.client.get(similar_url(0))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_incremental_refresh(self):
+        """Test --since only refreshes recently reviewed titles."""
+        similarity.build(top_k=3)
+        SimilarTitle.objects.filter(watchlist=self.titles[0]).update(score=0)
+        since = timezone.now() + timedelta(seconds=1)
+
+        call_command('build_similar_titles', '--since', since.isoformat(),
+                     stdout=StringIO())
+        self.assertFalse(SimilarTitle.objects.filter(
+            watchlist=self.titles[0], score__gt=0).exists())
+
+        since = timezone.now()
+        Review.objects.filter(watchlist=self.titles[0]).first().save()
+        call_command('build_similar_titles', '--since', since.isoformat(),
+                     stdout=StringIO())
+        self.assertTrue(SimilarTitle.objects.filter(
+            watchlist=self.titles[0], score__gt=0).exists())
+
+    def similar(self, title):
+        return set(SimilarTitle.objects.filter(
+            watchlist=self.titles[title]
+        ).values_list('similar_id', flat=True))
+
+    def test_incremental_refresh_neighbours(self):
+        """Test --since refreshes titles sharing a reviewer with a change."""
+        similarity.build(top_k=3)
+        self.assertEqual(self.similar(2),
+                         {self.titles[0].pk, self.titles[1].pk})
+
+        # Only the fourth user reviewed title 2, who now reviews title 3.
+        since = timezone.now()
+        user = get_user_model().objects.get(email='user3@example.com')
+        Review.objects.create(user=user, watchlist=self.titles[3],
+                              rating=5, description='Review')
+        call_command('build_similar_titles', '--since', since.isoformat(),
+                     stdout=StringIO())
+        self.assertIn(self.titles[3].pk, self.similar(2))
+
+        since = timezone.now()
+        Review.objects.get(user__email='user1@example.com',
+                           watchlist=self.titles[2]).delete()
+        call_command('build_similar_titles', '--since', since.isoformat(),
+                     stdout=StringIO())
+        self.assertEqual(self.similar(2), {self.titles[3].pk})
@@ -9,7 +9,8 @@ from django.test import TestCase
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from core.models import StreamingPlatform
+from core.models import StreamingPlatform, WatchList
+from core.testing import QueryInspectorMixin
 from watchlist.serializers import StreamingPlatformSerializer
 
 from django.test import RequestFactory
@@ -55,7 +56,7 @@ class StreamingPlatformPublicAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class StreamingPlatformPrivateAPITests(TestCase):
+class StreamingPlatformPrivateAPITests(QueryInspectorMixin, TestCase):
     """Test the private API"""
     def setUp(self):
         self.client = APIClient()
@@ -80,6 +81,20 @@ class StreamingPlatformPrivateAPITests(TestCase):
         )
         self.assertEqual(res.data['results'], serializer.data)
 
+    def test_list_streaming_platform_no_duplicate_queries(self):
+        """Test listing SPs does not query per platform or title"""
+        for i in range(3):
+            sp = create_streaming_platform(self.user)
+            for j in range(2):
+                WatchList.objects.create(user=self.user, platform=sp,
+                                         title='Title', description='Desc')
+
+        with self.assertNoDuplicateQueries():
+            res = self.client.get(SP_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results'][0]['watchlist_links']), 2)
+
     def test_create_streaming_platform(self):
         """Test create SP"""
         payload = {
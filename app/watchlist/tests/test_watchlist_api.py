@@ -3,16 +3,20 @@ Tests for watchlist endpoints
 """
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from core.models import WatchList, StreamingPlatform
+from core.models import WatchList, StreamingPlatform, Review
+from core.testing import QueryInspectorMixin
 
+from watchlist import platforms
 from watchlist.serializers import WatchListSerializer
 
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 
 WATCHLIST_URL = reverse('watch:watchlist-list')
@@ -65,7 +69,7 @@ class PublicWatchlistApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivateWatchlistApiTests(TestCase):
+class PrivateWatchlistApiTests(QueryInspectorMixin, TestCase):
     """Test authenticated recipe API requests."""
 
     def setUp(self):
@@ -88,6 +92,19 @@ class PrivateWatchlistApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data.get('results'), serializer.data)
 
+    def test_list_watchlist_no_duplicate_queries(self):
+        """Test listing watchlists does not query per row"""
+        for i in range(3):
+            watchlist = create_watchlist(self.user)
+            Review.objects.create(user=self.user, watchlist=watchlist,
+                                  rating=4, description='Test review')
+
+        with self.assertNoDuplicateQueries():
+            res = self.client.get(WATCHLIST_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data.get('results')), 3)
+
     def test_view_movie_detail(self):
         """Test viewing a wathlist detail"""
         watchlist = create_watchlist(self.user)
@@ -97,6 +114,35 @@ class PrivateWatchlistApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
+    def test_batch_ids(self):
+        """Test ?ids= returns the details in the requested order"""
+        watchlists = [create_watchlist(self.user, title='Title {}'.format(i))
+                      for i in range(3)]
+        Review.objects.create(user=self.user, watchlist=watchlists[2],
+                              rating=4, description='Test review')
+        ids = [watchlists[2].id, 0, watchlists[0].id, watchlists[2].id]
+        platforms.names()
+
+        with self.assertNumQueries(2):
+            res = self.client.get(WATCHLIST_URL,
+                                  {'ids': ','.join(map(str, ids))})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [
+            self.client.get(detail_url(watchlists[2].id)).data,
+            self.client.get(detail_url(watchlists[0].id)).data,
+        ])
+
+    def test_batch_ids_invalid(self):
+        """Test invalid or too many ids are rejected"""
+        res = self.client.get(WATCHLIST_URL, {'ids': '1,x'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.get(WATCHLIST_URL, {
+            'ids': ','.join(map(str, range(1, 102)))
+        })
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_create_watchlist(self):
         """Test creating a new watchlist"""
         sp_object = StreamingPlatform.objects.create(
@@ -160,6 +206,124 @@ class PrivateWatchlistApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data.get('results')), 1)
 
+    def test_filter_and_order_by_platform_name(self):
+        """Test platform filters and ordering run on the summary table"""
+        create_watchlist(self.user, title='Heat')
+        netflix = create_watchlist(self.user, title='Alien').platform
+        netflix.name = 'Netflix'
+        netflix.save()
+
+        res = self.client.get(WATCHLIST_URL, {'platform__name': 'Netflix'})
+        self.assertEqual([item['title'] for item in res.data['results']],
+                         ['Alien'])
+        self.assertEqual(res.data['results'][0]['platform_name'], 'Netflix')
+
+        res = self.client.get(WATCHLIST_URL, {'ordering': '-platform__name'})
+        self.assertEqual([item['title'] for item in res.data['results']],
+                         ['Heat', 'Alien'])
+
+    def test_platform_name_lookup_cached(self):
+        """Test platform names are looked up in process until renamed"""
+        heat = create_watchlist(self.user, title='Heat')
+        create_watchlist(self.user, title='Alien')
+        create_watchlist(self.user, title='Up')
+        self.client.get(WATCHLIST_URL, {'platform__name': 'Netflix'})
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(WATCHLIST_URL,
+                                  {'platform__name': 'Test SP'})
+
+        self.assertEqual([item['title'] for item in res.data['results']],
+                         ['Alien', 'Heat', 'Up'])
+        self.assertFalse([query for query in queries
+                          if 'core_streamingplatform' in query['sql']])
+
+        res = self.client.patch(
+            reverse('watch:streaming-detail', args=[heat.platform_id]),
+            {'name': 'Netflix'}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.get(WATCHLIST_URL, {'platform__name': 'Netflix'})
+        self.assertEqual([item['title'] for item in res.data['results']],
+                         ['Heat'])
+
+    def test_platform_written_by_another_process(self):
+        """Test platforms written without a version bump are looked up"""
+        heat = create_watchlist(self.user, title='Heat')
+        self.client.get(WATCHLIST_URL)
+
+        # Another process bumps the version in its own cache only.
+        platform = StreamingPlatform.objects.bulk_create([
+            StreamingPlatform(user=self.user, name='Netflix', about='About',
+                              website='http://www.netflix.com')
+        ])[0]
+        WatchList.objects.filter(pk=heat.pk).update(platform=platform)
+        WatchList.objects.filter(pk=heat.pk).refresh_summaries()
+
+        res = self.client.get(WATCHLIST_URL, {'platform__name': 'Netflix'})
+        self.assertEqual([item['title'] for item in res.data['results']],
+                         ['Heat'])
+        self.assertEqual(res.data['results'][0]['platform_name'], 'Netflix')
+
+        StreamingPlatform.objects.filter(pk=platform.pk).update(name='Hulu')
+        with patch.object(platforms, 'MAX_AGE', -1):
+            res = self.client.get(WATCHLIST_URL)
+        self.assertEqual(res.data['results'][0]['platform_name'], 'Hulu')
+
+    def test_filter_ranges(self):
+        """Test rating, review count, date and platform range filters"""
+        heat = create_watchlist(self.user, title='Heat')
+        alien = create_watchlist(self.user, title='Alien')
+        create_watchlist(self.user, title='Old', platform=heat.platform)
+        WatchList.objects.filter(title='Old').update(
+            created_at='2020-01-01T00:00:00Z'
+        )
+        for watchlist, rating in ((heat, 5), (alien, 2)):
+            Review.objects.create(user=self.user, watchlist=watchlist,
+                                  rating=rating, description='Test review')
+        WatchList.objects.refresh_summaries()
+
+        def titles(**params):
+            res = self.client.get(WATCHLIST_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            return [item['title'] for item in res.data['results']]
+
+        self.assertEqual(titles(average_rating__gte=4), ['Heat'])
+        self.assertEqual(titles(total_reviews__gte=1), ['Alien', 'Heat'])
+        self.assertEqual(titles(created_at__lt='2021-01-01'), ['Old'])
+        self.assertEqual(
+            titles(platform__in='{},{}'.format(heat.platform_id,
+                                               alien.platform_id),
+                   created_at__gte='2021-01-01'),
+            ['Alien', 'Heat']
+        )
+        self.assertEqual(titles(platform__in=heat.platform_id),
+                         ['Heat', 'Old'])
+
+    def test_filter_active(self):
+        """Test inactive titles are only listed when asked for"""
+        create_watchlist(self.user, title='Heat')
+        create_watchlist(self.user, title='Alien', active=False)
+
+        def titles(**params):
+            res = self.client.get(WATCHLIST_URL, params)
+            return [item['title'] for item in res.data['results']]
+
+        self.assertEqual(titles(), ['Heat'])
+        self.assertEqual(titles(active=False), ['Alien'])
+        self.assertEqual(titles(active=True), ['Heat'])
+
+    def test_list_reflects_new_reviews(self):
+        """Test the list shows aggregates updated by new reviews"""
+        watchlist = create_watchlist(self.user)
+        Review.objects.create(user=self.user, watchlist=watchlist,
+                              rating=4, description='Test review')
+
+        res = self.client.get(WATCHLIST_URL, {'active': True})
+
+        self.assertEqual(res.data['results'][0]['total_reviews'], 1)
+        self.assertEqual(watchlist.summary.average_rating, 4)
+
     def test_delete_watchlist(self):
         """Test deleting a watchlist"""
         watchlist = create_watchlist(self.user)
@@ -14,8 +14,12 @@ app_name = 'watch'
 
 urlpatterns = [
     path('watch/', views.WatchListView.as_view(), name='watchlist-list'),
+    path('watch/autocomplete/', views.TitleAutocompleteView.as_view(),
+         name='watchlist-autocomplete'),
     path('watch/<int:pk>/', views.WatchListDetailView.as_view(),
          name='watchlist-detail'),
+    path('watch/<int:pk>/similar/', views.SimilarTitlesView.as_view(),
+         name='watchlist-similar'),
     path('', include(router.urls)),
     # path('streaming/', views.StreamingPlatformListView.as_view(),
     # name='streamingplatform-list'),
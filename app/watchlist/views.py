@@ -7,44 +7,76 @@ from rest_framework import status, viewsets
 from core.permissions import IsOwnerOrReadOnly, IsAdminOrReadOnly
 from rest_framework import mixins
 from rest_framework import generics
+from django.db.models import Q
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
-from core.pagination import WatchListPagination
+from core.pagination import ReviewCursorPagination, WatchListPagination
 # from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import (IsAuthenticatedOrReadOnly,
                                         IsAdminUser)
-from core.models import WatchList, StreamingPlatform, Review
+from core.models import (WatchList, WatchListSummary, StreamingPlatform,
+                         Review, SimilarTitle)
 from watchlist.serializers import (WatchListSerializer,
                                    StreamingPlatformSerializer,
-                                   ReviewSerializer)
+                                   ReviewSerializer,
+                                   SimilarTitleSerializer)
+from watchlist.read_serializers import (WatchListSummaryReadSerializer,
+                                        ReviewReadSerializer)
+from watchlist.filters import WatchListSummaryFilter, AliasOrderingFilter
+from watchlist import autocomplete
+from core.throttling import ScopedGCRAThrottle
 
 
-class UserReviewListView(mixins.ListModelMixin,
+class ReadListModelMixin(mixins.ListModelMixin):
+    """
+    List objects with `read_serializer_class` instead of `serializer_class`.
+
+    The filtered queryset is fetched as `values_list` rows, paginated and
+    turned into dicts without instantiating any model.
+    """
+    read_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        reader = self.read_serializer_class
+        queryset = reader.rows(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(reader.many(page))
+
+        return Response(reader.many(queryset))
+
+
+class UserReviewListView(ReadListModelMixin,
                          generics.GenericAPIView):
     """API view for listing Reviews for a specific user."""
     serializer_class = ReviewSerializer
+    read_serializer_class = ReviewReadSerializer
     authentication_classes = (TokenAuthentication,)
     permission_classes = (IsAuthenticatedOrReadOnly | IsAdminUser,)
+    pagination_class = ReviewCursorPagination
 
     def get_queryset(self):
         user_id = self.kwargs.get('pk')
         if not user_id:
             raise PermissionDenied("User ID is required.")
 
-        return Review.objects.filter(user_id=user_id)
+        return Review.objects.filter(user_id=user_id).order_by('-created_at')
 
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
 
-class ReviewListView(mixins.ListModelMixin,
+class ReviewListView(ReadListModelMixin,
                      mixins.CreateModelMixin,
                      generics.GenericAPIView):
     """API view for listing Review object"""
     serializer_class = ReviewSerializer
+    read_serializer_class = ReviewReadSerializer
     authentication_classes = (TokenAuthentication,)
     permission_classes = (IsAuthenticatedOrReadOnly | IsAdminUser,)
+    pagination_class = ReviewCursorPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_fields = ('user',)
 
@@ -64,7 +96,7 @@ class ReviewListView(mixins.ListModelMixin,
         watchlist = get_object_or_404(WatchList, pk=watchlist_pk)
 
         review_user = self.request.user
-        review_queryset_exist = Review.objects.filter(
+        review_queryset_exist = Review.all_objects.filter(
             watchlist=watchlist,
             user=review_user
         ).exists()
@@ -103,7 +135,11 @@ class ReviewDetailView(mixins.RetrieveModelMixin,
 
     def get_queryset(self):
         watch_pk = self.kwargs.get('watch_pk')
-        return Review.objects.filter(watchlist=watch_pk)
+        reviews = Review.all_objects.filter(watchlist=watch_pk)
+        if self.request.user.is_staff:
+            return reviews
+        # Authors keep access to their inactive reviews to restore them.
+        return reviews.filter(Q(active=True) | Q(user=self.request.user.pk))
 
     def perform_update(self, serializer):
         watch_pk = self.kwargs.get('watch_pk')
@@ -132,29 +168,29 @@ class ReviewDetailView(mixins.RetrieveModelMixin,
         return self.destroy(request, *args, **kwargs)
 
 
-class WatchListView(mixins.ListModelMixin,
+class WatchListView(ReadListModelMixin,
                     mixins.CreateModelMixin,
                     generics.GenericAPIView):
     """API view for listing Movie object"""
     serializer_class = WatchListSerializer
+    read_serializer_class = WatchListSummaryReadSerializer
     authentication_classes = (TokenAuthentication,)  # JWTAuthentication
     permission_classes = (IsAdminOrReadOnly,)
     throttle_scope = 'burst'
+    # Pages are filtered, ordered and counted on the summary table, then
+    # hydrated by id. Inactive titles are left out by the filterset
+    # unless ?active= asks for them.
+    queryset = WatchListSummary.all_objects.all()
     filter_backends = (DjangoFilterBackend, filters.SearchFilter,
-                       filters.OrderingFilter,)
-    filterset_fields = ('active', 'platform__name',)
-    search_fields = ('user__name', 'platform__name',)
+                       AliasOrderingFilter,)
+    filterset_class = WatchListSummaryFilter
+    search_fields = ('watchlist__user__name', 'platform_name',)
     ordering_fields = ('user__name', 'platform__name', 'title')
+    ordering_aliases = {'user__name': 'watchlist__user__name',
+                        'platform__name': 'platform_name'}
     pagination_class = WatchListPagination
     ordering = ('title',)
-
-    def get_queryset(self):
-        queryset = WatchList.objects.all()
-        # platform_name = self.request.query_params.get('platform_name')
-        # print(platform_name)
-        # if platform_name:
-        #     queryset = queryset.filter(platform__name=platform_name)
-        return queryset
+    max_batch_ids = 100
 
     # def get_permissions(self):
     #     permissions = {
@@ -164,8 +200,27 @@ class WatchListView(mixins.ListModelMixin,
     #     return permissions.get(self.request.method, [AllowAny()])
 
     def get(self, request, *args, **kwargs):
+        if 'ids' in request.query_params:
+            return self.batch(request)
         return self.list(request, *args, **kwargs)
 
+    def batch(self, request):
+        """
+        Return the titles of `?ids=1,2,3` in the requested order, as the
+        detail view would, without filters or pagination. Unknown ids are
+        left out.
+        """
+        try:
+            ids = [int(pk) for pk in request.query_params['ids'].split(',')]
+        except ValueError:
+            raise ValidationError({'ids': 'Comma separated ids expected.'})
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > self.max_batch_ids:
+            raise ValidationError({'ids': 'At most {} ids allowed.'.format(
+                self.max_batch_ids)})
+
+        return Response(WatchListSummaryReadSerializer.many(ids))
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -231,12 +286,43 @@ class WatchListDetailView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class TitleAutocompleteView(APIView):
+    """API view suggesting the titles matching a search as it is typed"""
+    authentication_classes = (TokenAuthentication,)
+    permission_classes = (IsAuthenticatedOrReadOnly,)
+    throttle_classes = (ScopedGCRAThrottle,)
+    throttle_scope = 'autocomplete'
+
+    def get(self, request, format=None):
+        return Response(autocomplete.search(request.query_params.get('q',
+                                                                     '')))
+
+
+class SimilarTitlesView(generics.ListAPIView):
+    """API view listing the titles rated like a Movie object"""
+    serializer_class = SimilarTitleSerializer
+    authentication_classes = (TokenAuthentication,)
+    permission_classes = (IsAuthenticatedOrReadOnly,)
+    pagination_class = None
+
+    def get_queryset(self):
+        watchlist = get_object_or_404(WatchList, pk=self.kwargs.get('pk'))
+        return SimilarTitle.objects.filter(
+            watchlist=watchlist
+        ).select_related('similar').only(
+            'similar', 'similar__title', 'similar__average_rating',
+            'similar__total_reviews', 'score'
+        ).order_by('-score')
+
+
 class StreamingPlatformViewSet(viewsets.ModelViewSet):
     """API view for listing and managing Streaming Platform objects"""
     serializer_class = StreamingPlatformSerializer
     authentication_classes = (TokenAuthentication,)
     permission_classes = (IsAdminOrReadOnly,)
-    queryset = StreamingPlatform.objects.all().order_by('id')
+    queryset = StreamingPlatform.objects.prefetch_related(
+        'watchlist__reviews'
+    ).order_by('id')
 
     def perform_create(self, serializer):
         """Save the user creating the object."""